@@ -31,6 +31,10 @@ class FilterPublishes(HookClass):
                                  "sg_publish" : {Shotgun entity dictionary for a Published File entity}
                              }
 
+                             This default hook is given shared, read-only, Published File
+                             dictionaries.  Hooks that override it are given mutable copies that
+                             they are free to modify.
+
 
         :returns:            The filtered list of dictionaries of the same form as the input 'publishes'
                              list
@@ -17,7 +17,12 @@ HookClass = sgtk.get_hook_baseclass()
 
 
 class UIConfig(HookClass):
-    """Hook to customize customize the main file view."""
+    """
+    Hook to customize customize the main file view.
+
+    Apart from the thumbnail, the data returned for file items is cached on the file and is only
+    requested again once the file, its thumbnail, badge or other versions change.
+    """
 
     # List describing the published file info to display for an item.
     PUBLISHED_FILE_DETAILS = [
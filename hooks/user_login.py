@@ -10,6 +10,8 @@
 
 
 import os
+import threading
+
 import sgtk
 
 HookClass = sgtk.get_hook_baseclass()
@@ -20,7 +22,25 @@ class UserLogin(HookClass):
     Hook that can be used to push and retrieve user login data for work files.
     """
 
-    def get_login(self, path, **kwargs):
+    def get_logins(self, paths, uids=None, **kwargs):
+        """
+        This method is called when listing all the work files to get the logins of the users
+        who last modified them. By default, it calls :meth:`get_login` for each path.
+
+        :param paths:           Paths where the work files are located.
+        :type paths:            list[str]
+
+        :param uids:            Owner uids of the files collected when the files were found,
+                                indexed by path. Not available on Windows.
+        :type uids:             Optional[dict[str, int]]
+
+        :returns:               A dictionary of login names indexed by path.
+        :rtype:                 dict[str, Optional[str]]
+        """
+        uids = uids or {}
+        return dict((path, self.get_login(path, uid=uids.get(path))) for path in paths)
+
+    def get_login(self, path, uid=None, **kwargs):
         """
         This method is called when listing all the work files. By default, it looks at the OS
         session login.
@@ -28,6 +48,10 @@ class UserLogin(HookClass):
         :param path:            Path where the work file is located.
         :type path:             str
 
+        :param uid:             The owner uid of the file if it was collected when the file was
+                                found, otherwise None. Not available on Windows.
+        :type uid:              Optional[int]
+
         :returns:               The login name printed on the file metadata, otherwise None.
         :rtype:                 Optional[str]
         """
@@ -40,9 +64,9 @@ class UserLogin(HookClass):
         else:
             # Get this information for Linux and Darwin platforms
             try:
-                from pwd import getpwuid
-
-                return getpwuid(os.stat(path).st_uid).pw_name
+                if uid is None:
+                    uid = os.stat(path).st_uid
+                return _get_login_for_uid(uid)
             except:
                 pass
 
@@ -64,6 +88,30 @@ class UserLogin(HookClass):
         pass
 
 
+# Logins are looked up once per uid for the lifetime of the session:
+_logins_by_uid = {}
+_logins_by_uid_lock = threading.Lock()
+
+
+def _get_login_for_uid(uid):
+    """
+    Get the login name for a uid, memoizing the result.
+
+    :param uid: The uid to get the login for
+    :returns:   The login name for the uid
+    """
+    with _logins_by_uid_lock:
+        if uid in _logins_by_uid:
+            return _logins_by_uid[uid]
+
+    from pwd import getpwuid
+
+    login = getpwuid(uid).pw_name
+    with _logins_by_uid_lock:
+        _logins_by_uid[uid] = login
+    return login
+
+
 class Win32Api:
     """
     Helper class to access Windows APIs.
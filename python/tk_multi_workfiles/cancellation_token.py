@@ -0,0 +1,54 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Token used to cooperatively cancel work running in background threads.
+"""
+
+import threading
+
+from .errors import SearchCancelledError
+
+
+class CancellationToken(object):
+    """
+    Shared between the main thread and the background tasks of a search.  Stopping a task
+    group only prevents tasks that haven't started from running so tasks that are already
+    running check the token at regular intervals, e.g. between directory listings, batches
+    of paths and hook calls, and bail out as soon as the search has been cancelled.
+    """
+
+    def __init__(self):
+        """
+        Construction
+        """
+        self._cancelled = threading.Event()
+
+    @property
+    def is_cancelled(self):
+        """
+        :returns:   True if the token has been cancelled, False otherwise
+        """
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        """
+        Cancel the token.  This is thread-safe and can be called more than once.
+        """
+        self._cancelled.set()
+
+    def check(self):
+        """
+        Check the token, this should be called regularly by long running tasks.
+
+        :raises SearchCancelledError:   If the token has been cancelled
+        """
+        if self._cancelled.is_set():
+            raise SearchCancelledError("The search has been cancelled")
@@ -0,0 +1,771 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Version of the file model that stores its rows as compact Python records rather than QStandardItems.
+"""
+
+import sgtk
+from sgtk.platform.qt import QtCore, QtGui
+
+from .file_model import FileModel
+
+
+class CompactFileModel(FileModel):
+    """
+    File model that implements the QAbstractItemModel interface directly over a tree of slotted
+    row records instead of storing a QStandardItem per file.  Each row only holds the handful of
+    attributes the model needs so large file lists use a fraction of the memory and don't pay
+    for a C++ item, its data vector and its Python wrapper per row.
+
+    The rows expose the subset of the QStandardItem interface used by the FileModel so all of the
+    search, grouping and update logic is shared with the standard model.  The QStandardItemModel
+    base class is only kept for that shared logic and its signals, its own item storage is never
+    used and every QAbstractItemModel method the views and proxy models rely on is re-implemented
+    over the row records.
+
+    Use the file_model_backend app setting to choose between this and the standard model.
+    """
+
+    class _Row(object):
+        """
+        A single row in the model.  Implements the parts of the QStandardItem interface used by
+        the FileModel.
+        """
+
+        __slots__ = (
+            "_model",
+            "_parent",
+            "_children",
+            "_row",
+            "_rows_dirty",
+            "_text",
+            "_tooltip",
+            "__weakref__",
+        )
+
+        def __init__(self, text=None):
+            """
+            :param text:    String used for the label/display role for this row
+            """
+            self._model = None
+            self._parent = None
+            self._children = None
+            self._row = -1
+            self._rows_dirty = False
+            self._text = text or ""
+            self._tooltip = ""
+
+        def model(self):
+            """
+            :returns:   The CompactFileModel this row belongs to or None if it isn't in a model
+            """
+            return self._model
+
+        def parent(self):
+            """
+            :returns:   The parent row, or None if this is a top-level row, in the same way as
+                        QStandardItem.parent()
+            """
+            if self._parent is None or self._parent._parent is None:
+                return None
+            return self._parent
+
+        def row(self):
+            """
+            :returns:   The row of this row within its parent or -1 if it has no parent
+            """
+            if self._parent is None:
+                return -1
+            self._parent._update_child_rows()
+            return self._row
+
+        def rowCount(self):
+            """
+            :returns:   The number of child rows
+            """
+            return len(self._children) if self._children else 0
+
+        def hasChildren(self):
+            """
+            :returns:   True if this row has any child rows
+            """
+            return bool(self._children)
+
+        def child(self, row, column=0):
+            """
+            :param row:     The row of the child to return
+            :param column:  The column of the child to return.  Only the first column is used.
+            :returns:       The child row or None if there isn't one
+            """
+            if column == 0 and self._children and 0 <= row < len(self._children):
+                return self._children[row]
+            return None
+
+        def index(self):
+            """
+            :returns:   The QModelIndex of this row in the model or an invalid index if the row
+                        isn't in a model
+            """
+            if self._model is None or self._parent is None:
+                return QtCore.QModelIndex()
+            return self._model.createIndex(self.row(), 0, self)
+
+        def text(self):
+            """
+            :returns:   The display text of this row
+            """
+            return self._text
+
+        def setToolTip(self, tooltip):
+            """
+            :param tooltip: The tooltip for this row
+            """
+            self.setData(tooltip, QtCore.Qt.ToolTipRole)
+
+        def emitDataChanged(self):
+            """
+            Emit the dataChanged signal from the model for this row.
+            """
+            if self._model is not None and self._parent is not None:
+                idx = self.index()
+                self._model.dataChanged.emit(idx, idx)
+
+        def data(self, role):
+            """
+            :param role:    The role to return data for.
+            :returns:       The data for the specified role
+            """
+            if role in (QtCore.Qt.DisplayRole, QtCore.Qt.EditRole):
+                return self._text
+            elif role == QtCore.Qt.ToolTipRole:
+                return self._tooltip or None
+            return None
+
+        def setData(self, value, role):
+            """
+            :param value:   The value to set the data with
+            :param role:    The role to set the data for
+            """
+            if role in (QtCore.Qt.DisplayRole, QtCore.Qt.EditRole):
+                if value != self._text:
+                    self._text = value
+                    self.emitDataChanged()
+            elif role == QtCore.Qt.ToolTipRole:
+                if value != self._tooltip:
+                    self._tooltip = value
+                    self.emitDataChanged()
+
+        def appendRow(self, row):
+            """
+            :param row: The row to add after all other children
+            """
+            self.insertRows(self.rowCount(), [row])
+
+        def appendRows(self, rows):
+            """
+            :param rows:    The list of rows to add after all other children
+            """
+            self.insertRows(self.rowCount(), rows)
+
+        def insertRow(self, row, child):
+            """
+            :param row:     The position to insert the child at
+            :param child:   The row to insert
+            """
+            self.insertRows(row, [child])
+
+        def insertRows(self, row, children):
+            """
+            :param row:         The position to insert the children at
+            :param children:    The list of rows to insert
+            """
+            children = list(children)
+            if not children:
+                return
+            if self._children is None:
+                self._children = []
+            row = max(0, min(row, len(self._children)))
+
+            model = self._model
+            if model is not None:
+                model.beginInsertRows(
+                    self._children_parent_index(), row, row + len(children) - 1
+                )
+            if row < len(self._children):
+                self._rows_dirty = True
+            self._children[row:row] = children
+            for ri, child in enumerate(children, row):
+                child._parent = self
+                child._row = ri
+                child._set_model(model)
+            if model is not None:
+                model.endInsertRows()
+
+        def takeRow(self, row):
+            """
+            Remove a child without destroying it.
+
+            :param row: The row of the child to remove
+            :returns:   A list containing the removed row, or an empty list if there is no row
+            """
+            if not self._children or not 0 <= row < len(self._children):
+                return []
+            return self._remove_children(row, 1)
+
+        def removeRows(self, row, count):
+            """
+            :param row:     The row of the first child to remove
+            :param count:   The number of children to remove
+            :returns:       True if the children were removed, False otherwise
+            """
+            if (
+                count <= 0
+                or not self._children
+                or not 0 <= row
+                or row + count > len(self._children)
+            ):
+                return False
+            self._remove_children(row, count)
+            return True
+
+        def _remove_children(self, row, count):
+            """
+            :param row:     The row of the first child to remove
+            :param count:   The number of children to remove
+            :returns:       The list of removed rows
+            """
+            model = self._model
+            if model is not None:
+                model.beginRemoveRows(
+                    self._children_parent_index(), row, row + count - 1
+                )
+            removed = self._children[row : row + count]
+            del self._children[row : row + count]
+            if row < len(self._children):
+                self._rows_dirty = True
+            for child in removed:
+                child._parent = None
+                child._row = -1
+                child._set_model(None)
+            if model is not None:
+                model.endRemoveRows()
+            return removed
+
+        def _children_parent_index(self):
+            """
+            :returns:   The QModelIndex used as the parent of this row's children
+            """
+            if self._parent is None:
+                # the root row:
+                return QtCore.QModelIndex()
+            return self.index()
+
+        def _update_child_rows(self):
+            """
+            Re-number the children if rows were inserted or removed before the end.  This is done
+            lazily so that a batch of changes only re-numbers the children once.
+            """
+            if self._rows_dirty:
+                for ri, child in enumerate(self._children):
+                    child._row = ri
+                self._rows_dirty = False
+
+        def _set_model(self, model):
+            """
+            :param model:   The model this row and all its children now belong to
+            """
+            self._model = model
+            for child in self._children or []:
+                child._set_model(model)
+
+    class _BaseRow(_Row):
+        """
+        Base row for storage of the file data in the model.  Equivalent to
+        FileModel._BaseModelItem.
+        """
+
+        __slots__ = ("_type",)
+
+        def __init__(self, typ, text=None):
+            """
+            :param typ:     The type of item this represents (see the FileModel node types)
+            :param text:    String used for the label/display role for this row
+            """
+            CompactFileModel._Row.__init__(self, text)
+            self._type = typ
+
+        def data(self, role):
+            """
+            Return the data from the row for the specified role.
+
+            :param role:    The role to return data for.
+            :returns:       Data for the specified role
+            """
+            data_method = self._model.get_method_for_role(role) if self._model else None
+            if data_method:
+                try:
+                    return data_method(self)
+                except TypeError as error:
+                    raise sgtk.TankError(
+                        "Failed to execute the method defined to retrieve item data for role `{role}`.\nError: {msg}".format(
+                            role=role, msg=error
+                        )
+                    )
+
+            elif role == FileModel.NODE_TYPE_ROLE:
+                return self._type
+
+            return CompactFileModel._Row.data(self, role)
+
+        def setData(self, value, role):
+            """
+            Set the data on the row for the specified role
+
+            :param value:   The value to set the data with
+            :param role:    The role to set the data for
+            """
+            if role != FileModel.NODE_TYPE_ROLE:
+                CompactFileModel._Row.setData(self, value, role)
+
+    class _FileModelItem(_BaseRow):
+        """
+        Row that represents a single FileItem in the model.  Equivalent to
+        FileModel._FileModelItem.
+        """
+
+        __slots__ = ("_file_item", "_work_area")
+
+        def __init__(self, file_item, work_area):
+            """
+            :param file_item:    The FileItem instance this row represents
+            :param work_area:    The WorkArea this file item belongs to
+            """
+            CompactFileModel._BaseRow.__init__(self, typ=FileModel.FILE_NODE_TYPE)
+            self._file_item = file_item
+            self._work_area = work_area
+
+        @property
+        def file_item(self):
+            """
+            :returns:    The file item this row represents
+            """
+            return self._file_item
+
+        @property
+        def work_area(self):
+            """
+            :returns:    The work area the file belongs to
+            """
+            return self._work_area
+
+        def data(self, role):
+            """
+            Return the data from the row for the specified role.
+
+            :param role:    The role to return data for.
+            :returns:       Data for the specified role
+            """
+            if role == FileModel.FILE_ITEM_ROLE:
+                data = self._file_item
+
+            elif role == FileModel.WORK_AREA_ROLE:
+                data = self._work_area
+
+            elif role == QtCore.Qt.DecorationRole:
+                data = self._file_item.thumbnail
+                if not data:
+                    # Default thumbnail to empty image
+                    data = ":/tk-multi-workfiles2/thumb_empty.png"
+
+                if isinstance(data, str):
+                    data = QtGui.QPixmap(data)
+
+            elif FileModel.is_display_role(self._model, role):
+                # display data is cached on the file item until the file changes:
+                return self._file_item.get_display_data(
+                    role,
+                    lambda: self._build_display_data(role),
+                    (
+                        self._model.get_display_stamp(self._file_item)
+                        if self._model
+                        else None
+                    ),
+                )
+
+            else:
+                data = CompactFileModel._BaseRow.data(self, role)
+
+            return FileModel.sanitize_data(data, role)
+
+        def _build_display_data(self, role):
+            """
+            Build the data used to display the file for the specified role.
+
+            :param role:    The display role to build the data for
+            :returns:       Data for the specified role
+            """
+            if role == QtCore.Qt.DisplayRole:
+                data = "%s, v%0d" % (self._file_item.name, self._file_item.version)
+
+            elif role == QtCore.Qt.ToolTipRole:
+                data = self._file_item.format_tooltip()
+
+            else:
+                data = CompactFileModel._BaseRow.data(self, role)
+
+            return FileModel.sanitize_data(data, role)
+
+        def setData(self, value, role):
+            """
+            Set the data on the row for the specified role
+
+            :param value:   The value to set the data with
+            :param role:    The role to set the data for
+            """
+            if role == QtCore.Qt.DisplayRole:
+                # do nothing as it can't be set!
+                pass
+            elif role == FileModel.FILE_ITEM_ROLE:
+                self._file_item = value
+                self.emitDataChanged()
+            elif role == FileModel.WORK_AREA_ROLE:
+                self._work_area = value
+                self.emitDataChanged()
+            else:
+                CompactFileModel._BaseRow.setData(self, value, role)
+
+    class _FolderModelItem(_BaseRow):
+        """
+        Row that represents a folder in the model.  Equivalent to FileModel._FolderModelItem.
+        """
+
+        __slots__ = ("_entity",)
+
+        def __init__(self, name, entity):
+            """
+            :param name:    The name to use for the row display role
+            :param entity:  A Shotgun entity dictionary for the entity that this folder represents
+            """
+            CompactFileModel._BaseRow.__init__(
+                self, typ=FileModel.FOLDER_NODE_TYPE, text=name
+            )
+            self._entity = entity
+
+        @property
+        def entity(self):
+            """
+            :returns:   An entity dictionary representing the entity represented by this row
+            """
+            return self._entity
+
+        def data(self, role):
+            """
+            Return the data from the row for the specified role.
+
+            :param role:    The role to return data for.
+            """
+            if role == QtCore.Qt.DecorationRole:
+                data = QtGui.QPixmap(":/tk-multi-workfiles2/folder_512x400.png")
+            else:
+                data = CompactFileModel._BaseRow.data(self, role)
+
+            return FileModel.sanitize_data(data, role)
+
+    class _GroupModelItem(_BaseRow):
+        """
+        Row that represents a per-user, per-entity group in the model.  Equivalent to
+        FileModel._GroupModelItem.
+        """
+
+        __slots__ = (
+            "_search_status",
+            "_search_msg",
+            "_key",
+            "_work_area",
+            "_sandbox_user_name",
+        )
+
+        def __init__(self, name, key, work_area=None):
+            """
+            :param name:        The name to use for the row display role
+            :param key:         A unique key representing this group
+            :param work_area:   A WorkArea instance that this group represents
+            """
+            CompactFileModel._BaseRow.__init__(
+                self, typ=FileModel.GROUP_NODE_TYPE, text=name
+            )
+            self._search_status = FileModel.SEARCH_COMPLETED
+            self._search_msg = ""
+            self._key = key
+            self._work_area = work_area
+            self._sandbox_user_name = ""
+
+        @property
+        def key(self):
+            """
+            :returns:   The unique key for this group
+            """
+            return self._key
+
+        # @property
+        def _get_work_area(self):
+            """
+            :returns:   The WorkArea instance associated with this row
+            """
+            return self._work_area
+
+        # @work_area.setter
+        def _set_work_area(self, work_area):
+            """
+            :param work_area:   The WorkArea to associate with this row
+            """
+            self.setData(work_area, FileModel.WORK_AREA_ROLE)
+
+        work_area = property(_get_work_area, _set_work_area)
+
+        def set_search_status(self, status, msg=None):
+            """
+            Set the search status for this row and emit a dataChanged signal to indicate it's changed.
+
+            :param status:  The search status to update this row with
+            :param msg:     The status message if any to update this row with
+            """
+            if msg is None:
+                self.setData(status, FileModel.SEARCH_STATUS_ROLE)
+            else:
+                self._search_status = status
+                self._search_msg = msg
+                self.emitDataChanged()
+
+        def data(self, role):
+            """
+            Return the data from the row for the specified role.
+
+            :param role:    The role to return data for.
+            :returns:       Data for the specified role
+            """
+            if role == FileModel.SEARCH_STATUS_ROLE:
+                data = self._search_status
+
+            elif role == FileModel.SEARCH_MSG_ROLE:
+                data = self._search_msg
+
+            elif role == FileModel.WORK_AREA_ROLE:
+                data = self._work_area
+
+            elif role == FileModel.GROUP_SANDBOX_USER:
+                data = self._sandbox_user_name
+
+            elif role == FileModel.VIEW_ITEM_HEIGHT_ROLE:
+                # Group item height always adjusts to content size
+                data = -1
+
+            elif role == FileModel.VIEW_ITEM_LOADING_ROLE:
+                data = self._search_status == FileModel.SEARCHING
+
+            else:
+                data = CompactFileModel._BaseRow.data(self, role)
+
+            return FileModel.sanitize_data(data, role)
+
+        def setData(self, value, role):
+            """
+            Set the data on the row for the specified role
+
+            :param value:   The value to set the data with
+            :param role:    The role to set the data for
+            """
+            if role == FileModel.SEARCH_STATUS_ROLE:
+                self._search_status = value
+                self._search_msg = FileModel._GroupModelItem.get_search_msg(
+                    value, self.hasChildren(), self._work_area
+                )
+                self.emitDataChanged()
+
+            elif role == FileModel.SEARCH_MSG_ROLE:
+                self._search_msg = value
+                self.emitDataChanged()
+
+            elif role == FileModel.WORK_AREA_ROLE:
+                self._work_area = value
+                self._sandbox_user_name = (
+                    FileModel._GroupModelItem.get_sandbox_user_name(value)
+                )
+                self.emitDataChanged()
+
+            else:
+                CompactFileModel._BaseRow.setData(self, value, role)
+
+    def __init__(self, bg_task_manager, parent):
+        """
+        :param bg_task_manager: A BackgroundTaskManager instance that will be used for all background/threaded
+                                work that needs undertaking
+        :param parent:          The parent QObject for this instance
+        """
+        FileModel.__init__(self, bg_task_manager, parent)
+        # the root of the tree of rows, equivalent to the invisible root item:
+        self._root = CompactFileModel._Row()
+        self._root._model = self
+
+    # ------------------------------------------------------------------------------------------
+    # QStandardItemModel interface used by the FileModel
+
+    def invisibleRootItem(self):
+        """
+        Overriden from base class.
+
+        :returns:   The root row that all groups are children of
+        """
+        return self._root
+
+    def item(self, row, column=0):
+        """
+        Overriden from base class.
+
+        :param row:     The row of the top-level row to return
+        :param column:  The column of the row to return
+        :returns:       The top-level row or None if there isn't one
+        """
+        return self._root.child(row, column)
+
+    def appendRow(self, row):
+        """
+        Overriden from base class.
+
+        :param row: The row to add after all other top-level rows
+        """
+        self._root.appendRow(row)
+
+    def insertRow(self, row, child):
+        """
+        Overriden from base class.
+
+        :param row:     The position to insert the top-level row at
+        :param child:   The row to insert
+        """
+        self._root.insertRow(row, child)
+
+    def itemFromIndex(self, index):
+        """
+        Overriden from base class.
+
+        :param index:   A QModelIndex from this model
+        :returns:       The row for the index or None if the index isn't valid
+        """
+        if not index.isValid():
+            return None
+        return index.internalPointer()
+
+    def indexFromItem(self, item):
+        """
+        Overriden from base class.
+
+        :param item:    A row in this model
+        :returns:       The QModelIndex for the row
+        """
+        return item.index()
+
+    # ------------------------------------------------------------------------------------------
+    # QAbstractItemModel interface
+
+    def index(self, row, column=0, parent=QtCore.QModelIndex()):
+        """
+        Overriden from base class.
+        """
+        child = self._row_from_index(parent).child(row, column)
+        if child is None:
+            return QtCore.QModelIndex()
+        return self.createIndex(row, column, child)
+
+    def parent(self, index=None):
+        """
+        Overriden from base class.  When called without an index this returns the parent QObject
+        of the model.
+        """
+        if index is None:
+            return QtCore.QObject.parent(self)
+        if not index.isValid():
+            return QtCore.QModelIndex()
+        parent_row = index.internalPointer().parent()
+        if parent_row is None:
+            return QtCore.QModelIndex()
+        return parent_row.index()
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        """
+        Overriden from base class.
+        """
+        if parent.column() > 0:
+            return 0
+        return self._row_from_index(parent).rowCount()
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        """
+        Overriden from base class.
+        """
+        return 1
+
+    def hasChildren(self, parent=QtCore.QModelIndex()):
+        """
+        Overriden from base class.
+        """
+        return self._row_from_index(parent).hasChildren()
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        """
+        Overriden from base class.
+        """
+        if not index.isValid():
+            return None
+        return index.internalPointer().data(role)
+
+    def setData(self, index, value, role=QtCore.Qt.EditRole):
+        """
+        Overriden from base class.
+        """
+        if not index.isValid():
+            return False
+        index.internalPointer().setData(value, role)
+        return True
+
+    def itemData(self, index):
+        """
+        Overriden from base class.
+        """
+        roles = {}
+        if index.isValid():
+            row = index.internalPointer()
+            for role in (
+                QtCore.Qt.DisplayRole,
+                QtCore.Qt.ToolTipRole,
+                QtCore.Qt.DecorationRole,
+            ):
+                value = row.data(role)
+                if value is not None:
+                    roles[role] = value
+        return roles
+
+    def flags(self, index):
+        """
+        Overriden from base class.
+        """
+        if not index.isValid():
+            return QtCore.Qt.NoItemFlags
+        return QtCore.Qt.ItemIsSelectable | QtCore.Qt.ItemIsEnabled
+
+    def _row_from_index(self, index):
+        """
+        :param index:   A QModelIndex from this model
+        :returns:       The row for the index, or the root row if the index isn't valid
+        """
+        if not index.isValid():
+            return self._root
+        return index.internalPointer()
@@ -22,6 +22,13 @@ class WorkfilesError(TankError):
     """
 
 
+class SearchCancelledError(WorkfilesError):
+    """
+    Raised from inside a background search task when the search it belongs to has been
+    stopped.
+    """
+
+
 class MissingTemplatesError(WorkfilesError):
     """
     Raised when one or more templates are missing.
@@ -9,7 +9,10 @@
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
 import os
+import re
+import json
 from datetime import datetime
+from collections import OrderedDict
 import copy
 import time
 
@@ -29,6 +32,16 @@ task_manager = sgtk.platform.import_framework(
 BackgroundTaskManager = task_manager.BackgroundTaskManager
 
 from .work_area import WorkArea
+from .template_walker import TemplateWalker, file_stat
+from .template_field_parser import TemplateFieldParser
+from .work_file_index import WorkFileIndex, WorkFileRecord, g_work_file_index
+from .publish_list_cache import g_publish_list_cache
+from .cancellation_token import CancellationToken
+from .publish_record import (
+    PublishRecord,
+    build_publish_records,
+    g_publish_record_stats,
+)
 from .util import monitor_qobject_lifetime, Threaded
 
 
@@ -37,29 +50,167 @@ class FileFinder(QtCore.QObject):
     Helper class to find work and publish files for a specified context and set of templates
     """
 
+    # fields queried for each publish:
+    _PUBLISH_FIELDS = [
+        "id",
+        "description",
+        "version_number",
+        "image",
+        "created_at",
+        "created_by",
+        "updated_at",
+        "name",
+        "path",
+        "task",
+    ]
+
+    # the filter_publishes hook shipped with the app, which doesn't modify the publishes:
+    _DEFAULT_FILTER_PUBLISHES_HOOK = "{self}/filter_publishes.py"
+
     class _FileNameMap(Threaded):
-        """ """
+        """
+        Thread safe map of the unique name to use for each file key.  Names are generated
+        outside of the lock so that the threads processing work files and publishes don't
+        serialize on name generation.
+        """
+
+        class _VersionlessNameRule(object):
+            """
+            Describes where the version lives in the file names generated by a template so
+            that it can be removed without rebuilding the path.  Computed once per template.
+            """
+
+            def __init__(self, template):
+                """
+                Construction
+
+                :param template:    The template to compute the rule for
+                """
+                # find out if version is used in the file name:
+                template_name, _ = os.path.splitext(
+                    os.path.basename(template.definition)
+                )
+                self.version_in_name = "{version}" in template_name
+                self.version_key = template.keys.get("version")
+
+                # the number of characters before or after the version in a file name
+                # can be computed up front if that part of the definition is static:
+                self.prefix_len = None
+                self.suffix_len = None
+                # the static parts of the definition immediately before and after the version.
+                # Toolkit matches static parts ignoring case so these are used instead of the
+                # ones found in the file name, the same as if the name was built from the fields:
+                self.static_before = ""
+                self.static_after = ""
+                if self.version_in_name and self.version_key:
+                    prefix, _, suffix = template_name.partition("{version}")
+                    if not any(c in suffix for c in "{}[]"):
+                        self.suffix_len = len(suffix)
+                    elif not any(c in prefix for c in "{}[]"):
+                        self.prefix_len = len(prefix)
+                    self.static_before = re.split(r"[{}\[\]]", prefix)[-1]
+                    self.static_after = re.split(r"[{}\[\]]", suffix)[0]
+
+            def find_version(self, name, fields):
+                """
+                Find the version in a file name.
+
+                :param name:    The file name, without extension
+                :param fields:  The fields of the file
+                :returns:       Tuple containing (position, version string) or None if the
+                                position can't be determined from the rule.
+                """
+                if fields.get("version") is None:
+                    return None
+                if self.suffix_len is None and self.prefix_len is None:
+                    return None
+
+                version_str = self.version_key.str_from_value(fields["version"])
+                if self.suffix_len is not None:
+                    v_pos = len(name) - self.suffix_len - len(version_str)
+                else:
+                    v_pos = self.prefix_len
+                if v_pos < 0 or name[v_pos : v_pos + len(version_str)] != version_str:
+                    return None
+                return (v_pos, version_str)
+
+            def normalize_static(self, name, v_pos, version_str):
+                """
+                Replace the static parts around the version in a file name with the ones from
+                the template definition.
+
+                :param name:        The file name, without extension
+                :param v_pos:       The position of the version in the name
+                :param version_str: The version string found in the name
+                :returns:           The normalized name or None if the static parts around the
+                                    version don't match the definition
+                """
+                start = v_pos - len(self.static_before)
+                end = v_pos + len(version_str) + len(self.static_after)
+                if start < 0 or end > len(name):
+                    return None
+                if (
+                    name[start:v_pos].lower() != self.static_before.lower()
+                    or name[v_pos + len(version_str) : end].lower()
+                    != self.static_after.lower()
+                ):
+                    return None
+                return (
+                    name[:start]
+                    + self.static_before
+                    + version_str
+                    + self.static_after
+                    + name[end:]
+                )
 
         def __init__(self):
             """ """
             Threaded.__init__(self)
             self._name_map = {}
+            # self._name_rules[template definition] = _VersionlessNameRule
+            self._name_rules = {}
 
-        @Threaded.exclusive
         def get_name(self, file_key, path, template, fields=None):
             """
             Thread safe method to get the unique name for the specified file key
             """
-            name = None
-            if file_key in self._name_map:
-                name = self._name_map.get(file_key)
-            else:
-                # generate the name:
+            name = self._get_cached_name(file_key)
+            if name is None:
+                # generate the name without holding the lock and add it to the map.  If
+                # another thread added a name for the key in the meantime then that one
+                # is used so that all files with the same key have the same name:
                 name = self._generate_name(path, template, fields)
-                # and add it to the map:
-                self._name_map[file_key] = name
+                name = self._add_name(file_key, name)
             return name
 
+        @Threaded.exclusive
+        def _get_cached_name(self, file_key):
+            """
+            :param file_key:    The file key to get the name for
+            :returns:           The name stored for the file key or None
+            """
+            return self._name_map.get(file_key)
+
+        @Threaded.exclusive
+        def _add_name(self, file_key, name):
+            """
+            :param file_key:    The file key to add the name for
+            :param name:        The name generated for the file key
+            :returns:           The name stored for the file key
+            """
+            return self._name_map.setdefault(file_key, name)
+
+        def _get_name_rule(self, template):
+            """
+            :param template:    The template to get the versionless name rule for
+            :returns:           The _VersionlessNameRule for the template
+            """
+            rule = self._name_rules.get(template.definition)
+            if not rule:
+                rule = FileFinder._FileNameMap._VersionlessNameRule(template)
+                rule = self._name_rules.setdefault(template.definition, rule)
+            return rule
+
         def _generate_name(self, path, template, fields=None):
             """
             Return the 'name' to be used for the file - if possible
@@ -69,66 +220,130 @@ class FileFinder(QtCore.QObject):
             fields = fields.copy() if fields else template.get_fields(path)
             if "name" in fields and fields["name"]:
                 # well, that was easy!
-                name = fields["name"]
+                return fields["name"]
+
+            rule = self._get_name_rule(template)
+
+            # extract the file name from the path:
+            name, _ = os.path.splitext(os.path.basename(path))
+            if not rule.version_in_name:
+                return name
+
+            # looks like version is part of the file name so we need to
+            # isolate it so that we can remove it safely:
+            version_key = template.keys["version"]
+            version = rule.find_version(name, fields)
+            normalized_name = rule.normalize_static(name, *version) if version else None
+            if normalized_name:
+                name = normalized_name
+                v_pos, version_str = version
             else:
-                # find out if version is used in the file name:
-                template_name, _ = os.path.splitext(
-                    os.path.basename(template.definition)
-                )
-                version_in_name = "{version}" in template_name
-
-                # extract the file name from the path:
+                # the rule can't locate the version so find a dummy version whose
+                # string representation doesn't exist in the name string:
+                dummy_version = 9876
+                while True:
+                    test_str = version_key.str_from_value(dummy_version)
+                    if test_str not in name:
+                        break
+                    dummy_version += 1
+
+                # now use this dummy version and rebuild the path
+                fields["version"] = dummy_version
+                path = template.apply_fields(fields)
                 name, _ = os.path.splitext(os.path.basename(path))
-                delims_str = "_-. "
-                if version_in_name:
-                    # looks like version is part of the file name so we
-                    # need to isolate it so that we can remove it safely.
-                    # First, find a dummy version whose string representation
-                    # doesn't exist in the name string
-                    version_key = template.keys["version"]
-                    dummy_version = 9876
-                    while True:
-                        test_str = version_key.str_from_value(dummy_version)
-                        if test_str not in name:
-                            break
-                        dummy_version += 1
-
-                    # now use this dummy version and rebuild the path
-                    fields["version"] = dummy_version
-                    path = template.apply_fields(fields)
-                    name, _ = os.path.splitext(os.path.basename(path))
-
-                    # we can now locate the version in the name and remove it
-                    dummy_version_str = version_key.str_from_value(dummy_version)
-
-                    v_pos = name.find(dummy_version_str)
-                    # remove any preceeding 'v'
-                    pre_v_str = name[:v_pos].rstrip("v")
-                    post_v_str = name[v_pos + len(dummy_version_str) :]
-
-                    if (
-                        pre_v_str
-                        and post_v_str
-                        and pre_v_str[-1] in delims_str
-                        and post_v_str[0] in delims_str
-                    ):
-                        # only want one delimiter - strip the second one:
-                        post_v_str = post_v_str.lstrip(delims_str)
-
-                    versionless_name = pre_v_str + post_v_str
-                    versionless_name = versionless_name.strip(delims_str)
-
-                    if versionless_name:
-                        # great - lets use this!
-                        name = versionless_name
-                    else:
-                        # likely that version is only thing in the name so
-                        # instead, replace the dummy version with #'s:
-                        zero_version_str = version_key.str_from_value(0)
-                        new_version_str = "#" * len(zero_version_str)
-                        name = name.replace(dummy_version_str, new_version_str)
 
-            return name
+                # we can now locate the version in the name
+                version_str = version_key.str_from_value(dummy_version)
+                v_pos = name.find(version_str)
+
+            # and remove it, along with any preceeding 'v':
+            delims_str = "_-. "
+            pre_v_str = name[:v_pos].rstrip("v")
+            post_v_str = name[v_pos + len(version_str) :]
+
+            if (
+                pre_v_str
+                and post_v_str
+                and pre_v_str[-1] in delims_str
+                and post_v_str[0] in delims_str
+            ):
+                # only want one delimiter - strip the second one:
+                post_v_str = post_v_str.lstrip(delims_str)
+
+            versionless_name = pre_v_str + post_v_str
+            versionless_name = versionless_name.strip(delims_str)
+
+            if versionless_name:
+                # great - lets use this!
+                return versionless_name
+
+            # likely that version is only thing in the name so
+            # instead, replace the version with #'s:
+            zero_version_str = version_key.str_from_value(0)
+            new_version_str = "#" * len(zero_version_str)
+            return name[:v_pos] + new_version_str + name[v_pos + len(version_str) :]
+
+    class _ContextMap(Threaded):
+        """
+        Thread safe map of the contexts resolved from the directories files live in.  All
+        files in the same directory resolve to the same context so the path cache only needs
+        to be queried once per directory.
+        """
+
+        def __init__(self):
+            """ """
+            Threaded.__init__(self)
+            # self._context_map[(directory, context key)] = Context
+            self._context_map = {}
+
+        def get_context(self, tk, path, previous_context):
+            """
+            Thread safe method to get the context for the specified path
+
+            :param tk:                  The Sgtk instance to resolve the context with
+            :param path:                The path of the file to get the context for
+            :param previous_context:    The context used to extend the context resolved from the
+                                        path, see `Sgtk.context_from_path`
+            :returns:                   The context for the directory the file lives in
+            """
+            key = (
+                os.path.dirname(path),
+                tuple(
+                    (e["type"], e["id"]) if e else None
+                    for e in (
+                        previous_context.project,
+                        previous_context.entity,
+                        previous_context.step,
+                        previous_context.task,
+                        previous_context.user,
+                    )
+                ),
+            )
+            found, ctx = self._get_cached_context(key)
+            if not found:
+                # resolve the context without holding the lock:
+                ctx = tk.context_from_path(path, previous_context)
+                ctx = self._add_context(key, ctx)
+            return ctx
+
+        @Threaded.exclusive
+        def _get_cached_context(self, key):
+            """
+            :param key: The key to get the context for
+            :returns:   Tuple containing (found, Context)
+            """
+            if key in self._context_map:
+                return (True, self._context_map[key])
+            return (False, None)
+
+        @Threaded.exclusive
+        def _add_context(self, key, ctx):
+            """
+            :param key: The key to add the context for
+            :param ctx: The context resolved for the key
+            :returns:   The context stored for the key
+            """
+            return self._context_map.setdefault(key, ctx)
 
     def __init__(self, parent=None):
         """
@@ -150,7 +365,8 @@ class FileFinder(QtCore.QObject):
         :param context:             The context to search for file with
         :param filter_file_key:     A unique file 'key' that if specified will limit the returned list of files to just
                                     those that match.  This 'key' should be generated using the FileItem.build_file_key()
-                                    method.
+                                    method.  The fields of the key are used to narrow down the searches so that only the
+                                    versions of this file are looked for.
         :returns:                   A list of FileItem instances, one for each unique version of a file found in either
                                     the work or publish areas
         """
@@ -165,6 +381,16 @@ class FileFinder(QtCore.QObject):
         else:
             publish_filters.append(["task", "is", None])
 
+        # when looking for the versions of a single file, the fields of the file key
+        # are used to only search for that file.  Publish names aren't guaranteed to be
+        # built from the name field so publishes can't be filtered on it, they are matched
+        # against the file key once found instead:
+        key_fields = {}
+        publish_order = None
+        if filter_file_key:
+            key_fields = self._get_file_key_fields(filter_file_key, work_template)
+            publish_order = [{"field_name": "version_number", "direction": "desc"}]
+
         # get the list of valid file extensions if set:
         valid_file_extensions = [
             ".%s" % ext if not ext.startswith(".") else ext
@@ -177,18 +403,28 @@ class FileFinder(QtCore.QObject):
         )
 
         # find all work & publish files and filter out any that should be ignored:
-        work_files = self._find_work_files(
-            context, work_template, version_compare_ignore_fields
+        work_file_records = self._find_work_file_records(
+            context,
+            work_template,
+            version_compare_ignore_fields,
+            key_fields=key_fields,
+        )
+        filtered_work_files = self._filter_work_files(
+            list(work_file_records), valid_file_extensions
         )
-        filtered_work_files = self._filter_work_files(work_files, valid_file_extensions)
 
-        published_files = self._find_publishes(publish_filters)
+        published_files = self._find_publishes(publish_filters, publish_order)
+        publish_field_parser = TemplateFieldParser(publish_template)
         filtered_published_files = self._filter_publishes(
-            published_files, publish_template, valid_file_extensions
+            published_files,
+            publish_template,
+            valid_file_extensions,
+            publish_field_parser,
         )
 
         # turn these into FileItem instances:
         name_map = FileFinder._FileNameMap()
+        work_field_parser = TemplateFieldParser(work_template)
         work_file_item_details = self._process_work_files(
             filtered_work_files,
             work_template,
@@ -196,6 +432,8 @@ class FileFinder(QtCore.QObject):
             name_map,
             version_compare_ignore_fields,
             filter_file_key,
+            work_file_records,
+            work_field_parser,
         )
         work_file_items = dict(
             [(k, FileItem(**kwargs)) for k, kwargs in work_file_item_details.items()]
@@ -209,6 +447,8 @@ class FileFinder(QtCore.QObject):
             name_map,
             version_compare_ignore_fields,
             filter_file_key,
+            publish_field_parser,
+            work_field_parser,
         )
         publish_items = dict(
             [(k, FileItem(**kwargs)) for k, kwargs in publish_item_details.items()]
@@ -235,6 +475,10 @@ class FileFinder(QtCore.QObject):
         name_map,
         version_compare_ignore_fields,
         filter_file_key=None,
+        work_file_records=None,
+        work_field_parser=None,
+        context_map=None,
+        cancel_token=None,
     ):
         """
         :param work_files: A list of dictionaries with file details.
@@ -245,19 +489,48 @@ class FileFinder(QtCore.QObject):
                                               when building a key for the file.
         :param filter_file_key: A unique file 'key' that, if specified, will limit
                                 the returned list of files to just those that match.
+        :param work_file_records: An optional dictionary of {path:WorkFileRecord} containing
+                                  the details of the work files collected when they were found.
+        :param work_field_parser: An optional :class:`TemplateFieldParser` for the work template
+                                  used to extract the fields from the work paths.
+        :param context_map: An optional :class:`_ContextMap` instance used to resolve the
+                            context of work files when the context has no task.
+        :param cancel_token: An optional :class:`CancellationToken` checked for each file.
         returns: A dictionary where keys are (file key, version number) tuples
                   and values are dictionaries which can be used to instantiate
                   :class:`FileItem`.
         """
         files = {}
+        work_file_records = work_file_records or {}
+        work_field_parser = work_field_parser or TemplateFieldParser(work_template)
+        context_map = context_map or FileFinder._ContextMap()
+
+        # parse the fields of all work files that weren't indexed in one go:
+        work_fields = work_field_parser.get_fields_for_paths(
+            [
+                wf["path"]
+                for wf in work_files
+                if not work_file_records.get(wf["path"])
+                or work_file_records[wf["path"]].fields is None
+            ]
+        )
+
+        # the modified by details of work files are looked up for all files at once:
+        # unknown_modified_by = [(work_path, file_details, uid)]
+        unknown_modified_by = []
 
         for work_file in work_files:
+            self._check_cancelled(cancel_token)
 
             # always have the work path:
             work_path = work_file["path"]
 
-            # get fields for work file:
-            wf_fields = work_template.get_fields(work_path)
+            # get fields for work file, using the indexed details if we have them:
+            record = work_file_records.get(work_path)
+            if record and record.fields is not None:
+                wf_fields = dict(record.fields)
+            else:
+                wf_fields = work_fields[work_path]
             wf_ctx = None
 
             # Build the unique file key for the work path.
@@ -265,7 +538,7 @@ class FileFinder(QtCore.QObject):
             # to be different versions of the same file.
             #
             file_key = FileItem.build_file_key(
-                wf_fields, work_template, version_compare_ignore_fields
+                wf_fields, work_field_parser, version_compare_ignore_fields
             )
             if filter_file_key and file_key != filter_file_key:
                 # we can ignore this file completely!
@@ -285,7 +558,7 @@ class FileFinder(QtCore.QObject):
                     file_details["task"] = context.task
                 else:
                     # try to create a context from the path and see if that contains a task:
-                    wf_ctx = self._app.sgtk.context_from_path(work_path, context)
+                    wf_ctx = context_map.get_context(self._app.sgtk, work_path, context)
                     if wf_ctx and wf_ctx.task:
                         file_details["task"] = wf_ctx.task
 
@@ -298,7 +571,10 @@ class FileFinder(QtCore.QObject):
             # File modified details:
             if not file_details["modified_at"]:
                 try:
-                    modified_at = os.path.getmtime(work_path)
+                    if record and record.mtime is not None:
+                        modified_at = record.mtime
+                    else:
+                        modified_at = os.path.getmtime(work_path)
                     file_details["modified_at"] = datetime.fromtimestamp(
                         modified_at, tz=sg_timezone.local
                     )
@@ -307,8 +583,8 @@ class FileFinder(QtCore.QObject):
                     pass
 
             if not file_details["modified_by"]:
-                file_details["modified_by"] = g_user_cache.get_file_last_modified_user(
-                    work_path
+                unknown_modified_by.append(
+                    (work_path, file_details, record.uid if record else None)
                 )
 
             if not file_details["name"]:
@@ -325,8 +601,39 @@ class FileFinder(QtCore.QObject):
                 "work_details": file_details,
             }
 
+        self._check_cancelled(cancel_token)
+        self._resolve_modified_by(unknown_modified_by)
+
         return files
 
+    @staticmethod
+    def _check_cancelled(cancel_token):
+        """
+        Raise a SearchCancelledError if the cancellation token has been cancelled.
+
+        :param cancel_token:    A CancellationToken or None
+        """
+        if cancel_token:
+            cancel_token.check()
+
+    def _resolve_modified_by(self, unknown_modified_by):
+        """
+        Look up the users who last modified a set of files in a single batch and store
+        them in the details of each file.
+
+        :param unknown_modified_by: A list of (path, file_details, uid) tuples where file_details
+                                    is the dictionary to store the user in and uid is the owner
+                                    uid of the file if known, None otherwise.
+        """
+        if not unknown_modified_by:
+            return
+        modified_by_users = g_user_cache.get_files_last_modified_users(
+            list(set(path for path, _, _ in unknown_modified_by)),
+            dict((path, uid) for path, _, uid in unknown_modified_by),
+        )
+        for path, file_details, _ in unknown_modified_by:
+            file_details["modified_by"] = modified_by_users.get(path)
+
     def _process_publish_files(
         self,
         sg_publishes,
@@ -336,14 +643,31 @@ class FileFinder(QtCore.QObject):
         name_map,
         version_compare_ignore_fields,
         filter_file_key=None,
+        publish_field_parser=None,
+        work_field_parser=None,
+        cancel_token=None,
     ):
         """ """
         files = {}
+        publish_field_parser = publish_field_parser or TemplateFieldParser(
+            publish_template
+        )
+        work_field_parser = work_field_parser or TemplateFieldParser(work_template)
+
+        # parse the fields of all publish paths in one go:
+        all_publish_fields = publish_field_parser.get_fields_for_paths(
+            [sg_publish["path"] for sg_publish in sg_publishes]
+        )
+
+        # the modified by details of local publishes are looked up for all files at once:
+        # unknown_modified_by = [(publish_path, file_details, uid)]
+        unknown_modified_by = []
 
         # and add in publish details:
         ctx_fields = context.as_template_fields(work_template)
 
         for sg_publish in sg_publishes:
+            self._check_cancelled(cancel_token)
             file_details = {}
 
             # always have a path:
@@ -353,7 +677,7 @@ class FileFinder(QtCore.QObject):
             # The order is important as it ensures that the user is correct if the
             # publish file is in a user sandbox but we also need to be careful not
             # to overrwrite fields that are being ignored when comparing work files
-            publish_fields = publish_template.get_fields(publish_path)
+            publish_fields = all_publish_fields[publish_path]
             wp_fields = publish_fields.copy()
             for k, v in ctx_fields.items():
                 if k not in version_compare_ignore_fields:
@@ -362,7 +686,7 @@ class FileFinder(QtCore.QObject):
             # build the unique file key for the publish path.  All files that share the same key are considered
             # to be different versions of the same file.
             file_key = FileItem.build_file_key(
-                wp_fields, work_template, version_compare_ignore_fields
+                wp_fields, work_field_parser, version_compare_ignore_fields
             )
             if filter_file_key and file_key != filter_file_key:
                 # we can ignore this file completely!
@@ -388,18 +712,20 @@ class FileFinder(QtCore.QObject):
             # entity
             file_details["entity"] = context.entity
 
-            # local file modified details:
-            if os.path.exists(publish_path):
-                try:
-                    modified_at = os.path.getmtime(publish_path)
-                    file_details["modified_at"] = datetime.fromtimestamp(
-                        modified_at, tz=sg_timezone.local
-                    )
-                except OSError:
-                    # ignore OSErrors as it's probably a permissions thing!
-                    pass
-                file_details["modified_by"] = g_user_cache.get_file_last_modified_user(
-                    publish_path
+            # local file modified details, using a single stat call for both the
+            # modification time and the owner:
+            publish_stat = None
+            try:
+                publish_stat = file_stat(os.stat(publish_path))
+            except OSError:
+                # the file doesn't exist locally or it's probably a permissions thing!
+                pass
+            if publish_stat:
+                file_details["modified_at"] = datetime.fromtimestamp(
+                    publish_stat.mtime, tz=sg_timezone.local
+                )
+                unknown_modified_by.append(
+                    (publish_path, file_details, publish_stat.uid)
                 )
             else:
                 # just use the publish info
@@ -422,41 +748,97 @@ class FileFinder(QtCore.QObject):
                 "publish_path": publish_path,
                 "publish_details": file_details,
             }
+
+        self._check_cancelled(cancel_token)
+        self._resolve_modified_by(unknown_modified_by)
+
         return files
 
-    def _find_publishes(self, publish_filters):
+    def _get_file_key_fields(self, file_key, template):
+        """
+        Convert a file key built with FileItem.build_file_key() back into template fields.
+
+        :param file_key:    The file key to convert
+        :param template:    The template the file key was built for
+        :returns:           A dictionary of fields.  Fields whose values can't be converted are
+                            omitted.
+        """
+        fields = {}
+        for name, str_value in file_key:
+            key = template.keys.get(name)
+            if not key:
+                continue
+            if not isinstance(str_value, str):
+                # default values are stored as they are:
+                fields[name] = str_value
+                continue
+            try:
+                fields[name] = key.value_from_str(str_value)
+            except TankError:
+                continue
+        return fields
+
+    def _find_publishes(self, publish_filters, order=None):
         """
         Find all publishes for the specified context and publish template
 
+        :param publish_filters:     The filters to find the publishes with
+        :param order:               Optional order to return the publishes in
         :returns:                   List of dictionaries, each one containing the details
                                     of an individual published file
         """
-        fields = [
-            "id",
-            "description",
-            "version_number",
-            "image",
-            "created_at",
-            "created_by",
-            "name",
-            "path",
-            "task",
-        ]
         published_file_type = sgtk.util.get_published_file_entity_type(self._app.sgtk)
         sg_publishes = self._app.shotgun.find(
-            published_file_type, publish_filters, fields
+            published_file_type,
+            publish_filters,
+            FileFinder._PUBLISH_FIELDS,
+            order=order,
         )
         return sg_publishes
 
-    def _filter_publishes(self, sg_publishes, publish_template, valid_file_extensions):
+    def _uses_default_filter_publishes_hook(self):
+        """
+        :returns:   True if the filter_publishes hook is the one shipped with the app, which
+                    neither modifies the publishes nor depends on the other publishes in the list
+        """
+        return self._app.get_setting("hook_filter_publishes") in (
+            "default",
+            FileFinder._DEFAULT_FILTER_PUBLISHES_HOOK,
+        )
+
+    def _filter_publishes(
+        self,
+        sg_publishes,
+        publish_template,
+        valid_file_extensions,
+        publish_field_parser=None,
+        cancel_token=None,
+    ):
         """ """
-        # build list of publishes to send to the filter_publishes hook:
+        publish_field_parser = publish_field_parser or TemplateFieldParser(
+            publish_template
+        )
+
+        # build list of publishes to send to the filter_publishes hook.  The default hook doesn't
+        # modify the publishes so it is given the shared, read-only, records but custom hooks may
+        # modify them in place so they are given mutable copies:
+        if not self._uses_default_filter_publishes_hook():
+            sg_publishes = [
+                (
+                    sg_publish.to_dict()
+                    if isinstance(sg_publish, PublishRecord)
+                    else sg_publish
+                )
+                for sg_publish in sg_publishes
+            ]
         hook_publishes = [{"sg_publish": sg_publish} for sg_publish in sg_publishes]
 
         # execute the hook - this will return a list of filtered publishes:
+        self._check_cancelled(cancel_token)
         hook_result = self._app.execute_hook(
             "hook_filter_publishes", publishes=hook_publishes
         )
+        self._check_cancelled(cancel_token)
         if not isinstance(hook_result, list):
             self._app.log_error(
                 "hook_filter_publishes returned an unexpected result type '%s' - ignoring!"
@@ -467,6 +849,7 @@ class FileFinder(QtCore.QObject):
         # split back out publishes:
         published_files = []
         for item in hook_result:
+            self._check_cancelled(cancel_token)
             sg_publish = item.get("sg_publish")
             if not sg_publish:
                 continue
@@ -487,7 +870,7 @@ class FileFinder(QtCore.QObject):
                 continue
 
             # make sure path matches the publish template:
-            if not publish_template.validate(path):
+            if not publish_field_parser.validate(path):
                 continue
 
             # build file details for this publish:
@@ -525,6 +908,87 @@ class FileFinder(QtCore.QObject):
                                                 different versions of the same file
         :returns:                               A list of file paths.
         """
+        return list(
+            self._find_work_file_records(
+                context, work_template, version_compare_ignore_fields
+            )
+        )
+
+    def _find_work_file_records(
+        self,
+        context,
+        work_template,
+        version_compare_ignore_fields,
+        work_field_parser=None,
+        key_fields=None,
+        cancel_token=None,
+    ):
+        """
+        Find all work files for the specified context and work template together with their
+        indexed details if the work file index is enabled.
+
+        :param context:                         The context to find work files for
+        :param work_template:                   The work template to match found files against
+        :param version_compare_ignore_fields:   List of fields to ignore when comparing files in order to find
+                                                different versions of the same file
+        :param work_field_parser:               Optional TemplateFieldParser for the work template
+        :param key_fields:                      Optional fields of a file key used to only find the
+                                                versions of a single file
+        :param cancel_token:                    Optional CancellationToken checked while walking the
+                                                work area
+        :returns:                               A dictionary of {path:WorkFileRecord}.  The fields of the
+                                                records will be None if the work file index isn't used and
+                                                records will be None if the file details couldn't be read.
+        """
+        search_fields = self._get_work_file_search_fields(
+            context, work_template, version_compare_ignore_fields, key_fields
+        )
+        if not search_fields:
+            return {}
+        work_fields, skip_fields = search_fields
+
+        # find paths, using the work file index to avoid re-listing directories that
+        # haven't changed since the last search if it is enabled:
+        index = None
+        if self._app.get_setting("use_work_file_index", False):
+            if g_work_file_index.is_enabled:
+                index = g_work_file_index
+
+        work_field_parser = work_field_parser or TemplateFieldParser(work_template)
+        found_files = TemplateWalker(
+            work_template, index, work_field_parser, cancel_token
+        ).find_files(work_fields, skip_fields, skip_missing_optional_keys=True)
+        if not index:
+            # use the file details collected while walking the directories:
+            return dict(
+                (path, WorkFileRecord(path, None, *stat) if stat else None)
+                for path, stat in found_files.items()
+            )
+
+        self._check_cancelled(cancel_token)
+        work_file_paths = list(found_files)
+        search_key = WorkFileIndex.search_key(work_template, work_fields, skip_fields)
+        records = index.update_work_files(
+            search_key, work_field_parser, work_file_paths
+        )
+        return dict((path, records.get(path)) for path in work_file_paths)
+
+    def _get_work_file_search_fields(
+        self, context, work_template, version_compare_ignore_fields, key_fields=None
+    ):
+        """
+        Get the fields used to search for the work files of a context.
+
+        :param context:                         The context to find work files for
+        :param work_template:                   The work template to match found files against
+        :param version_compare_ignore_fields:   List of fields to ignore when comparing files in order to find
+                                                different versions of the same file
+        :param key_fields:                      Optional fields of a file key.  These fields are fixed so
+                                                that only versions of that file are searched for.
+        :returns:                               A tuple containing the fields from the context and the list of
+                                                fields to treat as wildcards, or None if the fields couldn't be
+                                                resolved from the context.
+        """
         # find work files that match the current work template:
         work_fields = []
         try:
@@ -534,7 +998,7 @@ class FileFinder(QtCore.QObject):
             # when the context object does not have any corresponding objects on
             # disk / in the path cache. In this case, we cannot continue with any
             # file system resolution, so just exit early insted.
-            return []
+            return None
 
         # Build list of fields to ignore when looking for files, any missing key
         # is treated as a wildcard, which allows, for example to retrieve all files
@@ -551,19 +1015,93 @@ class FileFinder(QtCore.QObject):
         if "version" not in skip_fields:
             skip_fields += ["version"]
 
-        # find paths:
-        work_file_paths = self._app.sgtk.paths_from_template(
-            work_template, work_fields, skip_fields, skip_missing_optional_keys=True
+        if key_fields:
+            # all files with the same key only differ by the fields that are ignored
+            # when comparing files so fix all other fields:
+            work_fields.update(key_fields)
+            skip_fields = [f for f in skip_fields if f not in key_fields]
+
+        return work_fields, skip_fields
+
+    def find_work_files_in_directory(self, work_area, dir_path):
+        """
+        Find the work files for a work area that live in a single directory.  This is used to
+        refresh the work files of a directory that has changed without searching the whole
+        work area again.
+
+        :param work_area:   The WorkArea to find work files for
+        :param dir_path:    The directory to look for work files in
+        :returns:           A list of FileItem instances, one for each work file found in the
+                            directory.
+        """
+        return [
+            FileItem(**kwargs)
+            for kwargs in self._find_work_file_details_in_directory(work_area, dir_path)
+        ]
+
+    def _find_work_file_details_in_directory(self, work_area, dir_path):
+        """
+        Find the details of the work files for a work area that live in a single directory.
+
+        :param work_area:   The WorkArea to find work files for
+        :param dir_path:    The directory to look for work files in
+        :returns:           A list of dictionaries, one for each work file found in the
+                            directory, containing the arguments to construct a FileItem with
+        """
+        if not work_area or not work_area.context or not work_area.work_template:
+            return []
+        work_template = work_area.work_template
+
+        search_fields = self._get_work_file_search_fields(
+            work_area.context, work_template, work_area.version_compare_ignore_fields
+        )
+        if not search_fields:
+            return []
+        work_fields, skip_fields = search_fields
+
+        work_file_records = {}
+        try:
+            with os.scandir(dir_path) as it:
+                for entry in it:
+                    if entry.name.startswith("."):
+                        continue
+                    path = os.path.join(dir_path, entry.name)
+                    if not work_template.validate(path, work_fields, skip_fields):
+                        continue
+                    try:
+                        stat = file_stat(entry.stat())
+                        record = WorkFileRecord(path, None, *stat)
+                    except OSError:
+                        record = None
+                    work_file_records[path] = record
+        except OSError:
+            # ignore OSErrors as it's probably a permissions thing!
+            return []
+
+        filtered_work_files = self._filter_work_files(
+            list(work_file_records), work_area.valid_file_extensions
+        )
+        work_item_details = self._process_work_files(
+            filtered_work_files,
+            work_template,
+            work_area.context,
+            FileFinder._FileNameMap(),
+            work_area.version_compare_ignore_fields,
+            work_file_records=work_file_records,
+            work_field_parser=work_area.work_field_parser,
         )
-        return work_file_paths
+        return list(work_item_details.values())
 
-    def _filter_work_files(self, work_file_paths, valid_file_extensions):
+    def _filter_work_files(
+        self, work_file_paths, valid_file_extensions, cancel_token=None
+    ):
         """
         Filter the given list of file paths by calling the `hook_filter_work_files`
         hook, and validate them against the given extensions list.
 
         :param work_file_paths: A list of file paths to consider.
         :param valid_file_extensions: A list of valid extensions.
+        :param cancel_token: An optional :class:`CancellationToken` checked around the hook call.
         :returns: A list of dictionaries for every filtered path, with details
                   about the filtered path.
         """
@@ -574,9 +1112,11 @@ class FileFinder(QtCore.QObject):
         hook_work_files = [{"work_file": {"path": path}} for path in work_file_paths]
 
         # Execute the hook - this will return a list of filtered paths:
+        self._check_cancelled(cancel_token)
         hook_result = self._app.execute_hook(
             "hook_filter_work_files", work_files=hook_work_files
         )
+        self._check_cancelled(cancel_token)
         if not isinstance(hook_result, list):
             self._app.log_error(
                 "hook_filter_work_files returned an unexpected result type '%s' - ignoring..."
@@ -632,6 +1172,29 @@ class AsyncFileFinder(FileFinder):
     any files found via signals as they are found.
     """
 
+    class _ChunkedResults(object):
+        """
+        Tracks the chunks a single list of work files, or publishes, found for a user is
+        processed in.
+        """
+
+        def __init__(self, work_area, is_publishes):
+            """
+            Construction
+
+            :param work_area:       The WorkArea the files were found in
+            :param is_publishes:    True if the files are publishes, False if they are work files
+            """
+            self.work_area = work_area
+            self.is_publishes = is_publishes
+            self.pending_chunks = 0
+            self.found_file_versions = set()
+            # self.publish_file_versions[publish id] = (key, version) of the file the publish was
+            # processed into:
+            self.publish_file_versions = {}
+            # set when a more recent list of files has been found for the same user:
+            self.superseded = False
+
     class _SearchData(object):
         def __init__(self, search_id, entity, users, publish_model):
             """ """
@@ -641,36 +1204,111 @@ class AsyncFileFinder(FileFinder):
             self.publish_model = publish_model
             self.publish_model_refreshed = False
             self.aborted = False
+            self.is_visible = False
 
             self.name_map = FileFinder._FileNameMap()
+            self.context_map = FileFinder._ContextMap()
+            # cancelled when the search is stopped so that running tasks stop early:
+            self.cancel_token = CancellationToken()
 
             self.construct_work_area_task = None
             self.resolve_work_area_task = None
-            self.find_work_files_tasks = set()
+            # self.filter_work_files_tasks[task_id] = _ChunkedResults
+            self.filter_work_files_tasks = {}
+            # self.find_work_files_tasks[task_id] = _ChunkedResults
+            self.find_work_files_tasks = {}
             self.load_cached_pubs_task = None
-            self.find_publishes_tasks = set()
+            self.publish_filters = None
+            self.refresh_publishes_task = None
+            # self.filter_publishes_tasks[task_id] = _ChunkedResults
+            self.filter_publishes_tasks = {}
+            # self.find_publishes_tasks[task_id] = _ChunkedResults
+            self.find_publishes_tasks = {}
             self.user_work_areas = {}
+            # self.latest_results[(user_id, is_publishes)] = _ChunkedResults
+            self.latest_results = {}
 
     _FIND_PUBLISHES_PRIORITY, _FIND_FILES_PRIORITY = (20, 40)
+    # added to the priority of all tasks of searches whose results are visible in a view so
+    # that they run before any off-screen work:
+    _VISIBLE_PRIORITY_BOOST = 100
+
+    # maximum number of files processed, and emitted, in a single chunk:
+    CHUNK_SIZE = 500
+
+    # maximum number of resolved work areas kept so they can be re-used when searching the same
+    # entity again:
+    MAX_CACHED_WORK_AREAS = 32
+
+    # maximum number of publish lists kept so that only the publishes that changed need to be
+    # queried when searching the same entity again:
+    MAX_CACHED_PUBLISH_LISTS = 32
+
+    # the publishes of searches that start refreshing their publishes within this many
+    # milliseconds of each other are queried together:
+    PUBLISH_REFRESH_BATCH_DELAY = 50
+
+    # maximum number of searches whose publishes are queried together:
+    MAX_PUBLISH_REFRESH_BATCH_SIZE = 100
+
+    # default maximum number of publish models, see the publish_model_pool_size setting:
+    DEFAULT_PUBLISH_MODEL_POOL_SIZE = 4
 
     # Signals
+    #
+    # Files and publishes are emitted in chunks as they are processed.  The last argument is None
+    # for all but the last chunk of a list of files found for a user, for which it is the set of
+    # (key, version) tuples of every file in the list.
     work_area_found = QtCore.Signal(object, object)
     work_area_resolved = QtCore.Signal(object, object)  # search_id, WorkArea
     files_found = QtCore.Signal(
-        object, object, object
-    )  # search_id, file list, WorkArea
+        object, object, object, object
+    )  # search_id, file list, WorkArea, found file versions
     publishes_found = QtCore.Signal(
-        object, object, object
-    )  # search_id, file list, WorkArea
+        object, object, object, object
+    )  # search_id, file list, WorkArea, found file versions
     search_failed = QtCore.Signal(object, object)  # search_id, message
     search_completed = QtCore.Signal(object)  # search_id
+    # the file list is None if the directory couldn't be searched:
+    directory_work_files_found = QtCore.Signal(object, object)  # request_id, file list
 
     def __init__(self, bg_task_manager, parent=None):
         """ """
         FileFinder.__init__(self, parent)
 
         self._searches = {}
+
+        # publish models are pooled and only held by searches while they load or refresh their
+        # cached publishes:
+        self._publish_model_pool_size = max(
+            1,
+            self._app.get_setting(
+                "publish_model_pool_size",
+                AsyncFileFinder.DEFAULT_PUBLISH_MODEL_POOL_SIZE,
+            ),
+        )
+        self._publish_models = []
         self._available_publish_models = []
+        # self._searches_waiting_for_publish_model[search_id] = WorkArea
+        self._searches_waiting_for_publish_model = OrderedDict()
+        # self._resolved_work_areas[(entity type, entity id)] = WorkArea
+        self._resolved_work_areas = OrderedDict()
+        # self._publish_lists[publish filters key] = list of publishes last found for the filters
+        self._publish_lists = OrderedDict()
+
+        # self._pending_publish_refreshes[search_id] = list of cached publishes to refresh
+        self._pending_publish_refreshes = OrderedDict()
+        # self._publish_refresh_batches[task_id] = (group id, [search ids], CancellationToken)
+        self._publish_refresh_batches = {}
+        # self._directory_requests[task_id] = group id of the task finding the work files in a
+        # single directory
+        self._directory_requests = {}
+        self._publish_refresh_timer = QtCore.QTimer(self)
+        self._publish_refresh_timer.setSingleShot(True)
+        self._publish_refresh_timer.setInterval(
+            AsyncFileFinder.PUBLISH_REFRESH_BATCH_DELAY
+        )
+        self._publish_refresh_timer.timeout.connect(self._flush_publish_refreshes)
 
         self._bg_task_manager = bg_task_manager
         self._bg_task_manager.task_completed.connect(self._on_background_task_completed)
@@ -679,17 +1317,32 @@ class AsyncFileFinder(FileFinder):
             self._on_background_search_finished
         )
 
+        # pre-warm the pool so that the first search doesn't have to create a model:
+        self._available_publish_models.append(self._create_publish_model())
+
     def shut_down(self):
         """ """
+        self._app.log_debug(self._get_publish_model_pool_report())
+
         # clean up any publish models - not doing this will result in
         # severe instability!
-        for search in self._searches:
-            if search.publish_model:
-                self._available_publish_models.append(search.publish_model)
         self._searches = {}
-        for publish_model in self._available_publish_models:
+        self._searches_waiting_for_publish_model = OrderedDict()
+        for publish_model in self._publish_models:
             publish_model.destroy()
+        self._publish_models = []
         self._available_publish_models = []
+        self._resolved_work_areas = OrderedDict()
+        self._publish_lists = OrderedDict()
+        self._publish_refresh_timer.stop()
+        self._app.log_debug(g_publish_record_stats.report())
+        self._pending_publish_refreshes = OrderedDict()
+        for _, _, cancel_token in self._publish_refresh_batches.values():
+            cancel_token.cancel()
+        self._publish_refresh_batches = {}
+        for group_id in self._directory_requests.values():
+            self._bg_task_manager.stop_task_group(group_id)
+        self._directory_requests = {}
 
         # and shut down the task manager
         if self._bg_task_manager:
@@ -704,7 +1357,7 @@ class AsyncFileFinder(FileFinder):
                 self._on_background_search_finished
             )
 
-    def begin_search(self, entity, users=None):
+    def begin_search(self, entity, users=None, reuse_work_area=False, is_visible=False):
         """
         A full search involves several stages:
 
@@ -725,56 +1378,124 @@ class AsyncFileFinder(FileFinder):
         :param entity:  The entity to search for files for
         :param users:   A list of user sandboxes to search for files for.  If 'None' then only files for the current
                         users sandbox will be searched for.
+        :param reuse_work_area: If True and a work area has already been resolved for the entity by a previous
+                                search then stage 1 is skipped and that work area is used instead.
+        :param is_visible:      True if the results of the search are visible, in which case its tasks are run
+                                before the tasks of searches that aren't.  See :meth:`set_search_visible`.
         """
         users = users or []
 
         # get a new unique group id from the task manager - this will be used as the search id
         search_id = self._bg_task_manager.next_group_id()
 
-        # get a publish model - re-use if possible, otherwise create a new one.  Max number of publish
-        # models created will be the max number of searches at any one time.
-        publish_model = None
-        if self._available_publish_models:
-            # re-use an existing publish model:
-            publish_model = self._available_publish_models.pop(0)
-        else:
-            # create a new model:
-            publish_model = SgPublishedFilesModel(
-                search_id, self._bg_task_manager, parent=self
-            )
-            publish_model.data_refreshed.connect(self._on_publish_model_refreshed)
-            publish_model.data_refresh_fail.connect(
-                self._on_publish_model_refresh_failed
-            )
-            monitor_qobject_lifetime(publish_model, "Finder publish model")
-        publish_model.uid = search_id
-
-        # construct the new search data:
-        search = AsyncFileFinder._SearchData(search_id, entity, users, publish_model)
+        # construct the new search data.  A publish model is only acquired from the pool once the
+        # search is ready to load its cached publishes:
+        search = AsyncFileFinder._SearchData(search_id, entity, users, None)
+        search.is_visible = is_visible
         self._searches[search.id] = search
 
         # begin the search stage 1:
-        self._begin_search_stage_1(search)
+        work_area = None
+        if reuse_work_area:
+            work_area = self._get_resolved_work_area(entity)
+        self._begin_search_stage_1(search, work_area)
 
         # and return the search id:
         return search.id
 
-    def _begin_search_stage_1(self, search):
+    def begin_find_work_files_in_directory(self, work_area, dir_path):
+        """
+        Find the work files for a work area that live in a single directory in a background
+        task.  The directory_work_files_found signal is emitted once they have been found.
+
+        Runs in main thread.
+
+        :param work_area:   The WorkArea to find work files for
+        :param dir_path:    The directory to look for work files in
+        :returns:           The id of the request, passed to the directory_work_files_found
+                            signal
+        """
+        group_id = self._bg_task_manager.next_group_id()
+        task_id = self._bg_task_manager.add_task(
+            self._task_find_work_files_in_directory,
+            group=group_id,
+            priority=AsyncFileFinder._FIND_FILES_PRIORITY
+            + AsyncFileFinder._VISIBLE_PRIORITY_BOOST,
+            task_kwargs={"work_area": work_area, "dir_path": dir_path},
+        )
+        self._directory_requests[task_id] = group_id
+        return task_id
+
+    def _task_find_work_files_in_directory(self, work_area, dir_path, **kwargs):
         """ """
+        return {
+            "work_items": self._find_work_file_details_in_directory(work_area, dir_path)
+        }
+
+    def set_search_visible(self, search_id, is_visible):
+        """
+        Set whether the results of a search are visible.  The background tasks of visible searches
+        are run before the tasks of searches that aren't visible.  Tasks that have already been
+        queued keep their priority, this only affects the tasks added for the following stages.
+
+        :param search_id:   The id of the search
+        :param is_visible:  True if the results of the search are visible, False otherwise
+        """
+        search = self._searches.get(search_id)
+        if search:
+            search.is_visible = is_visible
+
+    def _get_priority(self, search, priority=None):
+        """
+        :param search:      The _SearchData to get a task priority for
+        :param priority:    The base priority of the task, None for the default priority
+        :returns:           The priority to use for the task taking the visibility of the search
+                            into account
+        """
+        if search.is_visible:
+            return (priority or 0) + AsyncFileFinder._VISIBLE_PRIORITY_BOOST
+        return priority
+
+    def _begin_search_stage_1(self, search, work_area=None):
+        """ """
+        if work_area:
+            # the work area was already resolved by a previous search so just pass it through
+            # to the next stage:
+            search.construct_work_area_task = (
+                self._bg_task_manager.add_pass_through_task(
+                    group=search.id,
+                    priority=self._get_priority(search),
+                    task_kwargs={
+                        "environment": work_area,
+                        "cancel_token": search.cancel_token,
+                    },
+                )
+            )
+            search.resolve_work_area_task = self._bg_task_manager.add_pass_through_task(
+                group=search.id,
+                priority=self._get_priority(search),
+                upstream_task_ids=[search.construct_work_area_task],
+                task_kwargs={"cancel_token": search.cancel_token},
+            )
+            return
+
         # start Stage 1 to construct the work area:
         # 1a. Construct a work area for the entity.  The work area contains the context as well as
         # all settings, etc. specific to the work area.
         search.construct_work_area_task = self._bg_task_manager.add_task(
             self._task_construct_work_area,
             group=search.id,
-            task_kwargs={"entity": search.entity},
+            priority=self._get_priority(search),
+            task_kwargs={"entity": search.entity, "cancel_token": search.cancel_token},
         )
 
         # 1b. Resolve sandbox users for the work area (if there are any)
         search.resolve_work_area_task = self._bg_task_manager.add_task(
             self._task_resolve_sandbox_users,
             group=search.id,
+            priority=self._get_priority(search),
             upstream_task_ids=[search.construct_work_area_task],
+            task_kwargs={"cancel_token": search.cancel_token},
         )
 
     def _begin_search_for_work_files(self, search, work_area):
@@ -792,75 +1513,236 @@ class AsyncFileFinder(FileFinder):
             find_work_files_task = self._bg_task_manager.add_task(
                 self._task_find_work_files,
                 group=search.id,
-                priority=AsyncFileFinder._FIND_FILES_PRIORITY,
-                task_kwargs={"environment": user_work_area},
+                priority=self._get_priority(
+                    search, AsyncFileFinder._FIND_FILES_PRIORITY
+                ),
+                task_kwargs={
+                    "environment": user_work_area,
+                    "cancel_token": search.cancel_token,
+                },
             )
 
-            # filter work files:
+            # filter work files.  Work items are then built in chunks once the
+            # filtered work files are known:
             filter_work_files_task = self._bg_task_manager.add_task(
                 self._task_filter_work_files,
                 group=search.id,
-                priority=AsyncFileFinder._FIND_FILES_PRIORITY,
+                priority=self._get_priority(
+                    search, AsyncFileFinder._FIND_FILES_PRIORITY
+                ),
                 upstream_task_ids=[find_work_files_task],
-                task_kwargs={"environment": user_work_area},
-            )
-
-            # build work items:
-            process_work_items_task = self._bg_task_manager.add_task(
-                self._task_process_work_items,
-                group=search.id,
-                priority=AsyncFileFinder._FIND_FILES_PRIORITY,
-                upstream_task_ids=[filter_work_files_task],
                 task_kwargs={
                     "environment": user_work_area,
-                    "name_map": search.name_map,
+                    "cancel_token": search.cancel_token,
                 },
             )
-            search.find_work_files_tasks.add(process_work_items_task)
+            search.filter_work_files_tasks[filter_work_files_task] = (
+                self._new_chunked_results(search, user_id, user_work_area, False)
+            )
 
     def _begin_search_process_publishes(self, search, sg_publishes):
         """ """
         # 3a. Process publishes
+        for user in search.users:
+            self._begin_filter_publishes(search, user, sg_publishes)
+
+    def _begin_search_process_publish_changes(
+        self, search, sg_publishes, changed_ids, deleted_ids
+    ):
+        """
+        Process the publishes that changed since the publishes found in the cache were processed.
+        The files the unchanged publishes were processed into are kept as they are.  Custom
+        filter_publishes hooks may filter each publish against the whole list, e.g. to only keep
+        the latest version of each name, so all publishes are processed again when one is used.
+
+        Runs in main thread
+
+        :param search:          The _SearchData for the search
+        :param sg_publishes:    The complete, up to date, list of publishes
+        :param changed_ids:     The set of ids of the publishes that were added or updated
+        :param deleted_ids:     The set of ids of the publishes that were deleted
+        """
+        if not changed_ids and not deleted_ids:
+            # the publishes found in the cache were up to date!
+            return
+
+        changed_publishes = [p for p in sg_publishes if p["id"] in changed_ids]
+        pending_results = set(search.filter_publishes_tasks.values())
+        filter_changes_only = self._uses_default_filter_publishes_hook()
         for user in search.users:
             user_id = user["id"] if user else None
-            user_work_area = search.user_work_areas[user_id]
+            previous_results = search.latest_results.get((user_id, True))
+            if (
+                not filter_changes_only
+                or not previous_results
+                or previous_results in pending_results
+                or previous_results.pending_chunks
+            ):
+                # the hook needs the whole list or the cached publishes haven't all been
+                # processed yet so there is no way to tell what they were processed into,
+                # process everything again instead:
+                self._begin_filter_publishes(search, user, sg_publishes)
+                continue
 
-            users_publishes = copy.deepcopy(sg_publishes)
+            unchanged_file_versions = dict(
+                (publish_id, file_version)
+                for publish_id, file_version in previous_results.publish_file_versions.items()
+                if publish_id not in changed_ids and publish_id not in deleted_ids
+            )
+            results = self._begin_filter_publishes(search, user, changed_publishes)
+            results.found_file_versions.update(unchanged_file_versions.values())
+            results.publish_file_versions.update(unchanged_file_versions)
 
-            # filter publishes:
-            filter_publishes_task = self._bg_task_manager.add_task(
-                self._task_filter_publishes,
-                group=search.id,
-                priority=AsyncFileFinder._FIND_PUBLISHES_PRIORITY,
-                task_kwargs={
-                    "environment": user_work_area,
-                    "sg_publishes": users_publishes,
-                },
+    def _begin_filter_publishes(self, search, user, sg_publishes):
+        """
+        Add a task to filter the publishes found for a user, the filtered publishes are then
+        processed in chunks.
+
+        Runs in main thread
+
+        :param search:          The _SearchData for the search
+        :param user:            The user to filter the publishes for
+        :param sg_publishes:    The list of publishes to filter
+        :returns:               The _ChunkedResults tracking the processing of the publishes
+        """
+        user_id = user["id"] if user else None
+        user_work_area = search.user_work_areas[user_id]
+
+        # publish records are immutable so they are shared by all users rather than copied:
+        g_publish_record_stats.add_shared(len(sg_publishes))
+
+        # filter publishes:
+        filter_publishes_task = self._bg_task_manager.add_task(
+            self._task_filter_publishes,
+            group=search.id,
+            priority=self._get_priority(
+                search, AsyncFileFinder._FIND_PUBLISHES_PRIORITY
+            ),
+            task_kwargs={
+                "environment": user_work_area,
+                "sg_publishes": sg_publishes,
+                "cancel_token": search.cancel_token,
+            },
+        )
+        # publish items are built in chunks once the filtered publishes are known:
+        results = self._new_chunked_results(search, user_id, user_work_area, True)
+        search.filter_publishes_tasks[filter_publishes_task] = results
+        return results
+
+    def _new_chunked_results(self, search, user_id, work_area, is_publishes):
+        """
+        Start tracking a new list of files found for a user.  Any list of the same type
+        previously found for the user is superseded by the new one.
+
+        :param search:          The _SearchData for the search
+        :param user_id:         The id of the user the files are being found for
+        :param work_area:       The WorkArea the files are being found in
+        :param is_publishes:    True if the files are publishes, False if they are work files
+        :returns:               A new _ChunkedResults instance
+        """
+        results = AsyncFileFinder._ChunkedResults(work_area, is_publishes)
+        previous_results = search.latest_results.get((user_id, is_publishes))
+        if previous_results:
+            previous_results.superseded = True
+        search.latest_results[(user_id, is_publishes)] = results
+        return results
+
+    def _begin_processing_chunks(self, search, results, files, task_kwargs):
+        """
+        Split the files found into chunks and add a task to process each chunk.
+
+        Runs in main thread
+
+        :param search:      The _SearchData for the search
+        :param results:     The _ChunkedResults the files are being processed for
+        :param files:       The list of filtered work files or publishes to process
+        :param task_kwargs: Additional keyword arguments for the processing tasks
+        """
+        if results.superseded:
+            return
+        if not files:
+            # nothing to process but the (empty) list still needs to be reported:
+            self._emit_chunk(search, results, {})
+            return
+
+        if results.is_publishes:
+            task_cb = self._task_process_publish_items
+            files_arg = "sg_publishes"
+            priority = self._get_priority(
+                search, AsyncFileFinder._FIND_PUBLISHES_PRIORITY
             )
-            # build publish items:
-            process_publish_items_task = self._bg_task_manager.add_task(
-                self._task_process_publish_items,
-                group=search.id,
-                priority=AsyncFileFinder._FIND_PUBLISHES_PRIORITY,
-                upstream_task_ids=[filter_publishes_task],
-                task_kwargs={
-                    "environment": user_work_area,
-                    "name_map": search.name_map,
-                },
+            chunk_tasks = search.find_publishes_tasks
+        else:
+            task_cb = self._task_process_work_items
+            files_arg = "work_files"
+            priority = self._get_priority(search, AsyncFileFinder._FIND_FILES_PRIORITY)
+            chunk_tasks = search.find_work_files_tasks
+
+        chunk_size = AsyncFileFinder.CHUNK_SIZE
+        for ri in range(0, len(files), chunk_size):
+            chunk_kwargs = dict(task_kwargs)
+            chunk_kwargs[files_arg] = files[ri : ri + chunk_size]
+            chunk_kwargs["environment"] = results.work_area
+            chunk_kwargs["name_map"] = search.name_map
+            chunk_kwargs["cancel_token"] = search.cancel_token
+            task_id = self._bg_task_manager.add_task(
+                task_cb, group=search.id, priority=priority, task_kwargs=chunk_kwargs
             )
+            chunk_tasks[task_id] = results
+            results.pending_chunks += 1
 
-            search.find_publishes_tasks.add(process_publish_items_task)
+    def _emit_chunk(self, search, results, item_args):
+        """
+        Emit the files processed for a chunk.  The files of lists that have been superseded
+        are dropped as the more recent list will report them.
+
+        Runs in main thread
+
+        :param search:      The _SearchData for the search
+        :param results:     The _ChunkedResults the chunk was processed for
+        :param item_args:   A dictionary of {(key, version):kwargs} where kwargs can be used to
+                            construct the FileItem for each file in the chunk
+        """
+        if results.superseded:
+            return
+
+        results.found_file_versions.update(item_args.keys())
+        if results.is_publishes:
+            # keep track of what each publish was processed into so that only the publishes
+            # that change need to be processed again when the publishes are refreshed:
+            for file_version, kwargs in item_args.items():
+                publish_id = (kwargs.get("publish_details") or {}).get(
+                    "published_file_entity_id"
+                )
+                if publish_id is not None:
+                    results.publish_file_versions[publish_id] = file_version
+        found_file_versions = None
+        if not results.pending_chunks:
+            found_file_versions = set(results.found_file_versions)
+
+        files = [FileItem(**kwargs) for kwargs in item_args.values()]
+        if results.is_publishes:
+            self.publishes_found.emit(
+                search.id, files, results.work_area, found_file_versions
+            )
+        else:
+            self.files_found.emit(
+                search.id, files, results.work_area, found_file_versions
+            )
 
     def _on_publish_model_refreshed(self, data_changed):
         """ """
         model = self.sender()
-        if model.uid not in self._searches:
+        search = self._searches.get(model.uid)
+        if not search or search.publish_model != model:
             return
-        search = self._searches[model.uid]
         search.publish_model_refreshed = True
 
-        # get any publishes from the publish model:
-        sg_publishes = copy.deepcopy(search.publish_model.get_sg_data())
+        # get any publishes from the publish model, the model isn't needed after this so it
+        # can be used by another search:
+        sg_publishes = build_publish_records(search.publish_model.get_sg_data())
+        self._release_publish_model(search)
+        self._add_publish_list(search.publish_filters, sg_publishes)
 
         # and begin processing:
         self._begin_search_process_publishes(search, sg_publishes)
@@ -868,8 +1750,9 @@ class AsyncFileFinder(FileFinder):
     def _on_publish_model_refresh_failed(self, msg):
         """ """
         model = self.sender()
-        search_id = model.search_id
-        if search_id not in self._searches:
+        search_id = model.uid
+        search = self._searches.get(search_id)
+        if not search or search.publish_model != model:
             return
         self.stop_search(search_id)
         self.search_failed.emit(search_id, msg)
@@ -880,6 +1763,23 @@ class AsyncFileFinder(FileFinder):
 
         Runs in main thread
         """
+        if task_id in self._directory_requests:
+            # found the work files in a single directory:
+            del self._directory_requests[task_id]
+            files = [FileItem(**kwargs) for kwargs in result.get("work_items") or []]
+            self.directory_work_files_found.emit(task_id, files)
+            return
+
+        if task_id in self._publish_refresh_batches:
+            # the publishes of a batch of searches were refreshed:
+            _, search_ids, _ = self._publish_refresh_batches.pop(task_id)
+            publish_changes = result.get("publish_changes") or []
+            for search_id, changes in zip(search_ids, publish_changes):
+                search = self._searches.get(search_id)
+                if search and search.refresh_publishes_task == task_id:
+                    self._on_publishes_refreshed(search, changes)
+            return
+
         if search_id not in self._searches:
             return
         search = self._searches[search_id]
@@ -894,8 +1794,8 @@ class AsyncFileFinder(FileFinder):
             missing_templates = work_area.get_missing_templates()
             if missing_templates:
                 # Notify that no files were found so the UI can update
-                self.publishes_found.emit(search_id, [], work_area)
-                self.files_found.emit(search_id, [], work_area)
+                self.publishes_found.emit(search_id, [], work_area, set())
+                self.files_found.emit(search_id, [], work_area, set())
                 search.aborted = True
                 return
 
@@ -905,49 +1805,86 @@ class AsyncFileFinder(FileFinder):
             # and also add a task to process cached publishes:
             search.load_cached_pubs_task = self._bg_task_manager.add_pass_through_task(
                 group=search.id,
-                priority=AsyncFileFinder._FIND_PUBLISHES_PRIORITY,
+                priority=self._get_priority(
+                    search, AsyncFileFinder._FIND_PUBLISHES_PRIORITY
+                ),
                 task_kwargs={"environment": work_area},
             )
         elif task_id == search.resolve_work_area_task:
             search.resolve_work_area_task = None
+            # keep the work area so that it can be re-used by later searches for the same entity:
+            self._add_resolved_work_area(search.entity, work_area)
             # found a work area so emit it:
             self.work_area_resolved.emit(search_id, work_area)
 
         elif task_id == search.load_cached_pubs_task:
             search.load_cached_pubs_task = None
-            # ok so now it's time to load the cached publishes:
-            sg_publishes = self._load_cached_publishes(search, work_area)
-            # begin stage 3 for the un-cached publishes:
-            self._begin_search_process_publishes(search, sg_publishes)
-            # we can also start the background refresh of the publishes model:
-            search.publish_model.refresh()
+            self._begin_search_load_publishes(search, work_area)
+
+        elif task_id in search.filter_publishes_tasks:
+            results = search.filter_publishes_tasks.pop(task_id)
+            # filtered publishes, process them in chunks:
+            self._begin_processing_chunks(
+                search, results, result.get("sg_publishes") or [], {}
+            )
 
         elif task_id in search.find_publishes_tasks:
-            search.find_publishes_tasks.remove(task_id)
-            # found publishes:
-            publish_item_args = (result.get("publish_items", {})).values()
-            files = [FileItem(**kwargs) for kwargs in publish_item_args]
-            self.publishes_found.emit(search_id, files, work_area)
+            results = search.find_publishes_tasks.pop(task_id)
+            results.pending_chunks -= 1
+            # found a chunk of publishes:
+            self._emit_chunk(search, results, result.get("publish_items") or {})
+
+        elif task_id in search.filter_work_files_tasks:
+            results = search.filter_work_files_tasks.pop(task_id)
+            # filtered work files, process them in chunks:
+            self._begin_processing_chunks(
+                search,
+                results,
+                result.get("work_files") or [],
+                {
+                    "work_file_records": result.get("work_file_records"),
+                    "context_map": search.context_map,
+                },
+            )
 
         elif task_id in search.find_work_files_tasks:
-            search.find_work_files_tasks.remove(task_id)
-            # found work files:
-            work_item_args = (result.get("work_items", {})).values()
-            files = [FileItem(**kwargs) for kwargs in work_item_args]
-            self.files_found.emit(search_id, files, work_area)
+            results = search.find_work_files_tasks.pop(task_id)
+            results.pending_chunks -= 1
+            # found a chunk of work files:
+            self._emit_chunk(search, results, result.get("work_items") or {})
 
     def _on_background_task_failed(self, task_id, search_id, msg, stack_trace):
         """ """
-        if search_id not in self._searches:
+        if task_id in self._directory_requests:
+            del self._directory_requests[task_id]
+            app = sgtk.platform.current_bundle()
+            app.log_debug("Failed to find the work files in a directory: %s" % msg)
+            app.log_debug(stack_trace)
+            self.directory_work_files_found.emit(task_id, None)
+            return
+
+        if task_id in self._publish_refresh_batches:
+            # refreshing the publishes of a batch of searches failed so they all failed:
+            _, batch_search_ids, _ = self._publish_refresh_batches.pop(task_id)
+            search_ids = [
+                batch_search_id
+                for batch_search_id in batch_search_ids
+                if batch_search_id in self._searches
+                and self._searches[batch_search_id].refresh_publishes_task == task_id
+            ]
+        else:
+            search_ids = [search_id] if search_id in self._searches else []
+        if not search_ids:
             return
-        self.stop_search(search_id)
 
         app = sgtk.platform.current_bundle()
         app.log_error(msg)
         app.log_debug(stack_trace)
 
-        # emit signal:
-        self.search_failed.emit(search_id, msg)
+        for search_id in search_ids:
+            self.stop_search(search_id)
+            # emit signal:
+            self.search_failed.emit(search_id, msg)
 
     def _on_background_search_finished(self, search_id):
         """ """
@@ -960,7 +1897,11 @@ class AsyncFileFinder(FileFinder):
         # that the search has actually finished!
         if search.users and not search.aborted:
             if (
-                search.find_publishes_tasks
+                search.construct_work_area_task
+                or search.resolve_work_area_task
+                or search.filter_publishes_tasks
+                or search.find_publishes_tasks
+                or search.filter_work_files_tasks
                 or search.find_work_files_tasks
                 or search.load_cached_pubs_task
                 or not search.publish_model_refreshed
@@ -980,26 +1921,73 @@ class AsyncFileFinder(FileFinder):
         if not search:
             return
 
+        # stop tasks that are already running as well as the ones still queued:
+        search.cancel_token.cancel()
         self._bg_task_manager.stop_task_group(search_id)
-        if search.publish_model:
-            search.publish_model.clear()
-            self._available_publish_models.append(search.publish_model)
+        self._stop_publishes_refresh(search)
+        self._searches_waiting_for_publish_model.pop(search_id, None)
+        self._release_publish_model(search)
         del self._searches[search_id]
 
+    def clear_resolved_work_areas(self):
+        """
+        Forget all the work areas resolved by previous searches.
+        """
+        self._resolved_work_areas = OrderedDict()
+
+    def _get_resolved_work_area(self, entity):
+        """
+        :param entity:  The entity to find the work area for
+        :returns:       The work area resolved for the entity by a previous search or None
+        """
+        if not entity:
+            return None
+        key = (entity.get("type"), entity.get("id"))
+        work_area = self._resolved_work_areas.get(key)
+        if work_area:
+            self._resolved_work_areas.move_to_end(key)
+        return work_area
+
+    def _add_resolved_work_area(self, entity, work_area):
+        """
+        Keep a work area resolved for an entity, evicting the least recently used work areas when
+        there are too many.
+
+        :param entity:      The entity the work area was resolved for
+        :param work_area:   The resolved WorkArea
+        """
+        if not entity or not work_area:
+            return
+        key = (entity.get("type"), entity.get("id"))
+        self._resolved_work_areas[key] = work_area
+        self._resolved_work_areas.move_to_end(key)
+        while len(self._resolved_work_areas) > AsyncFileFinder.MAX_CACHED_WORK_AREAS:
+            self._resolved_work_areas.popitem(last=False)
+
     def stop_all_searches(self):
         """ """
-        for search in self._searches.values():
+        self._searches_waiting_for_publish_model = OrderedDict()
+        for search in list(self._searches.values()):
+            search.cancel_token.cancel()
             self._bg_task_manager.stop_task_group(search.id)
-            if search.publish_model:
-                self._available_publish_models.append(search.publish_model)
+            self._release_publish_model(search)
         self._searches = {}
 
+        # and stop refreshing publishes for them:
+        self._publish_refresh_timer.stop()
+        self._pending_publish_refreshes = OrderedDict()
+        for group_id, _, cancel_token in self._publish_refresh_batches.values():
+            cancel_token.cancel()
+            self._bg_task_manager.stop_task_group(group_id)
+        self._publish_refresh_batches = {}
+
     ################################################################################################
     ################################################################################################
-    def _task_construct_work_area(self, entity, **kwargs):
+    def _task_construct_work_area(self, entity, cancel_token=None, **kwargs):
         """ """
         app = sgtk.platform.current_bundle()
         work_area = None
+        self._check_cancelled(cancel_token)
         if entity:
             # build a context from the search details:
             context = app.sgtk.context_from_entity_dictionary(entity)
@@ -1009,15 +1997,130 @@ class AsyncFileFinder(FileFinder):
             work_area = WorkArea(context)
         return {"environment": work_area}
 
-    def _task_resolve_sandbox_users(self, environment, **kwargs):
+    def _task_resolve_sandbox_users(self, environment, cancel_token=None, **kwargs):
         """ """
         if environment:
-            environment.resolve_user_sandboxes()
+            environment.resolve_user_sandboxes(cancel_token)
         return {"environment": environment}
 
+    def _begin_search_load_publishes(self, search, work_area):
+        """
+        Load the cached publishes for a search, process them and start refreshing them.  If a
+        publish model is needed to load the publishes but they are all in use, refreshing the
+        publishes of other searches, then the search waits for one to be released.
+
+        Runs in main thread.
+
+        :param search:      The _SearchData for the search
+        :param work_area:   The WorkArea for the search
+        """
+        # ok so now it's time to load the cached publishes:
+        sg_publishes = self._load_cached_publishes(search, work_area)
+        if sg_publishes is None:
+            self._searches_waiting_for_publish_model[search.id] = work_area
+            self._app.log_debug(
+                "All %d publish models are in use, %d searches waiting"
+                % (
+                    len(self._publish_models),
+                    len(self._searches_waiting_for_publish_model),
+                )
+            )
+            return
+        # the publish model is only held while the publishes are refreshed by it:
+        self._release_publish_model(search)
+        # begin stage 3 for the un-cached publishes:
+        self._begin_search_process_publishes(search, sg_publishes)
+        # we can also start the background refresh of the publishes:
+        self._begin_publishes_refresh(search, sg_publishes)
+
+    def _create_publish_model(self):
+        """
+        Create a new publish model and add it to the pool.
+
+        :returns:   The SgPublishedFilesModel created
+        """
+        publish_model = SgPublishedFilesModel(None, self._bg_task_manager, parent=self)
+        publish_model.data_refreshed.connect(self._on_publish_model_refreshed)
+        publish_model.data_refresh_fail.connect(self._on_publish_model_refresh_failed)
+        monitor_qobject_lifetime(publish_model, "Finder publish model")
+        self._publish_models.append(publish_model)
+        return publish_model
+
+    def _acquire_publish_model(self, search):
+        """
+        Get a publish model for a search from the pool, creating a new model if none are available
+        and the pool isn't full.
+
+        :param search:  The _SearchData to get a publish model for
+        :returns:       The SgPublishedFilesModel for the search or None if all models are in use
+        """
+        if not search.publish_model:
+            if self._available_publish_models:
+                # re-use an existing publish model:
+                search.publish_model = self._available_publish_models.pop(0)
+            elif len(self._publish_models) < self._publish_model_pool_size:
+                search.publish_model = self._create_publish_model()
+            else:
+                return None
+            search.publish_model.uid = search.id
+        return search.publish_model
+
+    def _release_publish_model(self, search):
+        """
+        Return the publish model of a search to the pool and resume the searches that were waiting
+        for one.
+
+        :param search:  The _SearchData to release the publish model of
+        """
+        publish_model = search.publish_model
+        if not publish_model:
+            return
+        search.publish_model = None
+        publish_model.uid = None
+        publish_model.clear()
+        self._available_publish_models.append(publish_model)
+
+        while (
+            self._searches_waiting_for_publish_model and self._available_publish_models
+        ):
+            search_id, work_area = self._searches_waiting_for_publish_model.popitem(
+                last=False
+            )
+            waiting_search = self._searches.get(search_id)
+            if waiting_search:
+                self._begin_search_load_publishes(waiting_search, work_area)
+
+    @property
+    def publish_model_pool_utilization(self):
+        """
+        :returns:   A tuple containing the number of publish models in use, the number of publish
+                    models created, the maximum number of publish models and the number of
+                    searches waiting for a publish model
+        """
+        return (
+            len(self._publish_models) - len(self._available_publish_models),
+            len(self._publish_models),
+            self._publish_model_pool_size,
+            len(self._searches_waiting_for_publish_model),
+        )
+
+    def _get_publish_model_pool_report(self):
+        """
+        :returns:   A string summarizing the utilization of the publish model pool
+        """
+        return (
+            "Publish models: %d in use, %d created, pool size %d, %d searches waiting"
+            % self.publish_model_pool_utilization
+        )
+
     def _load_cached_publishes(self, search, work_area):
         """
         Runs in main thread.
+
+        :param search:      The _SearchData for the search
+        :param work_area:   The WorkArea for the search
+        :returns:           The list of cached publishes or None if a publish model is needed to
+                            load them but they are all in use
         """
         publish_filters = []
         # If there is no entity in the context then we are trying to load the publishes from the project.
@@ -1028,23 +2131,386 @@ class AsyncFileFinder(FileFinder):
             publish_filters.append(["task", "is", work_area.context.task])
         elif work_area.context.step:
             publish_filters.append(["task.Task.step", "is", work_area.context.step])
-        fields = [
-            "id",
-            "description",
-            "version_number",
-            "image",
-            "created_at",
-            "created_by",
-            "name",
-            "path",
-            "task",
-        ]
+        search.publish_filters = publish_filters
+
+        # use the publishes found by a previous search for the same filters if there are any as
+        # they are more recent than the ones cached on disk:
+        sg_publishes = self._get_publish_list(publish_filters)
+        if self._can_find_changed_publishes(sg_publishes):
+            return sg_publishes
+
+        # then the publishes merged by the last refresh, in this session or a previous one, as
+        # they are more recent than the ones the publish model cached the last time it found all
+        # the publishes:
+        sg_publishes = g_publish_list_cache.get(publish_filters)
+        if self._can_find_changed_publishes(sg_publishes):
+            return sg_publishes
+
+        if not self._acquire_publish_model(search):
+            # all publish models are in use:
+            return None
 
         # load the data into the publish model:
-        search.publish_model.load_data(filters=publish_filters, fields=fields)
-        return copy.deepcopy(search.publish_model.get_sg_data())
+        search.publish_model.load_data(
+            filters=publish_filters, fields=FileFinder._PUBLISH_FIELDS
+        )
+        return build_publish_records(search.publish_model.get_sg_data())
 
-    def _task_filter_publishes(self, sg_publishes, environment, **kwargs):
+    def _begin_publishes_refresh(self, search, sg_publishes):
+        """
+        Start refreshing the publishes found in the cache.  The refresh is deferred for a short
+        time so that the publishes of all the searches started together, e.g. for all the shots
+        of a sequence, can be queried together rather than with separate queries for each
+        search.
+
+        Runs in main thread.
+
+        :param search:          The _SearchData for the search
+        :param sg_publishes:    The list of publishes found in the cache
+        """
+        self._pending_publish_refreshes[search.id] = sg_publishes
+        if (
+            len(self._pending_publish_refreshes)
+            >= AsyncFileFinder.MAX_PUBLISH_REFRESH_BATCH_SIZE
+        ):
+            self._flush_publish_refreshes()
+        else:
+            # (re)start the timer so that searches started in quick succession are batched:
+            self._publish_refresh_timer.start()
+
+    def _flush_publish_refreshes(self):
+        """
+        Refresh the publishes of all searches waiting for a refresh.  Searches whose publishes
+        are found with the same filters, apart from the entity, are refreshed together by a single
+        task.  Only the publishes updated since the most recent publish in the cache are queried,
+        together with the ids of all the publishes to find the ones that were deleted.  A single
+        search with nothing to compute the changes from refreshes a publish model instead, if one
+        is available, so that the publishes are cached for the next session.
+
+        Runs in main thread.
+        """
+        self._publish_refresh_timer.stop()
+        pending_refreshes = self._pending_publish_refreshes
+        self._pending_publish_refreshes = OrderedDict()
+
+        # batch[publish filters key] = [(search, cached publishes)]
+        batches = OrderedDict()
+        for search_id, sg_publishes in pending_refreshes.items():
+            search = self._searches.get(search_id)
+            if not search:
+                continue
+            # the first filter is always the one for the entity:
+            key = self._get_publish_list_key(search.publish_filters[1:])
+            batches.setdefault(key, []).append((search, sg_publishes))
+
+        for batch in batches.values():
+            search, sg_publishes = batch[0]
+            if (
+                len(batch) == 1
+                and not self._can_find_changed_publishes(sg_publishes)
+                and self._acquire_publish_model(search)
+            ):
+                # refresh all publishes in the background:
+                search.publish_model.load_data(
+                    filters=search.publish_filters, fields=FileFinder._PUBLISH_FIELDS
+                )
+                search.publish_model.refresh()
+                continue
+
+            group_id = self._bg_task_manager.next_group_id()
+            cancel_token = CancellationToken()
+            task_id = self._bg_task_manager.add_task(
+                self._task_find_changed_publishes,
+                group=group_id,
+                priority=max(
+                    self._get_priority(search, AsyncFileFinder._FIND_PUBLISHES_PRIORITY)
+                    for search, _ in batch
+                ),
+                task_kwargs={
+                    "publish_requests": [
+                        (search.publish_filters, sg_publishes)
+                        for search, sg_publishes in batch
+                    ],
+                    "cancel_token": cancel_token,
+                },
+            )
+            self._publish_refresh_batches[task_id] = (
+                group_id,
+                [search.id for search, _ in batch],
+                cancel_token,
+            )
+            for search, _ in batch:
+                search.refresh_publishes_task = task_id
+
+    def _stop_publishes_refresh(self, search):
+        """
+        Stop refreshing the publishes of a search.  The task refreshing the publishes of a batch
+        of searches is only stopped once all the searches in the batch have been stopped.
+
+        Runs in main thread.
+
+        :param search:  The _SearchData for the search
+        """
+        self._pending_publish_refreshes.pop(search.id, None)
+        task_id = search.refresh_publishes_task
+        search.refresh_publishes_task = None
+        if task_id not in self._publish_refresh_batches:
+            return
+
+        group_id, search_ids, cancel_token = self._publish_refresh_batches[task_id]
+        for search_id in search_ids:
+            other_search = self._searches.get(search_id)
+            if other_search and other_search.refresh_publishes_task == task_id:
+                # still needed by another search:
+                return
+        cancel_token.cancel()
+        self._bg_task_manager.stop_task_group(group_id)
+        del self._publish_refresh_batches[task_id]
+
+    def _on_publishes_refreshed(self, search, publish_changes):
+        """
+        Process the publishes that changed since the publishes of a search were cached.
+
+        Runs in main thread.
+
+        :param search:          The _SearchData for the search
+        :param publish_changes: A dictionary containing the up to date list of publishes as well
+                                as the sets of ids of the publishes that changed and were deleted,
+                                as returned by :meth:`_task_find_changed_publishes`
+        """
+        search.refresh_publishes_task = None
+        search.publish_model_refreshed = True
+        sg_publishes = publish_changes.get("sg_publishes") or []
+        changed_ids = publish_changes.get("changed_ids") or set()
+        deleted_ids = publish_changes.get("deleted_ids") or set()
+        self._add_publish_list(search.publish_filters, sg_publishes)
+        # only the publishes that changed need to be processed:
+        self._begin_search_process_publish_changes(
+            search, sg_publishes, changed_ids, deleted_ids
+        )
+        # the refresh isn't part of the search's task group so check if that was all the
+        # search was waiting for:
+        self._on_background_search_finished(search.id)
+
+    @staticmethod
+    def _can_find_changed_publishes(sg_publishes):
+        """
+        :param sg_publishes:    A list of cached publishes or None
+        :returns:               True if the publishes that changed since the list was cached can be
+                                found, False if all publishes need to be found again
+        """
+        return bool(sg_publishes) and all(p.get("updated_at") for p in sg_publishes)
+
+    @staticmethod
+    def _get_publish_list_key(publish_filters):
+        """
+        :param publish_filters: The filters used to find a list of publishes
+        :returns:               A key identifying the list of publishes found for the filters
+        """
+        return json.dumps(publish_filters, sort_keys=True, default=str)
+
+    def _get_publish_list(self, publish_filters):
+        """
+        :param publish_filters: The filters used to find a list of publishes
+        :returns:               The list of publishes last found for the filters or None
+        """
+        key = self._get_publish_list_key(publish_filters)
+        sg_publishes = self._publish_lists.get(key)
+        if sg_publishes is not None:
+            self._publish_lists.move_to_end(key)
+        return sg_publishes
+
+    def _add_publish_list(self, publish_filters, sg_publishes):
+        """
+        Keep the list of publishes found for a set of filters, evicting the least recently used
+        lists when there are too many.
+
+        :param publish_filters: The filters used to find the publishes
+        :param sg_publishes:    The list of publishes found
+        """
+        if publish_filters is None:
+            return
+        key = self._get_publish_list_key(publish_filters)
+        self._publish_lists[key] = build_publish_records(sg_publishes)
+        self._publish_lists.move_to_end(key)
+        while len(self._publish_lists) > AsyncFileFinder.MAX_CACHED_PUBLISH_LISTS:
+            self._publish_lists.popitem(last=False)
+
+    @staticmethod
+    def _get_entity_key(entity):
+        """
+        :param entity:  An entity dictionary or None
+        :returns:       A key identifying the entity
+        """
+        if not entity:
+            return None
+        return (entity.get("type"), entity.get("id"))
+
+    def _task_find_changed_publishes(
+        self, publish_requests, cancel_token=None, **kwargs
+    ):
+        """
+        Find the publishes that changed since the lists of publishes of several searches were
+        cached.  The publishes of all the searches are found with the same few queries, filtering
+        on all of their entities at once, and then split back into a list for each search.
+
+        :param publish_requests:    A list of (publish filters, cached publishes) tuples, one for
+                                    each search.  The filters must all be the same apart from the
+                                    first one, which is always the filter on the entity.  Cached
+                                    publishes are either PublishRecords or dictionaries with their
+                                    date fields stored as unix timestamps like the publish model
+                                    does.  All publishes are found for the searches that don't
+                                    have any cached publishes.
+        :param cancel_token:        Optional CancellationToken for the searches
+        :returns:                   A dictionary containing a list with, for each search, a
+                                    dictionary containing the up to date list of PublishRecords
+                                    as well as the set of ids of the publishes that changed and the
+                                    set of ids of the publishes that were deleted
+        """
+        published_file_type = sgtk.util.get_published_file_entity_type(self._app.sgtk)
+        # the entity is needed to split the publishes found for all searches:
+        query_fields = FileFinder._PUBLISH_FIELDS + ["entity"]
+        common_filters = publish_requests[0][0][1:]
+
+        # split the searches between the ones that can find the publishes that changed and the
+        # ones that need to find all publishes:
+        delta_entities = {}
+        full_entities = {}
+        for publish_filters, sg_publishes in publish_requests:
+            entity = publish_filters[0][2]
+            if self._can_find_changed_publishes(sg_publishes):
+                delta_entities[self._get_entity_key(entity)] = entity
+            else:
+                full_entities[self._get_entity_key(entity)] = entity
+
+        # found_publishes[entity key] = {publish id:publish}
+        found_publishes = dict(
+            (key, {}) for key in list(delta_entities) + list(full_entities)
+        )
+        # current_ids[entity key] = set of ids of all publishes matching the filters
+        current_ids = dict((key, set()) for key in found_publishes)
+
+        def add_found_publish(sg_publish):
+            key = self._get_entity_key(sg_publish.pop("entity", None))
+            if key in found_publishes:
+                found_publishes[key][sg_publish["id"]] = sg_publish
+                current_ids[key].add(sg_publish["id"])
+
+        if full_entities:
+            self._check_cancelled(cancel_token)
+            for sg_publish in self._app.shotgun.find(
+                published_file_type,
+                common_filters + [["entity", "in", list(full_entities.values())]],
+                query_fields,
+            ):
+                add_found_publish(sg_publish)
+
+        if delta_entities:
+            # find the publishes updated since the most recent publish cached for any of the
+            # searches.  Publishes updated in the same second may not have been cached so those
+            # are found again:
+            high_water_mark = min(
+                max(p["updated_at"] for p in sg_publishes)
+                for _, sg_publishes in publish_requests
+                if self._can_find_changed_publishes(sg_publishes)
+            )
+            updated_since = datetime.fromtimestamp(
+                high_water_mark - 1, tz=sg_timezone.utc
+            )
+            entity_filter = ["entity", "in", list(delta_entities.values())]
+            self._check_cancelled(cancel_token)
+            for sg_publish in self._app.shotgun.find(
+                published_file_type,
+                common_filters
+                + [entity_filter, ["updated_at", "greater_than", updated_since]],
+                query_fields,
+            ):
+                add_found_publish(sg_publish)
+
+            # the ids of all publishes are needed to find the ones that were deleted:
+            self._check_cancelled(cancel_token)
+            for sg_publish in self._app.shotgun.find(
+                published_file_type, common_filters + [entity_filter], ["id", "entity"]
+            ):
+                key = self._get_entity_key(sg_publish.get("entity"))
+                if key in current_ids:
+                    current_ids[key].add(sg_publish["id"])
+
+        # publishes that now match the filters without having been updated, e.g. because they
+        # were retired and then revived, still need to be found:
+        cached_publishes = []
+        missing_ids = set()
+        for publish_filters, sg_publishes in publish_requests:
+            key = self._get_entity_key(publish_filters[0][2])
+            cached = dict((p["id"], p) for p in build_publish_records(sg_publishes))
+            cached_publishes.append(cached)
+            missing_ids.update(
+                current_ids[key] - set(cached) - set(found_publishes[key])
+            )
+        if missing_ids:
+            self._check_cancelled(cancel_token)
+            for sg_publish in self._app.shotgun.find(
+                published_file_type,
+                [["id", "in", list(missing_ids)]],
+                query_fields,
+            ):
+                add_found_publish(sg_publish)
+
+        # normalize the publishes found in the same way as the cached ones so that they can be
+        # compared and processed in the same way:
+        for key, publishes in found_publishes.items():
+            found_publishes[key] = dict(
+                (p["id"], p) for p in build_publish_records(publishes.values())
+            )
+
+        publish_changes = []
+        for (publish_filters, _), cached in zip(publish_requests, cached_publishes):
+            key = self._get_entity_key(publish_filters[0][2])
+            changes = self._get_publish_changes(
+                cached, found_publishes[key], current_ids[key]
+            )
+            if key in full_entities or changes["changed_ids"] or changes["deleted_ids"]:
+                # keep the merged publishes and, implicitly, their most recent update time so
+                # that the next session only finds the publishes that changed after them:
+                self._check_cancelled(cancel_token)
+                g_publish_list_cache.add(publish_filters, changes["sg_publishes"])
+            publish_changes.append(changes)
+        return {"publish_changes": publish_changes}
+
+    @staticmethod
+    def _get_publish_changes(cached_publishes, updated_publishes, current_ids):
+        """
+        :param cached_publishes:    Dictionary of {id:publish} for the publishes cached for a search
+        :param updated_publishes:   Dictionary of {id:publish} for the publishes found again
+        :param current_ids:         The set of ids of all publishes matching the search's filters
+        :returns:                   A dictionary containing the up to date list of publishes as
+                                    well as the set of ids of the publishes that changed and the
+                                    set of ids of the publishes that were deleted
+        """
+        changed_ids = set(
+            publish_id
+            for publish_id, sg_publish in updated_publishes.items()
+            if publish_id in current_ids
+            and cached_publishes.get(publish_id) != sg_publish
+        )
+        deleted_ids = set(cached_publishes) - current_ids
+
+        publishes = []
+        for publish_id in sorted(current_ids):
+            sg_publish = updated_publishes.get(publish_id) or cached_publishes.get(
+                publish_id
+            )
+            if sg_publish:
+                publishes.append(sg_publish)
+        return {
+            "sg_publishes": publishes,
+            "changed_ids": changed_ids,
+            "deleted_ids": deleted_ids,
+        }
+
+    def _task_filter_publishes(
+        self, sg_publishes, environment, cancel_token=None, **kwargs
+    ):
         """ """
         # time.sleep(5)
         filtered_publishes = []
@@ -1054,25 +2520,18 @@ class AsyncFileFinder(FileFinder):
             and environment.publish_template
             and environment.context
         ):
-
-            # convert created_at unix time stamp to shotgun std time stamp for all publishes
-            for sg_publish in sg_publishes:
-                created_at = sg_publish.get("created_at")
-                if created_at:
-                    created_at = datetime.fromtimestamp(
-                        created_at, sg_timezone.LocalTimezone()
-                    )
-                    sg_publish["created_at"] = created_at
-
+            # publishes are shared PublishRecords, already normalized when they were found:
             filtered_publishes = self._filter_publishes(
                 sg_publishes,
                 environment.publish_template,
                 environment.valid_file_extensions,
+                environment.publish_field_parser,
+                cancel_token,
             )
         return {"sg_publishes": filtered_publishes}
 
     def _task_process_publish_items(
-        self, sg_publishes, environment, name_map, **kwargs
+        self, sg_publishes, environment, name_map, cancel_token=None, **kwargs
     ):
         """ """
         publish_items = {}
@@ -1091,30 +2550,57 @@ class AsyncFileFinder(FileFinder):
                 environment.context,
                 name_map,
                 environment.version_compare_ignore_fields,
+                publish_field_parser=environment.publish_field_parser,
+                work_field_parser=environment.work_field_parser,
+                cancel_token=cancel_token,
             )
         return {"publish_items": publish_items, "environment": environment}
 
-    def _task_find_work_files(self, environment, **kwargs):
+    def _task_find_work_files(self, environment, cancel_token=None, **kwargs):
         """ """
-        work_files = []
+        work_file_records = {}
         if environment and environment.context and environment.work_template:
-            work_files = self._find_work_files(
+            work_file_records = self._find_work_file_records(
                 environment.context,
                 environment.work_template,
                 environment.version_compare_ignore_fields,
+                environment.work_field_parser,
+                cancel_token=cancel_token,
             )
-        return {"work_files": work_files}
+        return {
+            "work_files": list(work_file_records),
+            "work_file_records": work_file_records,
+        }
 
-    def _task_filter_work_files(self, work_files, environment, **kwargs):
+    def _task_filter_work_files(
+        self,
+        work_files,
+        environment,
+        work_file_records=None,
+        cancel_token=None,
+        **kwargs
+    ):
         """ """
         filtered_work_files = []
         if work_files:
             filtered_work_files = self._filter_work_files(
-                work_files, environment.valid_file_extensions
+                work_files, environment.valid_file_extensions, cancel_token
             )
-        return {"work_files": filtered_work_files}
+        return {
+            "work_files": filtered_work_files,
+            "work_file_records": work_file_records,
+        }
 
-    def _task_process_work_items(self, work_files, environment, name_map, **kwargs):
+    def _task_process_work_items(
+        self,
+        work_files,
+        environment,
+        name_map,
+        work_file_records=None,
+        context_map=None,
+        cancel_token=None,
+        **kwargs
+    ):
         """ """
         work_items = {}
         if (
@@ -1130,5 +2616,9 @@ class AsyncFileFinder(FileFinder):
                 environment.context,
                 name_map,
                 environment.version_compare_ignore_fields,
+                work_file_records=work_file_records,
+                work_field_parser=environment.work_field_parser,
+                context_map=context_map,
+                cancel_token=cancel_token,
             )
         return {"work_items": work_items, "environment": environment}
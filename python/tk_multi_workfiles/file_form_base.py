@@ -32,6 +32,7 @@ shotgun_globals = sgtk.platform.import_framework(
 
 from .entity_models import ShotgunExtendedEntityModel, ShotgunDeferredEntityModel
 from .file_model import FileModel
+from .compact_file_model import CompactFileModel
 from .my_tasks.my_tasks_model import MyTasksModel
 from .scene_operation import get_current_path, SAVE_FILE_AS_ACTION
 from .file_item import FileItem
@@ -282,9 +283,14 @@ class FileFormBase(QtGui.QWidget):
         Build the single file model to be used by the file open/save dialogs.
 
         :returns:   A FileModel instance that represents all the files found for a set of entities
-                    and users.
+                    and users.  The file_model_backend setting controls whether the standard or
+                    compact model is used.
         """
-        file_model = FileModel(self._bg_task_manager, parent=self)
+        app = sgtk.platform.current_bundle()
+        if app.get_setting("file_model_backend", "standard") == "compact":
+            file_model = CompactFileModel(self._bg_task_manager, parent=self)
+        else:
+            file_model = FileModel(self._bg_task_manager, parent=self)
         monitor_qobject_lifetime(file_model, "File Model")
         return file_model
 
@@ -15,6 +15,8 @@ import os
 from datetime import datetime, timedelta
 import copy
 
+from .thumbnail_cache import g_thumbnail_cache
+
 
 class FileItem(object):
     """
@@ -50,7 +52,8 @@ class FileItem(object):
 
         :param fields:          A dictionary of fields extracted from a file path
         :param template:        The template that represents the files this key will be
-                                used to compare.
+                                used to compare.  A TemplateFieldParser for the template
+                                can also be used.
         :param ignore_fields:   A list of fields to ignore when constructing the key.
                                 Typically this will contain at least 'version' but it
                                 may also contain other fields (e.g. user initials in
@@ -58,10 +61,10 @@ class FileItem(object):
         :returns:               An immutable 'key' that can be used for comparison and
                                 as the key in a dictionary (e.g. a string).
         """
-        ignore_fields = ignore_fields or []
         # always want to ignore 'version' and 'extension' if they are present in the fields
-        # dictionary
-        ignore_fields += ["version", "extension"]
+        # dictionary.  Note, a new set is built to avoid modifying the list passed in.
+        ignore_fields = set(ignore_fields or [])
+        ignore_fields.update(["version", "extension"])
 
         # populate the file key from the fields passed in that are included in
         # the template, skipping the ignore fields:
@@ -126,6 +129,7 @@ class FileItem(object):
         self._publish_details = publish_details or {}
 
         self._thumbnail_path = None
+        self._thumbnail_key = None
         self._thumbnail_image = None
 
         self._badge = None
@@ -135,6 +139,12 @@ class FileItem(object):
 
         self._versions = {}
 
+        # counter bumped whenever the details of this file change, used to invalidate the
+        # display data cached for it:
+        self._revision = 0
+        # self._display_cache[key] = (stamp, display data)
+        self._display_cache = {}
+
     # ------------------------------------------------------------------------------------------
     # General properties
 
@@ -214,15 +224,21 @@ class FileItem(object):
         """
         if value != self.thumbnail_path:
             self._thumbnail_path = value
+            self._thumbnail_key = None
             self._thumbnail_image = None
+            self._revision += 1
 
     thumbnail_path = property(_get_thumbnail_path, _set_thumbnail_path)
 
     # @property
     def _get_thumbnail(self):
         """
-        :returns:   The thumbnail QPixmap for this file
+        :returns:   The thumbnail QPixmap for this file.  Unless a pixmap was set explicitly this
+                    is fetched from the thumbnail cache, and may be regenerated from disk if it
+                    was evicted from memory.
         """
+        if self._thumbnail_image is None and self._thumbnail_key:
+            return g_thumbnail_cache.get(self._thumbnail_key)
         return self._thumbnail_image
 
     # @thumbnail.setter
@@ -230,10 +246,31 @@ class FileItem(object):
         """
         :param value:   The QPixmap that should be used to represent this file
         """
-        self._thumbnail_image = value
+        if value is not self._thumbnail_image:
+            self._thumbnail_image = value
+            self._revision += 1
 
     thumbnail = property(_get_thumbnail, _set_thumbnail)
 
+    # @property
+    def _get_thumbnail_key(self):
+        """
+        :returns:   The key in the thumbnail cache of the thumbnail displayed for this file.  This
+                    is either the thumbnail path of this file or of a previous version of it.
+        """
+        return self._thumbnail_key
+
+    # @thumbnail_key.setter
+    def _set_thumbnail_key(self, value):
+        """
+        :param value:   The key in the thumbnail cache of the thumbnail to display for this file
+        """
+        if value != self._thumbnail_key:
+            self._thumbnail_key = value
+            self._revision += 1
+
+    thumbnail_key = property(_get_thumbnail_key, _set_thumbnail_key)
+
     # @property
     def _get_versions(self):
         """
@@ -248,7 +285,12 @@ class FileItem(object):
         :param value:   A dictionary of {version:FileItem} pairs that represent all other
                         versions of this file
         """
-        self._versions = {k: value[k] for k in sorted(value)}
+        versions = {k: value[k] for k in sorted(value)}
+        if [(k, id(v)) for k, v in versions.items()] != [
+            (k, id(v)) for k, v in self._versions.items()
+        ]:
+            self._revision += 1
+        self._versions = versions
 
     versions = property(_get_versions, _set_versions)
 
@@ -319,6 +361,7 @@ class FileItem(object):
                     "Exception raised in hook while executing generate_badge_pixmap.",
                     exc_info=True,
                 )
+        self._revision += 1
 
     @property
     def badge(self):
@@ -335,6 +378,7 @@ class FileItem(object):
                         to the user.
         """
         self._badge = value
+        self._revision += 1
 
     # ------------------------------------------------------------------------------------------
     # Work file properties
@@ -442,6 +486,7 @@ class FileItem(object):
         self._publish_path = publish._publish_path
         self._publish_details = copy.deepcopy(publish._publish_details or {})
         self._badge = publish._badge
+        self._revision += 1
 
     def update_from_work_file(self, work_file):
         """
@@ -453,6 +498,7 @@ class FileItem(object):
         self._is_local = work_file._is_local
         self._path = work_file._path
         self._details = copy.deepcopy(work_file._details or {})
+        self._revision += 1
 
     def set_not_work_file(self):
         """
@@ -460,6 +506,7 @@ class FileItem(object):
         """
         if self._is_local:
             self._is_local = False
+            self._revision += 1
 
     def set_not_published(self):
         """
@@ -467,6 +514,35 @@ class FileItem(object):
         """
         if self._is_published:
             self._is_published = False
+            self._revision += 1
+
+    @property
+    def revision(self):
+        """
+        :returns:   A counter that is incremented every time the details, thumbnail, badge or
+                    versions of this file change
+        """
+        return self._revision
+
+    def get_display_data(self, key, build_fn, stamp=None):
+        """
+        Get data used to display this file, e.g. the data for a model role.  The data is only built
+        the first time it is requested and is then cached until this file or the stamp changes.
+
+        :param key:         A key identifying the display data
+        :param build_fn:    A callable that builds the display data if it isn't cached
+        :param stamp:       Optional value identifying the state of everything else the display
+                            data depends on, e.g. the other versions of the file or the current
+                            day.  The cached data is rebuilt whenever it changes.
+        :returns:           The display data
+        """
+        stamp = (self._revision, stamp)
+        cached = self._display_cache.get(key)
+        if cached and cached[0] == stamp:
+            return cached[1]
+        data = build_fn()
+        self._display_cache[key] = (stamp, data)
+        return data
 
     def format_published_by_details(self, single_line=False):
         """
@@ -72,6 +72,10 @@ class FileListForm(QtGui.QWidget):
     # file open
     CHECK_REFS_USER_SETTING = "check_references_on_file_open"
 
+    # Delay, in milliseconds, used to batch the reports of the items visible in the view to the
+    # file model while scrolling, resizing, etc.
+    VISIBLE_ITEMS_REPORT_DELAY = 100
+
     def __init__(
         self,
         parent,
@@ -157,6 +161,17 @@ class FileListForm(QtGui.QWidget):
         # Note, we have to keep a handle to the item delegate to help GC
         file_item_delegate = self._setup_view_item_delegate(self._ui.file_list_view)
 
+        # the groups and files visible in the view are reported to the file model so that the
+        # searches and thumbnails for them are processed first:
+        self._file_model = None
+        self._visible_items_timer = QtCore.QTimer(self)
+        self._visible_items_timer.setSingleShot(True)
+        self._visible_items_timer.setInterval(self.VISIBLE_ITEMS_REPORT_DELAY)
+        self._visible_items_timer.timeout.connect(self._report_visible_items)
+        self._ui.file_list_view.verticalScrollBar().valueChanged.connect(
+            self._schedule_visible_items_report
+        )
+
         # Set up the view modes
         self.view_modes = [
             {
@@ -268,7 +283,7 @@ class FileListForm(QtGui.QWidget):
                 "padding-bottom": 4,
                 "features": QtGui.QStyleOptionButton.Flat,
                 "get_data": self._get_expand_action_data,
-                "callback": lambda view, index, pos: view.toggle_expand(index),
+                "callback": self._on_expand_action_triggered,
             },
             ViewItemDelegate.LEFT,
         )
@@ -301,6 +316,12 @@ class FileListForm(QtGui.QWidget):
                 self._get_settings_key(self.FILTER_MENU_STATE), current_menu_state
             )
 
+            # nothing is visible anymore:
+            self._visible_items_timer.stop()
+            if self._file_model:
+                self._file_model.set_visible_items(self, [], [])
+                self._file_model = None
+
             # clear any references:
             self._file_to_select = None
             self._current_item_ref = None
@@ -507,6 +528,12 @@ class FileListForm(QtGui.QWidget):
             filter_model.rowsInserted.connect(self._on_filter_model_rows_inserted)
             filter_model.setSourceModel(model)
 
+            # the visible items change whenever the filtered rows change:
+            filter_model.rowsInserted.connect(self._schedule_visible_items_report)
+            filter_model.rowsRemoved.connect(self._schedule_visible_items_report)
+            filter_model.layoutChanged.connect(self._schedule_visible_items_report)
+            filter_model.modelReset.connect(self._schedule_visible_items_report)
+
             # set automatic sorting on the model:
             filter_model.sort(0, QtCore.Qt.DescendingOrder)
             filter_model.setDynamicSortFilter(True)
@@ -526,6 +553,9 @@ class FileListForm(QtGui.QWidget):
             self._ui.file_list_view.setModel(model)
             self._ui.file_details_view.setModel(model)
 
+        self._file_model = model
+        self._schedule_visible_items_report()
+
         # connect to the selection model:
         selection_model = self._ui.file_list_view.selectionModel()
         if selection_model:
@@ -546,7 +576,14 @@ class FileListForm(QtGui.QWidget):
                         False if this method ignores the event
         """
         if obj == self._ui.file_list_view.viewport():
-            if (
+            if event.type() in (
+                QtCore.QEvent.Resize,
+                QtCore.QEvent.Show,
+                QtCore.QEvent.Hide,
+            ):
+                # the items visible in the view may have changed:
+                self._schedule_visible_items_report()
+            elif (
                 event.type() == QtCore.QEvent.MouseButtonDblClick
                 and event.button() != QtCore.Qt.LeftButton
             ):
@@ -556,6 +593,109 @@ class FileListForm(QtGui.QWidget):
         # we ignore all other events
         return False
 
+    def _schedule_visible_items_report(self, *args):
+        """
+        Schedule a report of the items visible in the view to the file model.  Reports are
+        batched so that scrolling or resizing the view doesn't result in a report per event.
+
+        :param *args:   Arguments of the signal triggering the report, ignored
+        """
+        if self._file_model and not self._visible_items_timer.isActive():
+            self._visible_items_timer.start()
+
+    def _report_visible_items(self):
+        """
+        Report the groups and files visible in the file list view to the file model.  Groups are
+        laid out from top to bottom so only the groups that can be visible are looked at and, for
+        each of them, only the range of files that intersects the viewport.
+        """
+        if not self._file_model:
+            return
+
+        group_keys = []
+        file_keys = []
+        view = self._ui.file_list_view
+        view_model = view.model()
+        if view_model and view.isVisible():
+            viewport_rect = view.viewport().rect()
+            for group_row in range(view_model.rowCount()):
+                group_idx = view_model.index(group_row, 0)
+                if (
+                    get_model_data(group_idx, FileModel.NODE_TYPE_ROLE)
+                    != FileModel.GROUP_NODE_TYPE
+                ):
+                    continue
+                group_rect = view.visualRect(group_idx)
+                if group_rect.top() > viewport_rect.bottom():
+                    # this group and all the following ones are below the viewport:
+                    break
+
+                is_group_visible = group_rect.intersects(viewport_rect)
+                visible_rows = []
+                num_files = view_model.rowCount(group_idx)
+                if num_files and view.is_expanded(group_idx):
+                    visible_rows = self._find_visible_rows(
+                        view, group_idx, num_files, viewport_rect
+                    )
+                if not is_group_visible and not visible_rows:
+                    continue
+
+                src_idx = map_to_source(group_idx)
+                group_key = src_idx.model().itemFromIndex(src_idx).key
+                group_keys.append(group_key)
+                for file_row in visible_rows:
+                    file_idx = view_model.index(file_row, 0, group_idx)
+                    file_item = get_model_data(file_idx, FileModel.FILE_ITEM_ROLE)
+                    if file_item:
+                        file_keys.append((group_key, file_item.key))
+
+        self._file_model.set_visible_items(self, group_keys, file_keys)
+
+    def _find_visible_rows(self, view, group_idx, num_files, viewport_rect):
+        """
+        Find the rows of the files of an expanded group that intersect the viewport.  Files are
+        laid out in row order, from top to bottom, so the first and last visible files are found
+        with the indexes at the edges of the viewport or, if there are none, with a binary search.
+
+        :param view:            The view the group is displayed in
+        :param group_idx:       The index of the group in the view's model
+        :param num_files:       The number of files in the group
+        :param viewport_rect:   The rectangle of the viewport
+        :returns:               A range of the visible file rows, empty if none are visible
+        """
+        view_model = group_idx.model()
+
+        def file_rect(row):
+            return view.visualRect(view_model.index(row, 0, group_idx))
+
+        if file_rect(num_files - 1).bottom() < viewport_rect.top():
+            # the whole group is above the viewport:
+            return range(0)
+
+        def row_at(point):
+            idx = view.indexAt(point)
+            if idx.isValid() and idx.parent() == group_idx:
+                return idx.row()
+            return None
+
+        def bisect(is_before):
+            lo, hi = 0, num_files
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if is_before(file_rect(mid)):
+                    lo = mid + 1
+                else:
+                    hi = mid
+            return lo
+
+        first = row_at(viewport_rect.topLeft())
+        if first is None:
+            first = bisect(lambda rect: rect.bottom() < viewport_rect.top())
+        last = row_at(viewport_rect.bottomRight())
+        if last is None:
+            last = bisect(lambda rect: rect.top() <= viewport_rect.bottom()) - 1
+        return range(first, last + 1)
+
     def _update_selection(self, prev_selected_item=None):
         """
         Update the selection to either the to-be-selected file if set or the current item if known.  The
@@ -921,6 +1061,18 @@ class FileListForm(QtGui.QWidget):
 
         return {"visible": visible, "state": state}
 
+    def _on_expand_action_triggered(self, view, index, pos):
+        """
+        Callback triggered when the expand action of a group is clicked.
+
+        :param view:    The view the action was triggered in
+        :param index:   The index of the group
+        :param pos:     The position of the mouse when the action was triggered
+        """
+        view.toggle_expand(index)
+        # expanding or collapsing a group changes the items that are visible:
+        self._schedule_visible_items_report()
+
     def _actions_menu_requested(self, view, index, pos):
         """
         Callback triggered when a view item's action menu is requested to be shown.
@@ -9,6 +9,8 @@
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
 import weakref
+from collections import OrderedDict
+from datetime import date
 
 import sgtk
 from sgtk.platform.qt import QtGui, QtCore
@@ -16,8 +18,10 @@ from sgtk.platform.qt import QtGui, QtCore
 from .file_finder import AsyncFileFinder
 from .user_cache import g_user_cache
 from .file_search_cache import FileSearchCache
+from .work_area_watcher import WorkAreaWatcher
 from .util import value_to_str
 from .errors import MissingTemplatesError
+from .thumbnail_cache import g_thumbnail_cache
 
 shotgun_data = sgtk.platform.import_framework(
     "tk-framework-shotgunutils", "shotgun_data"
@@ -192,8 +196,11 @@ class FileModel(QtGui.QStandardItemModel, ViewItemRolesMixin):
             :returns:       Data for the specified role
             """
 
-            if role == QtCore.Qt.DisplayRole:
-                data = "%s, v%0d" % (self._file_item.name, self._file_item.version)
+            if role == FileModel.FILE_ITEM_ROLE:
+                data = self._file_item
+
+            elif role == FileModel.WORK_AREA_ROLE:
+                data = self._work_area
 
             elif role == QtCore.Qt.DecorationRole:
                 data = self._file_item.thumbnail
@@ -204,11 +211,36 @@ class FileModel(QtGui.QStandardItemModel, ViewItemRolesMixin):
                 if isinstance(data, str):
                     data = QtGui.QPixmap(data)
 
-            elif role == FileModel.FILE_ITEM_ROLE:
-                data = self._file_item
+            elif FileModel.is_display_role(self.model(), role):
+                # display data is only built the first time it's requested and is then cached
+                # on the file item until the file changes:
+                return self._file_item.get_display_data(
+                    role,
+                    lambda: self._build_display_data(role),
+                    (
+                        self.model().get_display_stamp(self._file_item)
+                        if self.model()
+                        else None
+                    ),
+                )
 
-            elif role == FileModel.WORK_AREA_ROLE:
-                data = self._work_area
+            else:
+                data = super(FileModel._FileModelItem, self).data(role)
+
+            return FileModel.sanitize_data(data, role)
+
+        def _build_display_data(self, role):
+            """
+            Build the data used to display the file for the specified role.
+
+            :param role:    The display role to build the data for
+            :returns:       Data for the specified role
+            """
+            if role == QtCore.Qt.DisplayRole:
+                data = "%s, v%0d" % (self._file_item.name, self._file_item.version)
+
+            elif role == QtCore.Qt.ToolTipRole:
+                data = self._file_item.format_tooltip()
 
             else:
                 data = super(FileModel._FileModelItem, self).data(role)
@@ -337,6 +369,56 @@ class FileModel(QtGui.QStandardItemModel, ViewItemRolesMixin):
                 self._search_msg = msg
                 self.emitDataChanged()
 
+        @staticmethod
+        def get_search_msg(status, has_children, work_area):
+            """
+            Build the message to display for a group with the specified search status.
+
+            :param status:          The search status (see the search status enumeration above)
+            :param has_children:    True if the group contains any files or folders
+            :param work_area:       The WorkArea instance associated with the group, if any
+            :returns:               The search message for the group
+            """
+            if status == FileModel.SEARCHING:
+                return "Searching for files..."
+
+            elif status == FileModel.SEARCH_COMPLETED:
+                if not has_children and work_area:
+                    if not work_area.are_settings_loaded():
+                        return "Shotgun Workfiles hasn't been setup."
+                    templates = work_area.get_missing_templates()
+                    if templates:
+                        return MissingTemplatesError.generate_missing_templates_message(
+                            templates
+                        )
+                    return "No files found."
+
+            elif status == FileModel.SEARCH_FAILED:
+                return "Search Failed"
+
+            return ""
+
+        @staticmethod
+        def get_sandbox_user_name(work_area):
+            """
+            Build the name of the user whose sandbox a group represents.
+
+            :param work_area:   The WorkArea instance associated with the group, if any
+            :returns:           The possessive name of the sandbox user, e.g. "My" or "Jane's", or
+                                an empty string if the work area doesn't use user sandboxes
+            """
+            if not work_area or not work_area.contains_user_sandboxes:
+                return ""
+            context = work_area.context
+            if not context or not context.user:
+                return "Unknown's"
+            if (
+                g_user_cache.current_user
+                and g_user_cache.current_user["id"] == context.user["id"]
+            ):
+                return "My"
+            return "{name}'s".format(name=context.user.get("name", "Unknown"))
+
         def data(self, role):
             """
             Return the data from the item for the specified role.
@@ -382,31 +464,9 @@ class FileModel(QtGui.QStandardItemModel, ViewItemRolesMixin):
 
             if role == FileModel.SEARCH_STATUS_ROLE:
                 self._search_status = value
-
-                msg = ""
-
-                if self._search_status == FileModel.SEARCHING:
-                    msg = "Searching for files..."
-
-                elif self._search_status == FileModel.SEARCH_COMPLETED:
-                    if not self.hasChildren():
-                        work_area = self.data(FileModel.WORK_AREA_ROLE)
-                        if work_area:
-                            if not work_area.are_settings_loaded():
-                                msg = "Shotgun Workfiles hasn't been setup."
-                            else:
-                                templates = work_area.get_missing_templates()
-                                if templates:
-                                    msg = MissingTemplatesError.generate_missing_templates_message(
-                                        templates
-                                    )
-                                else:
-                                    msg = "No files found."
-
-                elif self._search_status == FileModel.SEARCH_FAILED:
-                    msg = "Search Failed"
-
-                self._search_msg = msg
+                self._search_msg = FileModel._GroupModelItem.get_search_msg(
+                    value, self.hasChildren(), self._work_area
+                )
                 self.emitDataChanged()
 
             elif role == FileModel.SEARCH_MSG_ROLE:
@@ -415,26 +475,9 @@ class FileModel(QtGui.QStandardItemModel, ViewItemRolesMixin):
 
             elif role == FileModel.WORK_AREA_ROLE:
                 self._work_area = value
-
-                sandbox_user_name = ""
-                if self._work_area and self._work_area.contains_user_sandboxes:
-                    context = self._work_area.context
-                    if context and context.user:
-                        if (
-                            g_user_cache.current_user
-                            and g_user_cache.current_user["id"] == context.user["id"]
-                        ):
-                            sandbox_user_name = "My"
-                        else:
-                            sandbox_user_name = "{name}'s".format(
-                                name=context.user.get("name", "Unknown")
-                            )
-                    else:
-                        sandbox_user_name = "Unknown's"
-                else:
-                    sandbox_user_name = ""
-
-                self._sandbox_user_name = sandbox_user_name
+                self._sandbox_user_name = (
+                    FileModel._GroupModelItem.get_sandbox_user_name(value)
+                )
                 self.emitDataChanged()
 
             else:
@@ -476,10 +519,41 @@ class FileModel(QtGui.QStandardItemModel, ViewItemRolesMixin):
         self._in_progress_searches = {}
         self._search_cache = FileSearchCache()
 
+        # entity selections made in quick succession are coalesced into a single search once
+        # the selection has settled for the debounce interval:
+        self._pending_searches = None
+        self._search_debounce_timer = QtCore.QTimer(self)
+        self._search_debounce_timer.setSingleShot(True)
+        self._search_debounce_timer.setInterval(
+            self._app.get_setting("entity_search_debounce_interval", 0) or 0
+        )
+        self._search_debounce_timer.timeout.connect(self._apply_pending_searches)
+
         # self._current_item_map[search_id][file.key][file.version] = model._FileModelItem
         self._current_item_map = {}
-        # self._pending_thumbnail_requests[request_id] = (group_key, file_key, file_version)
+        # self._group_index[(entity_key, user_key)] = model._GroupModelItem
+        self._group_index = {}
+        # counters bumped whenever the versions of a file are updated, used with the day the
+        # searches were last started to invalidate the display data cached on the file items:
+        # self._file_key_revisions[file.key] = revision
+        self._file_key_revisions = {}
+        self._display_date = date.today()
+        # self._pending_thumbnail_requests[request_id] = thumbnail key
         self._pending_thumbnail_requests = {}
+        # the files waiting for each thumbnail, whether it's being downloaded by this model or
+        # by another one sharing the thumbnail cache:
+        # self._thumbnail_waiters[thumbnail key] = set of (group_key, file_key, file_version)
+        self._thumbnail_waiters = {}
+        g_thumbnail_cache.thumbnail_loaded.connect(self._on_thumbnail_loaded)
+        g_thumbnail_cache.thumbnail_cancelled.connect(self._on_thumbnail_cancelled)
+
+        # the groups and files visible in the views, used to do the work for them first:
+        # self._visible_items[view_key] = (set of group keys, set of (group key, file key))
+        self._visible_items = {}
+        # thumbnails for files that aren't visible are only requested once they become visible
+        # or once all searches have completed:
+        # self._deferred_thumbnail_requests[(group_key, file_key, file_version)] = FileItem
+        self._deferred_thumbnail_requests = OrderedDict()
 
         # we'll need a file finder to be able to find files:
         self._finder = AsyncFileFinder(bg_task_manager, self)
@@ -489,6 +563,21 @@ class FileModel(QtGui.QStandardItemModel, ViewItemRolesMixin):
         self._finder.search_failed.connect(self._on_finder_search_failed)
         self._finder.work_area_resolved.connect(self._on_finder_work_area_resolved)
         self._finder.work_area_found.connect(self._on_finder_work_area_found)
+        self._finder.directory_work_files_found.connect(
+            self._on_directory_work_files_found
+        )
+        # work files are found in the background for the directories that changed on disk:
+        # self._directory_requests[request_id] = (group_key, WorkArea, directory)
+        self._directory_requests = {}
+        # self._latest_directory_requests[(group_key, directory)] = request_id
+        self._latest_directory_requests = {}
+
+        # optionally watch the directories containing work files so that changes made
+        # on disk are reflected without having to search again:
+        self._watcher = None
+        if self._app.get_setting("watch_work_areas", False):
+            self._watcher = WorkAreaWatcher(self)
+            self._watcher.work_area_changed.connect(self._on_work_area_changed)
 
         # Add additional roles defined by the ViewItemRolesMixin class.
         self.NEXT_AVAILABLE_ROLE = self.initialize_roles(self.NEXT_AVAILABLE_ROLE)
@@ -535,6 +624,32 @@ class FileModel(QtGui.QStandardItemModel, ViewItemRolesMixin):
 
         return None
 
+    @staticmethod
+    def is_display_role(model, role):
+        """
+        Check if the data for a role is only used to display files.  The data for these roles is
+        cached on the file items rather than being built every time a file is drawn.  Thumbnails
+        are not cached on the file items so that the thumbnail cache is free to evict them.
+
+        :param model:   The model the data is requested from
+        :param role:    The role to check
+        :returns:       True if the role is a display role, False otherwise
+        """
+        if role in (QtCore.Qt.DisplayRole, QtCore.Qt.ToolTipRole):
+            return True
+        if not model or role == model.VIEW_ITEM_THUMBNAIL_ROLE:
+            return False
+        return bool(model.get_method_for_role(role))
+
+    def get_display_stamp(self, file_item):
+        """
+        :param file_item:   The FileItem to get the display stamp for
+        :returns:           A value that changes whenever the display data cached on the file item
+                            needs to be rebuilt because one of the other versions of the file
+                            changed or because the day changed, for relative dates like "Today"
+        """
+        return (self._file_key_revisions.get(file_item.key, 0), self._display_date)
+
     @staticmethod
     def sanitize_data(data, role):
         """
@@ -561,6 +676,10 @@ class FileModel(QtGui.QStandardItemModel, ViewItemRolesMixin):
         """
         # clear the model:
         self.clear()
+        self._search_debounce_timer.timeout.disconnect(self._apply_pending_searches)
+        g_thumbnail_cache.thumbnail_loaded.disconnect(self._on_thumbnail_loaded)
+        g_thumbnail_cache.thumbnail_cancelled.disconnect(self._on_thumbnail_cancelled)
+        self._app.log_debug(g_thumbnail_cache.report())
 
         # stop the data retriever:
         if self._sg_data_retriever:
@@ -568,6 +687,12 @@ class FileModel(QtGui.QStandardItemModel, ViewItemRolesMixin):
             self._sg_data_retriever.deleteLater()
             self._sg_data_retriever = None
 
+        # stop watching work areas:
+        if self._watcher:
+            self._watcher.work_area_changed.disconnect(self._on_work_area_changed)
+            self._watcher.shut_down()
+            self._watcher = None
+
         # clean up the cache:
         if self._search_cache:
             self._search_cache.clear()
@@ -582,6 +707,9 @@ class FileModel(QtGui.QStandardItemModel, ViewItemRolesMixin):
             self._finder.work_area_resolved.disconnect(
                 self._on_finder_work_area_resolved
             )
+            self._finder.directory_work_files_found.disconnect(
+                self._on_directory_work_files_found
+            )
             self._finder.shut_down()
             self._finder = None
 
@@ -615,6 +743,33 @@ class FileModel(QtGui.QStandardItemModel, ViewItemRolesMixin):
             None, file_item.key, file_item.version if not ignore_version else None
         )
 
+    def set_visible_items(self, view_key, group_keys, file_keys):
+        """
+        Set the groups and files that are currently visible in a view.  The searches for visible
+        groups and the thumbnails of visible files are processed before any off-screen work.
+
+        :param view_key:    A unique key identifying the view reporting the visible items
+        :param group_keys:  A list of the keys of the groups visible in the view
+        :param file_keys:   A list of (group key, file key) tuples for the files visible in the view
+        """
+        if group_keys or file_keys:
+            self._visible_items[view_key] = (set(group_keys), set(file_keys))
+        elif view_key in self._visible_items:
+            del self._visible_items[view_key]
+        else:
+            # nothing has changed:
+            return
+
+        # update the priority of the current searches:
+        visible_entity_keys = self._get_visible_entity_keys()
+        for search_id, search in self._in_progress_searches.items():
+            self._finder.set_search_visible(
+                search_id, self._gen_entity_key(search.entity) in visible_entity_keys
+            )
+
+        # and request the thumbnails of files that have become visible:
+        self._request_deferred_thumbnails(visible_only=True)
+
     # Interface for modifying the entities in the model:
     def set_entity_searches(self, searches):
         """
@@ -622,22 +777,18 @@ class FileModel(QtGui.QStandardItemModel, ViewItemRolesMixin):
         be updated to contain a group item for each search+user combination and will initiate a
         search for all files (work files and publishes) in this group.
 
+        Searches set in quick succession are coalesced so that only the last ones are started
+        once the selection has settled for the entity_search_debounce_interval.
+
         :param searches:    A list of SearchDetails instances containing information about the entities
                             to search for
         """
-        self._app.log_debug(
-            "File Model: Setting entity searches on model to: %s"
-            % [s.name for s in searches if s]
-        )
-        # stop any in-progress searches:
-        self._stop_in_progress_searches()
-        self._current_searches = searches or []
-
-        # update groups:
-        self._update_groups()
-
-        # start searches for all items/users in the model:
-        self._start_searches()
+        self._pending_searches = list(searches or [])
+        if self._search_debounce_timer.interval() <= 0:
+            self._apply_pending_searches()
+        else:
+            # (re)start the timer so the searches are applied once the selection has settled:
+            self._search_debounce_timer.start()
 
     # Interface for modifying the users in the model:
     def set_users(self, users):
@@ -648,6 +799,9 @@ class FileModel(QtGui.QStandardItemModel, ViewItemRolesMixin):
 
         :param users:    A list of Shotgun user dictionaries that should be represented in the model
         """
+        # searches waiting for the selection to settle are started with the new users:
+        self._flush_pending_searches()
+
         # stop any in-progress searches:
         self._stop_in_progress_searches()
 
@@ -674,15 +828,23 @@ class FileModel(QtGui.QStandardItemModel, ViewItemRolesMixin):
         Asynchronously refresh the model by stopping all in-progress searches and starting
         all searches from scratch
         """
+        self._flush_pending_searches()
+
         # stop any current searches:
         self._stop_in_progress_searches()
-        # and restart all searches:
-        self._start_searches()
+        # and restart all searches, re-building the work areas in case the configuration
+        # or the user sandboxes have changed:
+        self._start_searches(reuse_work_areas=False)
 
     def clear(self):
         """
         Overriden from base class.  Clear the model in a safe way.
         """
+        # forget any searches waiting for the selection to settle:
+        self._search_debounce_timer.stop()
+        self._pending_searches = None
+        self._deferred_thumbnail_requests = OrderedDict()
+
         # stop all current searches:
         self._stop_in_progress_searches()
 
@@ -690,13 +852,55 @@ class FileModel(QtGui.QStandardItemModel, ViewItemRolesMixin):
         # note that we don't call QStandardItemModel.clear due to a bug
         # in pre-1.1.2 PySide that can result in crashes!
         self._clear_children_r(self.invisibleRootItem())
+        self._group_index = {}
 
         # clean up the current-item map
         self._current_item_map = {}
 
+        # and forget about the directories being searched:
+        self._directory_requests = {}
+        self._latest_directory_requests = {}
+
+        # nothing left to watch:
+        if self._watcher:
+            self._watcher.clear()
+
     # ------------------------------------------------------------------------------------------
     # protected methods
 
+    def _flush_pending_searches(self):
+        """
+        Immediately apply any entity searches that are waiting for the selection to settle.
+        """
+        if self._search_debounce_timer.isActive():
+            self._search_debounce_timer.stop()
+            self._apply_pending_searches()
+
+    def _apply_pending_searches(self):
+        """
+        Update the model for the last entity searches that were set.  Searches already in progress
+        for entities that are still being searched for are left running rather than being restarted.
+        """
+        if self._pending_searches is None:
+            return
+        searches = self._pending_searches
+        self._pending_searches = None
+
+        self._app.log_debug(
+            "File Model: Setting entity searches on model to: %s"
+            % [s.name for s in searches if s]
+        )
+        # stop any in-progress searches for entities that are no longer needed:
+        entity_keys = set(self._gen_entity_key(s.entity) for s in searches if s)
+        self._stop_in_progress_searches(keep_entity_keys=entity_keys)
+        self._current_searches = searches
+
+        # update groups:
+        self._update_groups()
+
+        # start searches for all items/users in the model:
+        self._start_searches()
+
     def _safe_remove_row(self, row, parent_item=None):
         """
         Remove the specified row from the parent item in a PySide/Shoboken friendly way by removing
@@ -707,6 +911,13 @@ class FileModel(QtGui.QStandardItemModel, ViewItemRolesMixin):
                             is removed from the root item.
         """
         parent_item = parent_item or self.invisibleRootItem()
+        # keep the group index up-to-date:
+        child_item = parent_item.child(row)
+        if (
+            isinstance(child_item, self._GroupModelItem)
+            and self._group_index.get(child_item.key) == child_item
+        ):
+            del self._group_index[child_item.key]
 
         # Remove entire row from the parent item, this will remove all of its children.
         # Use `takeRow` instead of `removeRow` to prevent model from deleting the data
@@ -755,7 +966,36 @@ class FileModel(QtGui.QStandardItemModel, ViewItemRolesMixin):
 
         :returns:   A generator that yields all _GroupModelItems in the model
         """
-        return self._item_generator(self.invisibleRootItem(), FileModel._GroupModelItem)
+        return self._item_generator(self.invisibleRootItem(), self._GroupModelItem)
+
+    def _get_group_item(self, group_key):
+        """
+        Find the group item for the specified group key using the group index rather than iterating
+        over all groups in the model.
+
+        :param group_key:   The (entity_key, user_key) key of the group to find
+        :returns:           The _GroupModelItem for the group or None if the group isn't in the model
+        """
+        group_item = self._group_index.get(group_key)
+        if group_item and group_item.model() != self:
+            # the item was removed from the model without going through _safe_remove_row:
+            del self._group_index[group_key]
+            return None
+        return group_item
+
+    def _insert_group_item(self, group_item, row=None):
+        """
+        Add a group item to the model and to the group index.
+
+        :param group_item:  The _GroupModelItem to add
+        :param row:         The row to insert the group at or None to append it after all other
+                            groups
+        """
+        if row is None:
+            self.appendRow(group_item)
+        else:
+            self.insertRow(row, group_item)
+        self._group_index[group_item.key] = group_item
 
     def _file_items(self, parent_item):
         """
@@ -765,7 +1005,7 @@ class FileModel(QtGui.QStandardItemModel, ViewItemRolesMixin):
         :param parent_item: The parent item to yield _FileModelItems for
         :returns:           A generator that yields all _FileModelItems under the specified parent
         """
-        return self._item_generator(parent_item, FileModel._FileModelItem)
+        return self._item_generator(parent_item, self._FileModelItem)
 
     def _gen_entity_key(self, entity_dict):
         """
@@ -780,30 +1020,45 @@ class FileModel(QtGui.QStandardItemModel, ViewItemRolesMixin):
         else:
             return (entity_dict.get("type"), entity_dict.get("id"))
 
-    def _start_searches(self):
+    def _start_searches(self, reuse_work_areas=True):
         """
-        Start all searches for all users that should be presented in the model.
+        Start all searches for all users that should be presented in the model.  At most one search
+        is kept in progress for each entity so entities that are already being searched for are
+        skipped.
+
+        :param reuse_work_areas:    If True then work areas already resolved for an entity by a
+                                    previous search are re-used rather than being re-built.
         """
+        # relative dates shown for the files are refreshed with the files:
+        self._display_date = date.today()
+
         if not self._current_searches:
             # nothing to do!
             return
 
-        # get existing groups:
-        group_map = {}
-        for group_item in self._group_items():
-            group_map[group_item.key] = group_item
+        visible_entity_keys = self._get_visible_entity_keys()
+
+        # searches still in progress for an entity:
+        in_progress_map = {}
+        for search_id, search in self._in_progress_searches.items():
+            in_progress_map[self._gen_entity_key(search.entity)] = search_id
 
         for search in self._current_searches:
             if not search.entity:
                 continue
 
+            entity_key = self._gen_entity_key(search.entity)
+            search_id = in_progress_map.get(entity_key)
+            if search_id is not None:
+                # the entity is already being searched for so just keep the latest details:
+                self._in_progress_searches[search_id] = search
+                continue
+
             # update all existing group items for this entity and all users to indicate
             # that we are searching for files
-            entity_key = self._gen_entity_key(search.entity)
             for user in self._current_users:
                 user_key = self._gen_entity_key(user)
-                group_key = (entity_key, user_key)
-                group_item = group_map.get(group_key)
+                group_item = self._get_group_item((entity_key, user_key))
                 if group_item:
                     group_item.set_search_status(FileModel.SEARCHING)
 
@@ -811,26 +1066,57 @@ class FileModel(QtGui.QStandardItemModel, ViewItemRolesMixin):
                 self._search_cache.set_dirty(search.entity, user)
 
             # actually start the search:
-            search_id = self._finder.begin_search(search.entity, self._current_users)
+            search_id = self._finder.begin_search(
+                search.entity,
+                self._current_users,
+                reuse_work_area=reuse_work_areas,
+                is_visible=entity_key in visible_entity_keys,
+            )
             self._in_progress_searches[search_id] = search
             self._app.log_debug("File Model: Started search %d..." % search_id)
 
             # Emit signal to indicate the model is performing a search
             self.searching.emit()
 
-    def _stop_in_progress_searches(self):
+    def _stop_in_progress_searches(self, keep_entity_keys=None):
         """
         Stop all in-progress searches
+
+        :param keep_entity_keys:    An optional set of (type, id) entity keys.  In-progress searches
+                                    for these entities are left running.
         """
-        search_ids = list(self._in_progress_searches)
-        self._in_progress_searches = {}
+        keep_entity_keys = keep_entity_keys or set()
+        search_ids = [
+            search_id
+            for search_id, search in self._in_progress_searches.items()
+            if self._gen_entity_key(search.entity) not in keep_entity_keys
+        ]
         for search_id in search_ids:
+            del self._in_progress_searches[search_id]
             self._finder.stop_search(search_id)
 
-        # any pending thumbnail requests can also be stopped:
-        for request_id in self._pending_thumbnail_requests:
+        # any pending thumbnail requests for these searches can also be stopped:
+        for thumb_key, request_keys in list(self._thumbnail_waiters.items()):
+            request_keys = set(
+                request_key
+                for request_key in request_keys
+                if request_key[0][0] in keep_entity_keys
+            )
+            if request_keys:
+                self._thumbnail_waiters[thumb_key] = request_keys
+            else:
+                del self._thumbnail_waiters[thumb_key]
+        for request_id, thumb_key in list(self._pending_thumbnail_requests.items()):
+            if thumb_key in self._thumbnail_waiters:
+                # the thumbnail is still needed by other files:
+                continue
             self._sg_data_retriever.stop_work(request_id)
-        self._pending_thumbnail_requests = {}
+            del self._pending_thumbnail_requests[request_id]
+            # other models may be waiting for this thumbnail, they'll download it themselves:
+            g_thumbnail_cache.cancel_loading(thumb_key)
+        for request_key in list(self._deferred_thumbnail_requests):
+            if request_key[0][0] not in keep_entity_keys:
+                del self._deferred_thumbnail_requests[request_key]
 
     def _update_groups(self):
         """
@@ -844,8 +1130,10 @@ class FileModel(QtGui.QStandardItemModel, ViewItemRolesMixin):
         """
         # get existing groups:
         group_map = {}
-        for group_item in self._group_items():
-            group_map[group_item.key] = group_item
+        for group_key in list(self._group_index):
+            group_item = self._get_group_item(group_key)
+            if group_item:
+                group_map[group_key] = group_item
 
         valid_group_keys = set()
         if self._current_searches and self._current_users:
@@ -887,10 +1175,8 @@ class FileModel(QtGui.QStandardItemModel, ViewItemRolesMixin):
                         cached_result = self._search_cache.find(search.entity, user)
                         if user_key == primary_user_key or cached_result:
                             # always add a group for the primary user or if we already have a cached result:
-                            group_item = FileModel._GroupModelItem(
-                                search.name, group_key
-                            )
-                            self.insertRow(previous_valid_row + 1, group_item)
+                            group_item = self._GroupModelItem(search.name, group_key)
+                            self._insert_group_item(group_item, previous_valid_row + 1)
 
                             if cached_result:
                                 # we have a cached result so populate the group:
@@ -914,6 +1200,8 @@ class FileModel(QtGui.QStandardItemModel, ViewItemRolesMixin):
         for group_key, group_item in group_map.items():
             if group_key not in valid_group_keys:
                 self._safe_remove_row(group_item.row())
+                if self._watcher:
+                    self._watcher.unwatch(group_key)
 
         # and clean up the file-to-item map:
         self._cleanup_current_item_map()
@@ -933,7 +1221,7 @@ class FileModel(QtGui.QStandardItemModel, ViewItemRolesMixin):
         current_entity_row_map = {}
         for ri in range(parent_item.rowCount()):
             child_item = parent_item.child(ri)
-            if isinstance(child_item, FileModel._FolderModelItem):
+            if isinstance(child_item, self._FolderModelItem):
                 child_name = child_item.text()
                 child_entity = child_item.entity
                 child_key = (child_name, self._gen_entity_key(child_entity))
@@ -969,12 +1257,19 @@ class FileModel(QtGui.QStandardItemModel, ViewItemRolesMixin):
         if entities_to_add:
             new_rows = []
             for name, entity in entities_to_add:
-                folder_item = FileModel._FolderModelItem(name, entity)
+                folder_item = self._FolderModelItem(name, entity)
                 new_rows.append(folder_item)
             parent_item.appendRows(new_rows)
 
     def _process_files(
-        self, files, work_area, group_item, have_local=True, have_publishes=True
+        self,
+        files,
+        work_area,
+        group_item,
+        have_local=True,
+        have_publishes=True,
+        is_partial=False,
+        found_file_versions=None,
     ):
         """
         Update the file items under the specified parent.  This adds/removes/updates file model items
@@ -993,17 +1288,27 @@ class FileModel(QtGui.QStandardItemModel, ViewItemRolesMixin):
         :param group_item:      The _GroupModelItem the files should be updated for
         :param have_local:      True if the files list contains details about work files, false otherwise
         :param have_publishes:  True if the files list contains details about publishes, false otherwise
+        :param is_partial:      True if the files list is a chunk of the files found and more will follow.
+                                Existing items are then only added to or updated, never removed.
+        :param found_file_versions: Optional set of (key, version) tuples for files found in previous
+                                chunks that are represented in the model and should be kept.
         """
         if not have_local and not have_publishes:
             # nothing to do then!
             return
 
-        # get details about existing items:
+        # if the group doesn't have any files yet then the cache and watcher are reset with the
+        # files, otherwise only the files that changed are patched into them:
+        is_new_group = not self._current_item_map.get(group_item.key)
+
+        # get details about existing items from the item map rather than walking the whole group.
+        # Chunks of files never remove anything so only the items for their keys are needed:
         existing_file_item_map = {}
         prev_local_file_versions = set()
         prev_publish_file_versions = set()
 
-        for model_item in self._file_items(group_item):
+        file_keys = set(f.key for f in files) if is_partial else None
+        for model_item in self._find_group_file_items(group_item, file_keys):
             file_item = model_item.file_item
             file_version_key = (file_item.key, file_item.version)
             existing_file_item_map[file_version_key] = (file_item, model_item)
@@ -1014,12 +1319,17 @@ class FileModel(QtGui.QStandardItemModel, ViewItemRolesMixin):
 
         # build a list of existing files that we should keep in the model:
         file_versions_to_keep = set()
-        if have_local and not have_publishes:
+        if is_partial:
+            # more files will follow so keep everything for now:
+            file_versions_to_keep = set(existing_file_item_map)
+        elif have_local and not have_publishes:
             # keep all publishes that aren't local
             file_versions_to_keep = prev_publish_file_versions
         elif not have_local and have_publishes:
             # keep all local that aren't publishes
             file_versions_to_keep = prev_local_file_versions
+        if found_file_versions:
+            file_versions_to_keep = file_versions_to_keep | set(found_file_versions)
         valid_files = dict(
             [
                 (k, v[0])
@@ -1028,10 +1338,15 @@ class FileModel(QtGui.QStandardItemModel, ViewItemRolesMixin):
             ]
         )
 
+        # keep track of the keys of all files that are added, changed or removed so that only
+        # the items for these keys need updating:
+        changed_file_keys = set()
+
         # match files against existing items:
         files_to_add = []
         for file_item in files:
             file_version_key = (file_item.key, file_item.version)
+            changed_file_keys.add(file_item.key)
             current_file, model_item = existing_file_item_map.get(
                 file_version_key, (None, None)
             )
@@ -1050,24 +1365,13 @@ class FileModel(QtGui.QStandardItemModel, ViewItemRolesMixin):
             valid_files[file_version_key] = file_item
 
             # we want to retrieve the thumbnail if one is available:
-            if file_item.thumbnail_path and not file_item.thumbnail:
-                # request the thumbnail using the data retriever:
-                request_id = self._sg_data_retriever.request_thumbnail(
-                    file_item.thumbnail_path,
-                    self._published_file_type,
-                    file_item.published_file_id,
-                    "image",
-                    load_image=False,  # Avoid loading to QImage then convert to QPixmap
-                )
-                self._pending_thumbnail_requests[request_id] = (
-                    group_item.key,
-                    file_item.key,
-                    file_item.version,
-                )
+            if file_item.thumbnail_path and not file_item.thumbnail_key:
+                self._request_thumbnail(group_item.key, file_item)
 
         # figure out if any existing items are no longer needed:
         valid_file_versions = set(valid_files)
         file_versions_to_remove = set(existing_file_item_map) - valid_file_versions
+        changed_file_keys.update(key for key, _ in file_versions_to_remove)
         rows_to_remove = set(
             [
                 v[1].row()
@@ -1083,15 +1387,32 @@ class FileModel(QtGui.QStandardItemModel, ViewItemRolesMixin):
             ) - file_versions_to_remove:
                 file_item, model_item = existing_file_item_map[file_version_key]
                 file_item.set_not_work_file()
+                changed_file_keys.add(file_item.key)
         if have_publishes:
             for file_version_key in (
                 prev_publish_file_versions - valid_file_versions
             ) - file_versions_to_remove:
                 file_item, model_item = existing_file_item_map[file_version_key]
                 file_item.set_not_published()
+                changed_file_keys.add(file_item.key)
 
         # update the cache - it's important this is done _before_ adding/updating the model items:
-        self._search_cache.add(work_area, list(valid_files.values()))
+        found_files = [valid_files[(f.key, f.version)] for f in files]
+        if is_new_group:
+            self._search_cache.add(work_area, list(valid_files.values()))
+        else:
+            self._search_cache.update_files(
+                work_area, found_files, file_versions_to_remove
+            )
+
+        # and make sure the directories containing the work files are being watched:
+        if have_local and self._watcher:
+            if is_new_group:
+                self._watcher.watch(
+                    group_item.key, work_area, list(valid_files.values())
+                )
+            else:
+                self._watcher.watch_files(group_item.key, work_area, found_files)
 
         # now lets remove, add and update items as needed:
         # 1. Remove items that are no longer needed:
@@ -1103,18 +1424,38 @@ class FileModel(QtGui.QStandardItemModel, ViewItemRolesMixin):
         if files_to_add:
             new_items = []
             for file_item in files_to_add:
-                model_item = FileModel._FileModelItem(file_item, work_area)
+                model_item = self._FileModelItem(file_item, work_area)
                 new_items.append(model_item)
                 # and track this item:
                 self._track_current_file_item(model_item, group_item)
             if new_items:
                 group_item.appendRows(new_items)
 
-        # 3. Update all items in this group:
-        self._update_group_file_items(group_item)
+        # 3. Update the items for the files that changed in this group:
+        self._update_group_file_items(group_item, changed_file_keys)
 
         # and clean up the file-to-item map:
-        self._cleanup_current_item_map()
+        if rows_to_remove:
+            self._cleanup_current_item_map(group_item.key)
+
+    def _find_group_file_items(self, group_item, file_keys=None):
+        """
+        Find the file model items under a group using the current item map.
+
+        :param group_item:  The _GroupModelItem to find the file items for
+        :param file_keys:   Optional set of the keys of the files to find the items for.  If None
+                            then the items for all files in the group are returned.
+        :returns:           A list of _FileModelItems
+        """
+        file_map = self._current_item_map.get(group_item.key) or {}
+        if file_keys is None:
+            file_keys = list(file_map)
+        return [
+            item
+            for file_key in file_keys
+            for item in self._find_file_items(file_map, file_key, None)
+            if item.parent() == group_item
+        ]
 
     def _track_current_file_item(self, file_model_item, group_model_item):
         """
@@ -1200,13 +1541,21 @@ class FileModel(QtGui.QStandardItemModel, ViewItemRolesMixin):
                 )
         return found_items
 
-    def _cleanup_current_item_map(self):
+    def _cleanup_current_item_map(self, group_key=None):
         """
         Cleanup the current item map by removing any entries that are no longer valid, e.g. the weakref
         to the _FileModelItem is None.
+
+        :param group_key:   Optional key of the only group to clean up the entries for
         """
-        new_item_map = {}
-        for group_key, file_map in self._current_item_map.items():
+        if group_key is not None:
+            file_maps = {group_key: self._current_item_map.get(group_key) or {}}
+            new_item_map = dict(self._current_item_map)
+            new_item_map.pop(group_key, None)
+        else:
+            file_maps = self._current_item_map
+            new_item_map = {}
+        for group_key, file_map in file_maps.items():
             new_file_map = {}
             for file_key, version_map in file_map.items():
                 new_version_map = {}
@@ -1254,13 +1603,17 @@ class FileModel(QtGui.QStandardItemModel, ViewItemRolesMixin):
         if users:
             self.sandbox_users_found.emit(users)
 
-    def _on_finder_files_found(self, search_id, file_list, work_area):
+    def _on_finder_files_found(
+        self, search_id, file_list, work_area, found_file_versions
+    ):
         """
         Slot triggered when the finder has found some work files for a search.
 
-        :param search_id:    The id of the search that the work files were found for
-        :param file_list:    The list of FileItems that were found
-        :param work_area:    The work area that the files were found in
+        :param search_id:           The id of the search that the work files were found for
+        :param file_list:           The list of FileItems that were found
+        :param work_area:           The work area that the files were found in
+        :param found_file_versions: None if more work files will follow, otherwise the set of
+                                    (key, version) tuples for all work files found
         """
         self._app.log_debug(
             "File Model: Found %d files for search %s, user '%s'"
@@ -1271,16 +1624,25 @@ class FileModel(QtGui.QStandardItemModel, ViewItemRolesMixin):
             )
         )
         self._process_found_files(
-            search_id, file_list, work_area, have_local=True, have_publishes=False
+            search_id,
+            file_list,
+            work_area,
+            have_local=True,
+            have_publishes=False,
+            found_file_versions=found_file_versions,
         )
 
-    def _on_finder_publishes_found(self, search_id, file_list, work_area):
+    def _on_finder_publishes_found(
+        self, search_id, file_list, work_area, found_file_versions
+    ):
         """
         Slot triggered when the finder has found some publishes for a search
 
-        :param search_id:    The id of the search that the publishes were found for
-        :param file_list:    The list of FileItems that were found
-        :param work_area:    The work area that the publishes were found in
+        :param search_id:           The id of the search that the publishes were found for
+        :param file_list:           The list of FileItems that were found
+        :param work_area:           The work area that the publishes were found in
+        :param found_file_versions: None if more publishes will follow, otherwise the set of
+                                    (key, version) tuples for all publishes found
         """
         self._app.log_debug(
             "File Model: Found %d publishes for search %s, user '%s'"
@@ -1291,11 +1653,22 @@ class FileModel(QtGui.QStandardItemModel, ViewItemRolesMixin):
             )
         )
         self._process_found_files(
-            search_id, file_list, work_area, have_local=False, have_publishes=True
+            search_id,
+            file_list,
+            work_area,
+            have_local=False,
+            have_publishes=True,
+            found_file_versions=found_file_versions,
         )
 
     def _process_found_files(
-        self, search_id, file_list, work_area, have_local, have_publishes
+        self,
+        search_id,
+        file_list,
+        work_area,
+        have_local,
+        have_publishes,
+        found_file_versions,
     ):
         """
         Process files/publishes found by the finder.  This ensures that the parent _GroupModelItem for the
@@ -1306,6 +1679,9 @@ class FileModel(QtGui.QStandardItemModel, ViewItemRolesMixin):
         :param work_area:       The work area that the files were found in
         :param have_local:      True if work files were found, otherwise false
         :param have_publishes:  True if publishes were found, otherwise false
+        :param found_file_versions: None if the files are a chunk and more will follow, otherwise
+                                    the set of (key, version) tuples for all files found.  The
+                                    files are then merged and any that weren't found are removed.
         """
         if search_id not in self._in_progress_searches:
             # ignore result
@@ -1318,13 +1694,8 @@ class FileModel(QtGui.QStandardItemModel, ViewItemRolesMixin):
             self._gen_entity_key(search.entity),
             self._gen_entity_key(search_user),
         )
-        found_group = False
-        for group_item in self._group_items():
-            if group_item.key == group_key:
-                found_group = True
-                break
-
-        if found_group:
+        group_item = self._get_group_item(group_key)
+        if group_item:
             # and make sure the work area is up-to-date:
             group_item.work_area = work_area
         else:
@@ -1333,9 +1704,9 @@ class FileModel(QtGui.QStandardItemModel, ViewItemRolesMixin):
                 return
 
             # we don't have a group item for this search so lets add one now:
-            group_item = FileModel._GroupModelItem(search.name, group_key, work_area)
+            group_item = self._GroupModelItem(search.name, group_key, work_area)
             # (TODO) need to insert it into the right place in the list!
-            self.appendRow(group_item)
+            self._insert_group_item(group_item)
 
             # add children
             self._update_group_child_entity_items(
@@ -1344,7 +1715,13 @@ class FileModel(QtGui.QStandardItemModel, ViewItemRolesMixin):
 
         # process files:
         self._process_files(
-            file_list, work_area, group_item, have_local, have_publishes
+            file_list,
+            work_area,
+            group_item,
+            have_local,
+            have_publishes,
+            is_partial=found_file_versions is None,
+            found_file_versions=found_file_versions,
         )
 
     def _on_finder_search_completed(self, search_id):
@@ -1386,14 +1763,9 @@ class FileModel(QtGui.QStandardItemModel, ViewItemRolesMixin):
         search = self._in_progress_searches[search_id]
         del self._in_progress_searches[search_id]
 
-        group_map = {}
-        for group_item in self._group_items():
-            group_map[group_item.key] = group_item
-
         entity_key = self._gen_entity_key(search.entity)
         for user in self._current_users:
-            group_key = (entity_key, self._gen_entity_key(user))
-            group_item = group_map.get(group_key)
+            group_item = self._get_group_item((entity_key, self._gen_entity_key(user)))
             if not group_item:
                 continue
             group_item.set_search_status(status, error_msg)
@@ -1403,8 +1775,192 @@ class FileModel(QtGui.QStandardItemModel, ViewItemRolesMixin):
                 self._search_cache.set_dirty(search.entity, user, is_dirty=False)
 
         if not self._in_progress_searches:
+            # now all files have been found, request the thumbnails of the off-screen files:
+            self._request_deferred_thumbnails()
             self.search_complete.emit()
 
+    def _on_work_area_changed(self, group_key, work_area, dir_path):
+        """
+        Slot triggered when the contents of a directory containing work files for a group have
+        changed on disk.  This finds the work files in just that directory, in a background task,
+        so that the cached files and model items for the group can be patched rather than
+        searching the whole work area again.
+
+        :param group_key:   The key of the group the directory belongs to
+        :param work_area:   The WorkArea the directory belongs to
+        :param dir_path:    The directory that changed
+        """
+        group_item = self._get_group_item(group_key)
+        if not group_item or self._is_group_being_searched(group_key):
+            return
+
+        work_area = group_item.work_area or work_area
+        request_id = self._finder.begin_find_work_files_in_directory(
+            work_area, dir_path
+        )
+        self._directory_requests[request_id] = (group_key, work_area, dir_path)
+        # only the latest request for a directory is used, earlier ones may have listed the
+        # directory before the last change:
+        self._latest_directory_requests[(group_key, dir_path)] = request_id
+
+    def _is_group_being_searched(self, group_key):
+        """
+        :param group_key:   The key of the group to check
+        :returns:           True if a search is in progress for the group's entity, in which case
+                            the search will pick up any changes made to its work area
+        """
+        for search in self._in_progress_searches.values():
+            if self._gen_entity_key(search.entity) == group_key[0]:
+                return True
+        return False
+
+    def _on_directory_work_files_found(self, request_id, file_items):
+        """
+        Slot triggered when the work files in a directory that changed on disk have been found.
+        This patches the cached files and model items for the group the directory belongs to.
+
+        :param request_id:  The id of the request to find the work files
+        :param file_items:  The list of FileItems found in the directory or None if the directory
+                            couldn't be searched
+        """
+        if request_id not in self._directory_requests:
+            return
+        group_key, work_area, dir_path = self._directory_requests.pop(request_id)
+        if self._latest_directory_requests.get((group_key, dir_path)) != request_id:
+            # a more recent request will update the directory:
+            return
+        del self._latest_directory_requests[(group_key, dir_path)]
+        if file_items is None:
+            return
+
+        group_item = self._get_group_item(group_key)
+        if not group_item or self._is_group_being_searched(group_key):
+            return
+
+        changes = self._search_cache.update_work_files(work_area, dir_path, file_items)
+        if not changes:
+            return
+        added, updated, removed = changes
+        if not added and not updated and not removed:
+            return
+        self._app.log_debug(
+            "File Model: Work area directory '%s' changed - %d files added, "
+            "%d updated, %d removed"
+            % (dir_path, len(added), len(updated), len(removed))
+        )
+
+        # 1. Remove items that no longer exist:
+        rows_to_remove = set()
+        for file_item in removed:
+            for model_item in self._find_current_items(
+                group_key, file_item.key, file_item.version
+            ):
+                rows_to_remove.add(model_item.row())
+        for row in sorted(rows_to_remove, reverse=True):
+            self._safe_remove_row(row, group_item)
+
+        # 2. Add new items:
+        new_items = []
+        for file_item in added:
+            model_item = self._FileModelItem(file_item, work_area)
+            new_items.append(model_item)
+            self._track_current_file_item(model_item, group_item)
+        if new_items:
+            group_item.appendRows(new_items)
+
+        # 3. Update the items for the files that changed in this group, updated file items are
+        # already referenced by the existing model items:
+        self._update_group_file_items(
+            group_item,
+            set(file_item.key for file_item in added + updated + removed),
+        )
+
+        # and clean up the file-to-item map:
+        self._cleanup_current_item_map(group_key)
+
+    def _get_visible_entity_keys(self):
+        """
+        :returns:   The set of entity keys of all groups visible in the views
+        """
+        entity_keys = set()
+        for group_keys, _ in self._visible_items.values():
+            entity_keys.update(group_key[0] for group_key in group_keys)
+        return entity_keys
+
+    def _is_file_visible(self, group_key, file_key):
+        """
+        :param group_key:   The key of the group the file is in
+        :param file_key:    The key of the file
+        :returns:           True if the file is visible in a view or if no view has reported
+                            what is visible, False otherwise
+        """
+        if not self._visible_items:
+            return True
+        return any(
+            (group_key, file_key) in file_keys
+            for _, file_keys in self._visible_items.values()
+        )
+
+    def _request_thumbnail(self, group_key, file_item, defer_if_hidden=True):
+        """
+        Request the thumbnail for a file.  Thumbnails are shared through the thumbnail cache so the
+        data retriever is only used if the thumbnail hasn't already been loaded and isn't already
+        being downloaded.
+
+        :param group_key:       The key of the group the file is in
+        :param file_item:       The FileItem to request the thumbnail for
+        :param defer_if_hidden: If True then the request is deferred until the searches have
+                                completed if the file isn't visible
+        """
+        request_key = (group_key, file_item.key, file_item.version)
+        thumb_key = file_item.thumbnail_path
+        if g_thumbnail_cache.contains(thumb_key):
+            # the thumbnail was already loaded, possibly for another file:
+            self._deferred_thumbnail_requests.pop(request_key, None)
+            file_item.thumbnail_key = thumb_key
+            self._update_file_thumbnail(request_key, thumb_key)
+            return
+
+        if (
+            defer_if_hidden
+            and self._in_progress_searches
+            and not self._is_file_visible(group_key, file_item.key)
+        ):
+            self._deferred_thumbnail_requests[request_key] = file_item
+            return
+        self._deferred_thumbnail_requests.pop(request_key, None)
+
+        self._thumbnail_waiters.setdefault(thumb_key, set()).add(request_key)
+        if not g_thumbnail_cache.begin_loading(thumb_key):
+            # the thumbnail is already being downloaded, we'll be notified once it's loaded:
+            return
+
+        request_id = self._sg_data_retriever.request_thumbnail(
+            thumb_key,
+            self._published_file_type,
+            file_item.published_file_id,
+            "image",
+            load_image=False,  # Avoid loading to QImage then convert to QPixmap
+        )
+        self._pending_thumbnail_requests[request_id] = thumb_key
+
+    def _request_deferred_thumbnails(self, visible_only=False):
+        """
+        Request the thumbnails that were deferred because their files weren't visible.
+
+        :param visible_only:    If True then only the thumbnails for files that are now visible
+                                are requested, otherwise all deferred thumbnails are requested.
+        """
+        for request_key, file_item in list(self._deferred_thumbnail_requests.items()):
+            group_key, file_key, _ = request_key
+            if visible_only and not self._is_file_visible(group_key, file_key):
+                continue
+            del self._deferred_thumbnail_requests[request_key]
+            if file_item.thumbnail_key:
+                # the thumbnail was found in the meantime:
+                continue
+            self._request_thumbnail(group_key, file_item, defer_if_hidden=False)
+
     def _on_data_retriever_work_completed(self, uid, request_type, data):
         """
         Slot triggered when the data-retriever has finished doing some work.  The data retriever is currently
@@ -1418,24 +1974,63 @@ class FileModel(QtGui.QStandardItemModel, ViewItemRolesMixin):
         if uid not in self._pending_thumbnail_requests:
             # the completed work is of no interest to us!
             return
-        group_key, file_key, file_version = self._pending_thumbnail_requests[uid]
-        del self._pending_thumbnail_requests[uid]
+        thumb_key = self._pending_thumbnail_requests.pop(uid)
+
+        # add the thumbnail to the shared cache.  This notifies all the models waiting for it,
+        # including this one:
+        g_thumbnail_cache.add(thumb_key, data.get("thumb_path"), data.get("image"))
+
+    def _on_data_retriever_work_failed(self, uid, error_msg):
+        """
+        Slot triggered when the data retriever fails to do some work!
 
-        # extract the thumbnail path and QImage from the data/result
-        thumb_path = data.get("thumb_path")
-        if not thumb_path:
+        :param uid:         The unique id representing the task that the data retriever failed on
+        :param error_msg:   The error message for the failed task
+        """
+        thumb_key = self._pending_thumbnail_requests.pop(uid, None)
+        if thumb_key:
+            g_thumbnail_cache.stop_loading(thumb_key)
+        self._app.log_debug(
+            "File Model: Failed to find thumbnail for id %s: %s" % (uid, error_msg)
+        )
+
+    def _on_thumbnail_loaded(self, thumb_key):
+        """
+        Slot triggered when the thumbnail cache has finished loading a thumbnail, either for this
+        model or for another one.
+
+        :param thumb_key:   The thumbnail url or path that was loaded
+        """
+        request_keys = self._thumbnail_waiters.pop(thumb_key, None)
+        if not request_keys or not g_thumbnail_cache.contains(thumb_key):
+            # nothing was waiting for this thumbnail or it couldn't be loaded:
             return
+        for request_key in request_keys:
+            self._update_file_thumbnail(request_key, thumb_key)
 
-        thumb_image = data.get("image")
-        if thumb_image:
-            # prepare a pixmap from the thumbnail image
-            thumb = self._build_thumbnail(thumb_image)
-        else:
-            # Create a pixmap directly from the thumbnail path
-            thumb = QtGui.QPixmap(thumb_path)
+    def _on_thumbnail_cancelled(self, thumb_key):
+        """
+        Slot triggered when the download of a thumbnail was cancelled by the model that started
+        it.  The thumbnail is requested again for the files of this model still waiting for it.
 
-        if not thumb:
+        :param thumb_key:   The thumbnail url or path that was cancelled
+        """
+        request_keys = self._thumbnail_waiters.pop(thumb_key, None)
+        if not request_keys:
             return
+        for group_key, file_key, file_version in request_keys:
+            model_items = self._find_current_items(group_key, file_key, file_version)
+            if model_items:
+                self._request_thumbnail(group_key, model_items[0].file_item)
+
+    def _update_file_thumbnail(self, request_key, thumb_key):
+        """
+        Update the model items for a file once its thumbnail has been loaded.
+
+        :param request_key: The (group_key, file_key, file_version) of the file
+        :param thumb_key:   The key of the thumbnail in the thumbnail cache
+        """
+        group_key, file_key, file_version = request_key
 
         # find all file items for this file:
         model_items = self._find_current_items(group_key, file_key, file_version)
@@ -1443,89 +2038,99 @@ class FileModel(QtGui.QStandardItemModel, ViewItemRolesMixin):
             return
 
         # find the work area associated with the group:
-        work_area = None
-        for group_item in self._group_items():
-            if group_item.key == group_key:
-                work_area = group_item.work_area
-                break
+        group_item = self._get_group_item(group_key)
+        work_area = group_item.work_area if group_item else None
 
         # update all files and items with this thumbnail:
         for model_item in model_items:
             file_item = model_item.file_item
-            file_item.thumbnail = thumb
+            file_item.thumbnail_key = thumb_key
             model_item.emitDataChanged()
 
             if work_area:
                 # update thumbnails on all file versions:
                 self._update_version_thumbnails(file_item.key, group_key, work_area)
 
-    def _on_data_retriever_work_failed(self, uid, error_msg):
-        """
-        Slot triggered when the data retriever fails to do some work!
-
-        :param uid:         The unique id representing the task that the data retriever failed on
-        :param error_msg:   The error message for the failed task
-        """
-        if uid in self._pending_thumbnail_requests:
-            del self._pending_thumbnail_requests[uid]
-        self._app.log_debug(
-            "File Model: Failed to find thumbnail for id %s: %s" % (uid, error_msg)
-        )
-
-    def _update_group_file_items(self, group_item):
+    def _update_group_file_items(self, group_item, file_keys=None):
         """
-        Update all file model items within the specified group model item.  This updates each file's
-        tooltip, associated versions and thumbnail and ensures that the correct dataChanged signal is
+        Update the file model items within the specified group model item.  This updates each file's
+        associated versions and thumbnail and ensures that the correct dataChanged signal is
         emitted for them.
 
         :param group_item:  The _GroupModelItem representing the group in the model
+        :param file_keys:   Optional set of the keys of the files to update.  All versions of these
+                            files are updated.  If None then all files in the group are updated.
         """
         work_area = group_item.work_area
         if not work_area:
             return
 
-        # get a unique list of all file keys under the group:
-        unique_file_keys = set()
-        for item in self._file_items(group_item):
-            file_item = item.file_item
-            unique_file_keys.add(file_item.key)
+        if file_keys is None:
+            # get a unique list of all file keys under the group:
+            file_model_items = list(self._file_items(group_item))
+            file_keys = set(item.file_item.key for item in file_model_items)
+        else:
+            # find the items for the keys, ignoring any that have been removed from the group:
+            file_model_items = [
+                item
+                for file_key in file_keys
+                for item in self._find_current_items(group_item.key, file_key, None)
+                if item.parent() == group_item
+            ]
 
-        if not unique_file_keys:
+        if not file_keys:
             return
 
         # process files for each key:
-        for file_key in unique_file_keys:
+        for file_key in file_keys:
+            # the versions of the file are updated so the display data cached for them needs
+            # to be rebuilt:
+            self._file_key_revisions[file_key] = (
+                self._file_key_revisions.get(file_key, 0) + 1
+            )
+
             # get all file versions for this key:
             file_versions = (
                 self._search_cache.find_file_versions(work_area, file_key) or {}
             )
 
             # update thumbnail and versions for each version:
-            thumb = None
+            thumb_key = None
             for _, version in sorted(file_versions.items(), reverse=False):
                 if version.thumbnail_path:
                     # this file version should have a thumbnail!
-                    thumb = version.thumbnail
+                    thumb_key = version.thumbnail_key
                 else:
                     # lets use the current thumbnail for this version:
-                    version.thumbnail = thumb
+                    version.thumbnail_key = thumb_key
 
                 # store the file versions on the file as well:
                 version.versions = file_versions
 
-        # update tooltips on all file items:
-        for file_model_item in self._file_items(group_item):
-            file_item = file_model_item.file_item
-            tooltip = ""
-            if file_item:
-                tooltip = file_item.format_tooltip()
-            file_model_item.setToolTip(tooltip)
+        # emit data changed signals for the updated items.  Their tooltips and other display
+        # data will be rebuilt the next time they are drawn:
+        self._emit_rows_changed(group_item, [item.row() for item in file_model_items])
 
-        # emit data changed signal for all items in the group:
-        row_count = group_item.rowCount()
-        tl_idx = self.index(0, 0, group_item.index())
-        br_idx = self.index(row_count - 1, 0, group_item.index())
-        self.dataChanged.emit(tl_idx, br_idx)
+    def _emit_rows_changed(self, parent_item, rows):
+        """
+        Emit the dataChanged signal for the specified rows under a parent item, emitting a single
+        signal for each contiguous range of rows.
+
+        :param parent_item: The QStandardItem the rows belong to
+        :param rows:        The list of rows that changed
+        """
+        parent_idx = parent_item.index()
+        ranges = []
+        for row in sorted(set(rows)):
+            if ranges and row == ranges[-1][1] + 1:
+                ranges[-1][1] = row
+            else:
+                ranges.append([row, row])
+        for first_row, last_row in ranges:
+            self.dataChanged.emit(
+                self.index(first_row, 0, parent_idx),
+                self.index(last_row, 0, parent_idx),
+            )
 
     def _update_version_thumbnails(self, file_key, group_key, work_area):
         """
@@ -1537,15 +2142,15 @@ class FileModel(QtGui.QStandardItemModel, ViewItemRolesMixin):
         :param work_area:   A WorkArea instance that all files in this group belong to
         """
         file_versions = self._search_cache.find_file_versions(work_area, file_key) or {}
-        thumb = None
+        thumb_key = None
         for _, version in sorted(file_versions.items(), reverse=False):
             if version.thumbnail_path:
                 # this file version should have a thumbnail!
-                thumb = version.thumbnail
+                thumb_key = version.thumbnail_key
             else:
-                if version.thumbnail != thumb:
+                if version.thumbnail_key != thumb_key:
                     # lets use the current thumbnail for this version:
-                    version.thumbnail = thumb
+                    version.thumbnail_key = thumb_key
 
                     # emit a data changed signal for any model items that are affected:
                     version_items = self._find_current_items(
@@ -1553,67 +2158,3 @@ class FileModel(QtGui.QStandardItemModel, ViewItemRolesMixin):
                     )
                     for item in version_items:
                         item.emitDataChanged()
-
-    def _build_thumbnail(self, thumb_path_or_image):
-        """
-        Build a thumbnail from the specified path or QImage with uniform dimensions.
-
-        :param thumb_path_or_image: A string representing the path on disk of the thumbnail to load
-                                    or a QImage containing the thumbnail to use.
-        :returns:                   A QPixmap of size 576/374 pixels containing the scaled thumbnail
-        """
-        # load the thumbnail
-        thumb = QtGui.QPixmap(thumb_path_or_image)
-        if not thumb or thumb.isNull():
-            return
-
-        # make sure the thumbnail is a good size with the correct aspect ratio:
-        MAX_WIDTH = 576  # 96
-        MAX_HEIGHT = 374  # 64
-        ASPECT = float(MAX_WIDTH) / MAX_HEIGHT
-
-        thumb_sz = thumb.size()
-        thumb_aspect = float(thumb_sz.width()) / thumb_sz.height()
-        max_thumb_sz = QtCore.QSize(MAX_WIDTH, MAX_HEIGHT)
-        if thumb_aspect >= ASPECT:
-            # scale based on width:
-            if thumb_sz.width() > MAX_WIDTH:
-                thumb_sz *= float(MAX_WIDTH) / thumb_sz.width()
-            else:
-                max_thumb_sz *= float(thumb_sz.width()) / MAX_WIDTH
-        else:
-            # scale based on height:
-            if thumb_sz.height() > MAX_HEIGHT:
-                thumb_sz *= float(MAX_HEIGHT) / thumb_sz.height()
-            else:
-                max_thumb_sz *= float(thumb_sz.height()) / MAX_HEIGHT
-
-        if thumb_sz != thumb.size():
-            thumb = thumb.scaled(
-                thumb_sz.width(),
-                thumb_sz.height(),
-                QtCore.Qt.KeepAspectRatio,
-                QtCore.Qt.SmoothTransformation,
-            )
-
-        # create base pixmap with the correct aspect ratio that the thumbnail will fit in
-        # and fill it with a transparent colour:
-        thumb_base = QtGui.QPixmap(max_thumb_sz)
-        thumb_base.fill(QtGui.QColor(QtCore.Qt.transparent))
-
-        # create a painter to paint into this pixmap:
-        painter = QtGui.QPainter(thumb_base)
-        try:
-            painter.setRenderHint(QtGui.QPainter.Antialiasing)
-
-            # paint the thumbnail into this base making sure it's centered:
-            diff = max_thumb_sz - thumb.size()
-            offset = diff / 2
-            brush = QtGui.QBrush(thumb)
-            painter.setBrush(brush)
-            painter.translate(offset.width(), offset.height())
-            painter.drawRect(0, 0, thumb.width(), thumb.height())
-        finally:
-            painter.end()
-
-        return thumb_base
@@ -12,6 +12,8 @@
 Cache used to store and find file search results.
 """
 
+import os
+
 import sgtk
 from .util import Threaded
 
@@ -89,6 +91,36 @@ class FileSearchCache(Threaded):
         # add the new entry to the cache:
         self._cache[key] = new_entry
 
+    @Threaded.exclusive
+    def update_files(self, work_area, files, removed_file_versions=None):
+        """
+        Add or replace some files in the cache entry for a work area and remove others, leaving
+        all the other files in the entry as they are.
+
+        :param work_area:               The WorkArea the files were found in
+        :param files:                   A list of FileItems to add to, or replace in, the cache
+        :param removed_file_versions:   Optional set of (key, version) tuples for the files to
+                                        remove from the cache
+        """
+        key, entry = self._find_entry(work_area)
+        if not entry:
+            entry = FileSearchCache._CacheEntry()
+            self._cache[key] = entry
+        entry.work_area = work_area
+
+        for file_key, version in removed_file_versions or []:
+            file_info = entry.file_info.get(file_key)
+            if not file_info:
+                continue
+            file_info.versions.pop(version, None)
+            if not file_info.versions:
+                del entry.file_info[file_key]
+
+        for file_item in files:
+            entry.file_info.setdefault(
+                file_item.key, FileSearchCache._CachedFileInfo()
+            ).versions[file_item.version] = file_item
+
     @Threaded.exclusive
     def find_file_versions(self, work_area, file_key, clean_only=False):
         """
@@ -166,6 +198,67 @@ class FileSearchCache(Threaded):
             return
         entry.is_dirty = dirty
 
+    @Threaded.exclusive
+    def update_work_files(self, work_area, dir_path, file_items):
+        """
+        Update the cached work files that live in a single directory without touching any of the
+        other files in the cache entry.  Work files that no longer exist are removed from the cache
+        unless they are also published in which case they are just flagged as not being work files.
+
+        :param work_area:   The work area to update the cached files for
+        :param dir_path:    The directory the work files were found in
+        :param file_items:  A list of FileItems representing all work files currently in the directory
+        :returns:           Tuple containing (added, updated, removed) lists of FileItems or None if
+                            there is no cache entry for the work area.  Updated FileItems are the
+                            instances that were already in the cache.
+        """
+        _, entry = self._find_entry(work_area)
+        if not entry:
+            return None
+
+        found_files = dict(((f.key, f.version), f) for f in file_items)
+        added = []
+        updated = []
+        removed = []
+
+        # remove, or update, work files that are no longer in the directory:
+        for file_key, file_info in list(entry.file_info.items()):
+            for version, cached_file in list(file_info.versions.items()):
+                if (file_key, version) in found_files:
+                    continue
+                if not cached_file.is_local or not cached_file.path:
+                    continue
+                if os.path.dirname(cached_file.path) != dir_path:
+                    continue
+                if cached_file.is_published:
+                    cached_file.set_not_work_file()
+                    updated.append(cached_file)
+                else:
+                    del file_info.versions[version]
+                    removed.append(cached_file)
+            if not file_info.versions:
+                del entry.file_info[file_key]
+
+        # and add, or update, the work files found in the directory:
+        for (file_key, version), file_item in found_files.items():
+            file_info = entry.file_info.setdefault(
+                file_key, FileSearchCache._CachedFileInfo()
+            )
+            cached_file = file_info.versions.get(version)
+            if not cached_file:
+                file_info.versions[version] = file_item
+                added.append(file_item)
+            elif (
+                not cached_file.is_local
+                or cached_file.path != file_item.path
+                or cached_file.modified_at != file_item.modified_at
+                or cached_file.modified_by != file_item.modified_by
+            ):
+                cached_file.update_from_work_file(file_item)
+                updated.append(cached_file)
+
+        return (added, updated, removed)
+
     @Threaded.exclusive
     def clear(self):
         """
@@ -0,0 +1,150 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Persistent cache of the publishes found for each set of publish filters.
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+from datetime import datetime
+
+import sgtk
+
+from .publish_record import PublishRecord, build_publish_records
+
+
+class PublishListCache(object):
+    """
+    Cache of the up to date list of publishes found for each set of publish filters, stored as
+    one JSON file per set of filters in the app's cache location.
+
+    Refreshing cached publishes only finds the publishes that changed since the most recent
+    update time of the cached publishes.  The merged list is written here so that the next
+    session starts from it, rather than from the publish model's cache which is only updated by
+    a full query.
+
+    Files are replaced atomically so the cache can be read and written from any thread without
+    a lock, the last list written for a set of filters wins.
+    """
+
+    # Bump this if the format of the cache changes so that stale caches are discarded.
+    FORMAT_VERSION = 1
+
+    def __init__(self, cache_dir=None):
+        """
+        Construction
+
+        :param cache_dir:   Directory to store the cache files in.  If None then the files are
+                            stored in the current app's cache location.
+        """
+        self._cache_dir = cache_dir
+
+    def get(self, publish_filters):
+        """
+        Get the publishes cached for a set of filters.
+
+        :param publish_filters: The filters used to find the publishes
+        :returns:               A list of PublishRecords or None if nothing is cached for the
+                                filters
+        """
+        try:
+            with open(self._get_cache_path(publish_filters), "r") as cache_file:
+                data = json.load(cache_file)
+        except (OSError, ValueError):
+            # nothing cached or the cache is corrupt, either way it will be re-created:
+            return None
+
+        if (
+            not isinstance(data, dict)
+            or data.get("format") != PublishListCache.FORMAT_VERSION
+            or data.get("filters") != self._get_filters_key(publish_filters)
+        ):
+            return None
+        return build_publish_records(data.get("publishes"))
+
+    def add(self, publish_filters, sg_publishes):
+        """
+        Cache the up to date list of publishes found for a set of filters.
+
+        :param publish_filters: The filters used to find the publishes
+        :param sg_publishes:    The list of publishes, either PublishRecords or dictionaries
+        """
+        try:
+            contents = json.dumps(
+                {
+                    "format": PublishListCache.FORMAT_VERSION,
+                    "filters": self._get_filters_key(publish_filters),
+                    "publishes": [
+                        self._to_json_dict(sg_publish) for sg_publish in sg_publishes
+                    ],
+                }
+            )
+        except (TypeError, ValueError):
+            return
+
+        cache_path = self._get_cache_path(publish_filters)
+        try:
+            cache_dir = os.path.dirname(cache_path)
+            if not os.path.exists(cache_dir):
+                os.makedirs(cache_dir)
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w") as cache_file:
+                cache_file.write(contents)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            # this isn't critical, the publishes will just be found again next time:
+            app = sgtk.platform.current_bundle()
+            app.log_debug("Failed to write the publish list cache: %s" % e)
+
+    @staticmethod
+    def _get_filters_key(publish_filters):
+        """
+        :param publish_filters: The filters used to find a list of publishes
+        :returns:               A string identifying the filters
+        """
+        return json.dumps(publish_filters, sort_keys=True, default=str)
+
+    def _get_cache_path(self, publish_filters):
+        """
+        :param publish_filters: The filters used to find a list of publishes
+        :returns:               The path of the cache file for the filters
+        """
+        if not self._cache_dir:
+            app = sgtk.platform.current_bundle()
+            self._cache_dir = os.path.join(app.cache_location, "publish_lists")
+        digest = hashlib.sha1(
+            self._get_filters_key(publish_filters).encode("utf-8")
+        ).hexdigest()
+        return os.path.join(self._cache_dir, "%s.json" % digest)
+
+    @classmethod
+    def _to_json_dict(cls, sg_publish):
+        """
+        :param sg_publish:  A publish dictionary or PublishRecord
+        :returns:           A dictionary of the publish that can be serialized to JSON, with its
+                            date fields stored as unix timestamps
+        """
+        if isinstance(sg_publish, PublishRecord):
+            sg_publish = sg_publish.to_dict()
+        fields = {}
+        for field, value in sg_publish.items():
+            if isinstance(value, datetime):
+                value = value.timestamp()
+            elif isinstance(value, dict):
+                value = cls._to_json_dict(value)
+            fields[field] = value
+        return fields
+
+
+# single global instance of the publish list cache
+g_publish_list_cache = PublishListCache()
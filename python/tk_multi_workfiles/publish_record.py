@@ -0,0 +1,233 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Immutable publish records shared by all the stages of a search.
+"""
+
+import sys
+import time
+from datetime import datetime
+
+from tank_vendor.shotgun_api3 import sg_timezone
+
+from .util import Threaded
+
+
+class PublishRecord(dict):
+    """
+    Read-only dictionary holding the details of a single publish.  Records are normalized once
+    when the publishes are found and then shared, without copying, by every user sandbox a search
+    processes the publishes for.  Code that needs a modified version of a record must copy it
+    first, e.g. with `record.copy()` which returns a regular, mutable, dictionary.
+
+    Date fields are stored in the same way as the publish model caches them, as unix timestamps,
+    apart from the fields in DATETIME_FIELDS that are converted to local datetimes.
+    """
+
+    # date fields stored as local datetimes rather than unix timestamps:
+    DATETIME_FIELDS = ("created_at",)
+
+    def _read_only(self, *args, **kwargs):
+        """
+        :raises TypeError:  Always, records can't be modified
+        """
+        raise TypeError("Publish records are shared and can't be modified")
+
+    __setitem__ = _read_only
+    __delitem__ = _read_only
+    clear = _read_only
+    pop = _read_only
+    popitem = _read_only
+    setdefault = _read_only
+    update = _read_only
+
+    def __copy__(self):
+        """
+        :returns:   A mutable copy of the record
+        """
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        """
+        Records are immutable so there is no need to copy them.
+
+        :returns:   The record itself
+        """
+        return self
+
+    def __reduce__(self):
+        """
+        :returns:   The details needed to pickle the record
+        """
+        return (PublishRecord, (dict(self),))
+
+    def copy(self):
+        """
+        :returns:   A mutable copy of the record
+        """
+        return dict(self)
+
+    def to_dict(self):
+        """
+        :returns:   A mutable copy of the record in which the records it contains are also
+                    converted to mutable dictionaries
+        """
+        return dict(
+            (field, value.to_dict() if isinstance(value, PublishRecord) else value)
+            for field, value in self.items()
+        )
+
+    @classmethod
+    def from_sg_data(cls, sg_data):
+        """
+        Build a record from the data of a publish returned by Shotgun or the publish model.
+
+        :param sg_data: The publish dictionary.  If this is already a record then it is returned
+                        as it is.
+        :returns:       A PublishRecord
+        """
+        if isinstance(sg_data, PublishRecord):
+            return sg_data
+
+        fields = {}
+        for field, value in sg_data.items():
+            if isinstance(value, datetime):
+                value = value.timestamp()
+            if field in PublishRecord.DATETIME_FIELDS and value is not None:
+                value = datetime.fromtimestamp(value, sg_timezone.local)
+            elif isinstance(value, dict):
+                value = cls.from_sg_data(value)
+            fields[field] = value
+        return cls(fields)
+
+
+class PublishRecordStats(Threaded):
+    """
+    Instrumentation for the publish records built by searches, used to keep track of the time
+    and memory spent normalizing publishes compared to the number of times records are shared
+    instead of being copied.
+    """
+
+    def __init__(self):
+        """
+        Construction
+        """
+        Threaded.__init__(self)
+        self.reset()
+
+    @Threaded.exclusive
+    def reset(self):
+        """
+        Reset all counters.
+        """
+        self._records_built = 0
+        self._build_time = 0.0
+        self._build_bytes = 0
+        self._records_shared = 0
+
+    @Threaded.exclusive
+    def add_built(self, num_records, build_time, build_bytes):
+        """
+        :param num_records: The number of records built
+        :param build_time:  The time, in seconds, spent building them
+        :param build_bytes: The approximate memory, in bytes, used by the records
+        """
+        self._records_built += num_records
+        self._build_time += build_time
+        self._build_bytes += build_bytes
+
+    @Threaded.exclusive
+    def add_shared(self, num_records):
+        """
+        :param num_records: The number of records shared with a stage instead of being copied
+        """
+        self._records_shared += num_records
+
+    @property
+    def records_built(self):
+        """
+        :returns:   The number of records built
+        """
+        return self._records_built
+
+    @property
+    def records_shared(self):
+        """
+        :returns:   The number of times a record was shared instead of being copied
+        """
+        return self._records_shared
+
+    @property
+    def build_time(self):
+        """
+        :returns:   The total time, in seconds, spent building records
+        """
+        return self._build_time
+
+    @property
+    def build_bytes(self):
+        """
+        :returns:   The approximate memory, in bytes, used by the records built
+        """
+        return self._build_bytes
+
+    def report(self):
+        """
+        :returns:   A string summarizing the counters
+        """
+        return (
+            "Built %d publish records in %0.3fs (%0.2fKb), shared %d records without copying"
+            % (
+                self._records_built,
+                self._build_time,
+                self._build_bytes / 1024.0,
+                self._records_shared,
+            )
+        )
+
+
+def build_publish_records(sg_publishes):
+    """
+    Normalize a list of publishes into shared publish records.  Publishes that are already records
+    are kept as they are.
+
+    :param sg_publishes:    A list of publish dictionaries, or None
+    :returns:               A list of PublishRecords
+    """
+    start = time.time()
+    records = []
+    num_built = 0
+    num_bytes = 0
+    for sg_publish in sg_publishes or []:
+        record = PublishRecord.from_sg_data(sg_publish)
+        if record is not sg_publish:
+            num_built += 1
+            num_bytes += _get_record_size(record)
+        records.append(record)
+    if num_built:
+        g_publish_record_stats.add_built(num_built, time.time() - start, num_bytes)
+    return records
+
+
+def _get_record_size(record):
+    """
+    :param record:  A PublishRecord
+    :returns:       The approximate size, in bytes, of the record and the records it contains
+    """
+    size = sys.getsizeof(record)
+    for value in record.values():
+        if isinstance(value, PublishRecord):
+            size += _get_record_size(value)
+    return size
+
+
+# single global instance of the publish record instrumentation
+g_publish_record_stats = PublishRecordStats()
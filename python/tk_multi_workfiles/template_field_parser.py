@@ -0,0 +1,304 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Compiled parser used to extract template fields from a large number of paths.
+"""
+
+import os
+import re
+
+import sgtk
+from sgtk import TankError
+
+
+class TemplateFieldParser(object):
+    """
+    Extracts fields from paths in the same way as `TemplatePath.get_fields` but using a regular
+    expression compiled once for each variation of the template definition.
+
+    The Toolkit parser considers every possible way of splitting a path into keys which gets
+    expensive when parsing thousands of paths.  A regular expression can be used when every key
+    is followed by a static token starting with a character the key values can never contain.
+    A single key per variation may be followed by a token its values can contain, e.g. the name
+    in `{name}.v{version}.ma`: the path is then matched with the shortest and with the longest
+    value for that key and is only parsed by the expression when both agree.  Templates with
+    more ambiguous keys, and any path the compiled expressions aren't sure about, fall back to
+    the template's own `get_fields` method.
+    """
+
+    # regular expression used to find the keys in a template definition:
+    _KEY_REGEX = re.compile(r"{([^{}]+)}")
+
+    class _Variation(object):
+        """
+        A single variation of the template definition, one for each combination of optional keys.
+        """
+
+        def __init__(self, regex, relaxed_regex, keys, greedy_regex=None):
+            """
+            Construction
+
+            :param regex:           Compiled expression extracting the key values from a path.  If
+                                    None then this variation can't be parsed without ambiguity.
+            :param relaxed_regex:   Compiled expression matching any path the static parts of this
+                                    variation match, regardless of the key values.
+            :param keys:            List of the TemplateKeys in the order they appear in the definition
+            :param greedy_regex:    Compiled expression extracting the longest value for the key
+                                    that may contain the token following it, when regex extracts
+                                    the shortest one.  None if no key is ambiguous.
+            """
+            self.regex = regex
+            self.relaxed_regex = relaxed_regex
+            self.keys = keys
+            self.greedy_regex = greedy_regex
+
+    def __init__(self, template):
+        """
+        Construction
+
+        :param template:    The TemplatePath to parse paths for
+        """
+        self._template = template
+        self._keys = dict(template.keys) if template else {}
+        self._variations = self._compile(template)
+
+    @property
+    def template(self):
+        """
+        :returns:   The template this parser extracts fields for
+        """
+        return self._template
+
+    @property
+    def keys(self):
+        """
+        :returns:   A dictionary of {name:TemplateKey} for the template, equivalent to `template.keys`
+        """
+        return self._keys
+
+    @property
+    def is_compiled(self):
+        """
+        :returns:   True if at least one variation of the template could be compiled, False if all
+                    paths will be parsed by the template itself.
+        """
+        return any(v.regex for v in self._variations)
+
+    def get_fields(self, path):
+        """
+        Extract the fields from a path.
+
+        :param path:    The path to extract the fields from
+        :returns:       A dictionary of fields
+        :raises:        TankError if the path doesn't match the template
+        """
+        if not self._variations:
+            return self._template.get_fields(path)
+
+        norm_path = os.path.normpath(path)
+        for variation in self._variations:
+            if variation.regex:
+                match = variation.regex.match(norm_path)
+                if match and variation.greedy_regex:
+                    greedy_match = variation.greedy_regex.match(norm_path)
+                    if not greedy_match or greedy_match.groups() != match.groups():
+                        # the path can be split in more than one way:
+                        break
+                if match:
+                    fields = self._fields_from_match(match, variation.keys)
+                    if fields is not None:
+                        return fields
+                    break
+            if variation.relaxed_regex.match(norm_path):
+                # this variation may match in a way we can't determine so
+                # let the template figure it out:
+                break
+
+        return self._template.get_fields(path)
+
+    def get_fields_for_paths(self, paths):
+        """
+        Extract the fields from a list of paths.
+
+        :param paths:   The list of paths to extract the fields from
+        :returns:       A dictionary of {path:fields}
+        :raises:        TankError if any of the paths don't match the template
+        """
+        return dict((path, self.get_fields(path)) for path in paths)
+
+    def validate(self, path):
+        """
+        Check that a path matches the template.
+
+        :param path:    The path to validate
+        :returns:       True if the path matches the template, otherwise False
+        """
+        try:
+            self.get_fields(path)
+        except TankError:
+            return False
+        return True
+
+    @staticmethod
+    def _fields_from_match(match, keys):
+        """
+        Convert the key values captured by a match into fields.
+
+        :param match:   The regular expression match
+        :param keys:    The TemplateKeys captured by each group of the match
+        :returns:       A dictionary of fields or None if any of the values are invalid
+        """
+        fields = {}
+        for key, str_value in zip(keys, match.groups()):
+            try:
+                value = key.value_from_str(str_value)
+            except TankError:
+                return None
+            if key.name in fields and fields[key.name] != value:
+                # the same key has different values in the path:
+                return None
+            fields[key.name] = value
+        return fields
+
+    @classmethod
+    def _compile(cls, template):
+        """
+        Compile the regular expressions for all variations of the template.
+
+        :param template:    The template to compile
+        :returns:           A list of _Variation instances in the order the template tries them, or
+                            an empty list if the template isn't one we know how to compile.
+        """
+        definitions = getattr(template, "_definitions", None)
+        variation_keys = getattr(template, "_keys", None)
+        if (
+            not isinstance(template, sgtk.TemplatePath)
+            or not definitions
+            or not variation_keys
+            or len(definitions) != len(variation_keys)
+        ):
+            return []
+
+        variations = []
+        for definition, keys in zip(definitions, variation_keys):
+            if not os.path.isabs(definition):
+                definition = os.path.join(template.root_path, definition)
+            variation = cls._compile_variation(os.path.normpath(definition), keys)
+            if not variation:
+                return []
+            variations.append(variation)
+        return variations
+
+    @classmethod
+    def _compile_variation(cls, definition, keys):
+        """
+        Compile a single variation of the template definition.
+
+        :param definition:  The full definition of the variation, including the root path
+        :param keys:        A dictionary of {name:TemplateKey} for the keys in the definition
+        :returns:           A _Variation instance or None if the definition couldn't be understood
+        """
+        # split the definition into alternating static and key tokens:
+        tokens = cls._KEY_REGEX.split(definition)
+        static_tokens = tokens[0::2]
+        ordered_keys = []
+        for key_name in tokens[1::2]:
+            key = keys.get(key_name)
+            if not key:
+                return None
+            ordered_keys.append(key)
+
+        pattern = ""
+        greedy_pattern = ""
+        relaxed_pattern = ""
+        unambiguous = True
+        num_ambiguous_keys = 0
+        any_char = "[^%s]" % re.escape(os.path.sep)
+        for ri, key in enumerate(ordered_keys):
+            static_token = static_tokens[ri]
+            pattern += cls._static_pattern(static_token)
+            greedy_pattern += cls._static_pattern(static_token)
+            relaxed_pattern += cls._static_pattern(static_token)
+
+            # the key value ends at the next static token:
+            next_token = static_tokens[ri + 1]
+            char_class = cls._key_char_class(key) or any_char
+            if not next_token:
+                if ri + 1 < len(ordered_keys):
+                    # two consecutive keys can be split in many ways:
+                    unambiguous = False
+            elif next_token[0] != os.path.sep and cls._matches_any_case(
+                char_class, next_token[0]
+            ):
+                # the key value may contain the start of the next token so the shortest and
+                # the longest values are both extracted to check they are the same:
+                num_ambiguous_keys += 1
+                pattern += "(%s+?)" % char_class
+                greedy_pattern += "(%s+)" % char_class
+                relaxed_pattern += "%s*" % any_char
+                continue
+            pattern += "(%s+)" % char_class
+            greedy_pattern += "(%s+)" % char_class
+            relaxed_pattern += "%s*" % any_char
+
+        pattern += cls._static_pattern(static_tokens[-1]) + "$"
+        greedy_pattern += cls._static_pattern(static_tokens[-1]) + "$"
+        relaxed_pattern += cls._static_pattern(static_tokens[-1]) + "$"
+
+        # with more than one ambiguous key, the shortest and longest values for each of them
+        # could agree while other combinations exist:
+        regex = greedy_regex = None
+        if unambiguous and num_ambiguous_keys <= 1:
+            regex = re.compile(pattern)
+            if num_ambiguous_keys:
+                greedy_regex = re.compile(greedy_pattern)
+        return TemplateFieldParser._Variation(
+            regex, re.compile(relaxed_pattern), ordered_keys, greedy_regex
+        )
+
+    @staticmethod
+    def _static_pattern(static_token):
+        """
+        :param static_token:    A static part of the template definition
+        :returns:               A pattern matching the static part, ignoring case like Toolkit does
+        """
+        if not static_token:
+            return ""
+        return "(?i:%s)" % re.escape(static_token)
+
+    @staticmethod
+    def _key_char_class(key):
+        """
+        Get the character class values of a key are restricted to.
+
+        :param key: The TemplateKey to get the character class for
+        :returns:   A regular expression character class or None if values aren't restricted
+        """
+        if isinstance(key, sgtk.IntegerKey):
+            return "[0-9]"
+        if isinstance(key, sgtk.StringKey):
+            filter_by = getattr(key, "filter_by", None)
+            if filter_by == "alphanumeric":
+                return "[a-zA-Z0-9]"
+            if filter_by == "alpha":
+                return "[a-zA-Z]"
+        return None
+
+    @staticmethod
+    def _matches_any_case(char_class, char):
+        """
+        :param char_class:  A regular expression character class
+        :param char:        The character to test
+        :returns:           True if either case of the character is part of the class
+        """
+        return bool(
+            re.match(char_class, char.lower()) or re.match(char_class, char.upper())
+        )
@@ -0,0 +1,346 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Template aware directory walker used to find files on disk that match a template.
+"""
+
+import os
+import glob
+import fnmatch
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import sgtk
+
+# File details collected while walking, owner uid is None on Windows where it isn't available.
+FileStat = namedtuple("FileStat", ["mtime", "uid", "size"])
+
+
+class TemplateWalker(object):
+    """
+    Finds all paths on disk matching a template in the same way as `sgtk.paths_from_template`
+    does, but instead of handing a glob string to the `glob` module, the search pattern is
+    walked one directory level at a time using `os.scandir`.  Any branch whose static parts
+    (including the fields already known from the context) don't match is dropped as soon as
+    it is encountered and sibling directories at the same level are listed in parallel using
+    a bounded, shared thread pool.
+
+    The details of the files found are collected from the directory entries as the final level
+    is listed so that callers don't need to stat each file again.
+    """
+
+    # maximum number of threads used to list directories across all walkers:
+    MAX_WORKERS = 8
+
+    _executor = None
+    _executor_lock = threading.Lock()
+
+    def __init__(
+        self, template, listing_cache=None, field_parser=None, cancel_token=None
+    ):
+        """
+        Construction
+
+        :param template:        The TemplatePath to find paths for
+        :param listing_cache:   Optional object used to list directories.  It must implement a
+                                thread-safe `list_dir(path)` method returning a list of
+                                (name, is_dir) tuples, or None if the directory can't be listed.
+        :param field_parser:    Optional TemplateFieldParser for the template used to validate
+                                the paths found.  If None then the template itself is used.
+        :param cancel_token:    Optional CancellationToken checked before each directory is
+                                listed.  A SearchCancelledError is raised once it is cancelled.
+        """
+        self._template = template
+        self._listing_cache = listing_cache
+        self._field_parser = field_parser
+        self._cancel_token = cancel_token
+
+    @property
+    def template(self):
+        """
+        :returns:   The template this walker finds paths for
+        """
+        return self._template
+
+    def paths_from_template(
+        self, fields, skip_keys=None, skip_missing_optional_keys=False
+    ):
+        """
+        Find all paths on disk that match the template.  This takes the same arguments and
+        returns the same list of paths as `sgtk.paths_from_template`.
+
+        :param fields:                      Dictionary of fields to use when resolving the template
+        :param skip_keys:                   List of keys that should be treated as wildcards
+        :param skip_missing_optional_keys:  If True then any optional keys missing from the fields
+                                            will also be treated as wildcards
+        :returns:                           A list of paths matching the template
+        """
+        return list(
+            self.find_files(fields, skip_keys, skip_missing_optional_keys).keys()
+        )
+
+    def find_files(self, fields, skip_keys=None, skip_missing_optional_keys=False):
+        """
+        Find all paths on disk that match the template together with their details.  This
+        takes the same arguments as :meth:`paths_from_template`.
+
+        File details are only collected when the walker lists directories itself.  If a
+        listing cache was provided then it is up to the cache to provide these details.
+
+        :param fields:                      Dictionary of fields to use when resolving the template
+        :param skip_keys:                   List of keys that should be treated as wildcards
+        :param skip_missing_optional_keys:  If True then any optional keys missing from the fields
+                                            will also be treated as wildcards
+        :returns:                           A dictionary of {path:FileStat} for all paths matching the
+                                            template.  The FileStat will be None if the details of the
+                                            path couldn't be retrieved.
+        """
+        template = self._template
+        if not hasattr(template, "_keys") or not hasattr(template, "_apply_fields"):
+            # this doesn't look like a template we know how to walk so fall back to
+            # the core implementation:
+            app = sgtk.platform.current_bundle()
+            paths = app.sgtk.paths_from_template(
+                template, fields, skip_keys, skip_missing_optional_keys
+            )
+            return dict((path, None) for path in paths)
+
+        skip_keys = list(skip_keys or [])
+
+        # construct local fields dictionary that doesn't include any skip keys:
+        local_fields = dict(
+            (name, value) for name, value in fields.items() if name not in skip_keys
+        )
+
+        # required keys that weren't specified are treated as wildcards:
+        for key_name in template.missing_keys(local_fields):
+            if key_name not in skip_keys:
+                skip_keys.append(key_name)
+            local_fields[key_name] = "*"
+
+        # build a search pattern for each set of keys in the template:
+        patterns = []
+        for keys in template._keys:
+            current_local_fields = local_fields.copy()
+            current_skip_keys = []
+            for key_name in skip_keys:
+                if key_name in keys:
+                    current_skip_keys.append(key_name)
+                    current_local_fields[key_name] = "*"
+
+            # any remaining missing keys will all be optional keys:
+            missing_optional_keys = template._missing_keys(
+                current_local_fields, keys, False
+            )
+            if missing_optional_keys:
+                if not skip_missing_optional_keys:
+                    # we won't be able to form a valid path for this key set
+                    continue
+                for key_name in missing_optional_keys:
+                    current_local_fields[key_name] = "*"
+                    current_skip_keys.append(key_name)
+
+            pattern = template._apply_fields(
+                current_local_fields, ignore_types=current_skip_keys
+            )
+            if pattern not in patterns:
+                patterns.append(pattern)
+
+        validator = self._field_parser or template
+        found_files = {}
+        for pattern in patterns:
+            file_stats = {}
+            for path in self._walk(pattern, file_stats):
+                self._check_cancelled()
+                if path not in found_files and validator.validate(path):
+                    found_files[path] = file_stats.get(path)
+        return found_files
+
+    def _walk(self, pattern, file_stats=None):
+        """
+        Find all paths matching the specified glob pattern, walking the pattern one path
+        segment at a time.  Matching follows the same rules as the `glob` module.
+
+        :param pattern:     The absolute glob pattern to find paths for
+        :param file_stats:  Optional dictionary populated with {path:FileStat} for the paths found
+        :returns:           A list of paths matching the pattern
+        """
+        if os.path.altsep:
+            pattern = pattern.replace(os.path.altsep, os.path.sep)
+        drive, relative_pattern = os.path.splitdrive(pattern)
+        if not relative_pattern.startswith(os.path.sep):
+            # we only know how to walk absolute patterns:
+            return glob.glob(pattern)
+
+        segments = [s for s in relative_pattern.split(os.path.sep) if s]
+        if not segments:
+            return glob.glob(pattern)
+
+        current_dirs = [drive + os.path.sep]
+        for ri, segment in enumerate(segments):
+            is_last = ri == len(segments) - 1
+            stats = file_stats if is_last else None
+            if glob.has_magic(segment):
+                results = self._map(
+                    lambda d: self._list_matching(d, segment, not is_last, stats),
+                    current_dirs,
+                )
+            elif is_last:
+                # static file name, we just need to check it exists:
+                results = self._map(
+                    lambda d: self._check_file_exists(d, segment, stats),
+                    current_dirs,
+                )
+            else:
+                # static directory, we just need to check it exists:
+                results = self._map(
+                    lambda d: self._check_exists(d, segment, os.path.isdir),
+                    current_dirs,
+                )
+            current_dirs = [path for paths in results for path in paths]
+            if not current_dirs:
+                # nothing left to search!
+                break
+
+        return current_dirs
+
+    def _check_cancelled(self):
+        """
+        Raise a SearchCancelledError if the walk has been cancelled.
+        """
+        if self._cancel_token:
+            self._cancel_token.check()
+
+    def _check_exists(self, dir_path, name, exists):
+        """
+        Check if the specified name exists in a directory.
+
+        :param dir_path:    The directory to check
+        :param name:        The name of the entry to look for
+        :param exists:      Callable used to check the path exists
+        :returns:           A list containing the path if it exists, otherwise an empty list
+        """
+        self._check_cancelled()
+        path = os.path.join(dir_path, name)
+        return [path] if exists(path) else []
+
+    def _check_file_exists(self, dir_path, name, file_stats=None):
+        """
+        Check if the specified file exists in a directory, collecting its details if needed.
+
+        :param dir_path:    The directory to check
+        :param name:        The name of the file to look for
+        :param file_stats:  Optional dictionary to add the {path:FileStat} of the file to
+        :returns:           A list containing the path if it exists, otherwise an empty list
+        """
+        self._check_cancelled()
+        path = os.path.join(dir_path, name)
+        if file_stats is None:
+            return [path] if os.path.lexists(path) else []
+
+        try:
+            file_stats[path] = file_stat(os.stat(path))
+        except OSError:
+            # could be a broken link which glob would still match:
+            if not os.path.lexists(path):
+                return []
+            file_stats[path] = None
+        return [path]
+
+    def _list_matching(self, dir_path, pattern, dirs_only, file_stats=None):
+        """
+        List all entries of a directory matching the specified pattern.  Hidden entries
+        are only matched if the pattern explicitly starts with a '.', like the `glob` module.
+
+        :param dir_path:    The directory to list
+        :param pattern:     The fnmatch pattern entries should match
+        :param dirs_only:   If True, only directories will be returned
+        :param file_stats:  Optional dictionary to add the {path:FileStat} of matching entries to.
+                            This is ignored if a listing cache is used.
+        :returns:           A list of paths matching the pattern
+        """
+        self._check_cancelled()
+        if self._listing_cache:
+            entries = self._listing_cache.list_dir(dir_path) or []
+            names = [name for name, is_dir in entries if is_dir or not dirs_only]
+            if not pattern.startswith("."):
+                names = [name for name in names if not name.startswith(".")]
+            return [
+                os.path.join(dir_path, name) for name in fnmatch.filter(names, pattern)
+            ]
+
+        matching_entries = []
+        try:
+            with os.scandir(dir_path) as it:
+                for entry in it:
+                    # directories can be huge so check between entries too:
+                    self._check_cancelled()
+                    if entry.name.startswith(".") and not pattern.startswith("."):
+                        continue
+                    if not fnmatch.fnmatch(entry.name, pattern):
+                        continue
+                    try:
+                        if dirs_only and not entry.is_dir():
+                            continue
+                    except OSError:
+                        continue
+                    matching_entries.append(entry)
+        except OSError:
+            # ignore OSErrors as it's probably a permissions thing!
+            return []
+
+        paths = []
+        for entry in matching_entries:
+            path = os.path.join(dir_path, entry.name)
+            if file_stats is not None:
+                # on Windows, the details come for free with the directory entry,
+                # elsewhere this is the only stat call made for the file:
+                try:
+                    file_stats[path] = file_stat(entry.stat())
+                except OSError:
+                    file_stats[path] = None
+            paths.append(path)
+        return paths
+
+    @classmethod
+    def _map(cls, func, items):
+        """
+        Run the function for each item, in parallel if there is more than one item.
+
+        :param func:    The callable to run
+        :param items:   A list of items to run the callable for
+        :returns:       A list of results, in the same order as the items
+        """
+        if len(items) < 2:
+            return [func(item) for item in items]
+        return list(cls._get_executor().map(func, items))
+
+    @classmethod
+    def _get_executor(cls):
+        """
+        :returns:   The thread pool shared by all walkers
+        """
+        with cls._executor_lock:
+            if cls._executor is None:
+                cls._executor = ThreadPoolExecutor(max_workers=cls.MAX_WORKERS)
+            return cls._executor
+
+
+def file_stat(stat_result):
+    """
+    Build a FileStat from the result of a stat call.
+
+    :param stat_result: An os.stat_result instance
+    :returns:           A FileStat instance
+    """
+    uid = None if sgtk.util.is_windows() else stat_result.st_uid
+    return FileStat(stat_result.st_mtime, uid, stat_result.st_size)
@@ -0,0 +1,328 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Process-wide cache of the thumbnails displayed for files.
+"""
+
+from collections import OrderedDict
+
+import sgtk
+from sgtk.platform.qt import QtCore, QtGui
+
+
+class ThumbnailCache(QtCore.QObject):
+    """
+    Memory-bounded cache of thumbnail pixmaps shared by all file models, keyed by the thumbnail
+    url or path of the files.  Files that share a thumbnail share a single pixmap and a single
+    download: only the first request for a thumbnail is started while later ones just wait for
+    the thumbnail_loaded signal.  If the first request is cancelled, the thumbnail_cancelled
+    signal is emitted instead so that the requests still waiting for the thumbnail can start a
+    new download.
+
+    Pixmaps are evicted, least recently used first, once they use more memory than the budget
+    set by the thumbnail_cache_memory_budget setting.  The path on disk each thumbnail was
+    downloaded to is kept so evicted pixmaps are regenerated from disk the next time they are
+    needed.
+
+    QPixmaps can only be used in the main thread so, unlike the other caches, this cache must
+    only be used from the main thread.
+    """
+
+    # default memory budget in megabytes, see the thumbnail_cache_memory_budget setting:
+    DEFAULT_MEMORY_BUDGET = 128
+
+    # Signal emitted when loading a thumbnail has finished, whether it was loaded successfully
+    # or not.  Use contains() to check if it was.
+    thumbnail_loaded = QtCore.Signal(object)  # thumbnail key
+    # Signal emitted when loading a thumbnail was cancelled before it finished.
+    thumbnail_cancelled = QtCore.Signal(object)  # thumbnail key
+
+    def __init__(self, memory_budget=None, parent=None):
+        """
+        Construction
+
+        :param memory_budget:   The maximum memory, in bytes, used by the cached pixmaps.  If None
+                                then the budget is read from the current app's settings.
+        :param parent:          The parent QObject for this instance
+        """
+        QtCore.QObject.__init__(self, parent)
+        self._memory_budget = memory_budget
+        # self._pixmaps[key] = (QPixmap, size in bytes), ordered from least to most recently used
+        self._pixmaps = OrderedDict()
+        # self._paths[key] = path on disk the thumbnail was downloaded to
+        self._paths = {}
+        self._loading = set()
+        self._memory_used = 0
+        self.reset_stats()
+
+    def reset_stats(self):
+        """
+        Reset all the counters used to report on the cache.
+        """
+        self._hits = 0
+        self._regenerated = 0
+        self._evicted = 0
+        self._deduplicated = 0
+        self._downloaded = 0
+
+    @property
+    def memory_budget(self):
+        """
+        :returns:   The maximum memory, in bytes, used by the cached pixmaps
+        """
+        if self._memory_budget is None:
+            app = sgtk.platform.current_bundle()
+            budget = app.get_setting(
+                "thumbnail_cache_memory_budget", ThumbnailCache.DEFAULT_MEMORY_BUDGET
+            )
+            self._memory_budget = max(int(budget or 0), 1) * 1024 * 1024
+        return self._memory_budget
+
+    @memory_budget.setter
+    def memory_budget(self, value):
+        """
+        :param value:   The maximum memory, in bytes, used by the cached pixmaps
+        """
+        self._memory_budget = value
+        self._evict()
+
+    @property
+    def memory_used(self):
+        """
+        :returns:   The memory, in bytes, currently used by the cached pixmaps
+        """
+        return self._memory_used
+
+    @property
+    def num_pixmaps(self):
+        """
+        :returns:   The number of pixmaps currently held in memory
+        """
+        return len(self._pixmaps)
+
+    def contains(self, key):
+        """
+        :param key: The thumbnail url or path
+        :returns:   True if the thumbnail has been loaded, even if its pixmap has since been
+                    evicted from memory
+        """
+        return key in self._pixmaps or key in self._paths
+
+    def is_loading(self, key):
+        """
+        :param key: The thumbnail url or path
+        :returns:   True if the thumbnail is currently being downloaded
+        """
+        return key in self._loading
+
+    def begin_loading(self, key):
+        """
+        Register that a thumbnail is needed.
+
+        :param key: The thumbnail url or path
+        :returns:   True if the caller should download the thumbnail and then call add() or
+                    stop_loading() or cancel_loading(), False if the thumbnail has already been loaded or is being
+                    downloaded for another request, in which case the caller should wait for the
+                    thumbnail_loaded signal.
+        """
+        if self.contains(key):
+            return False
+        if key in self._loading:
+            self._deduplicated += 1
+            return False
+        self._loading.add(key)
+        return True
+
+    def stop_loading(self, key):
+        """
+        Register that a thumbnail download has failed.
+
+        :param key: The thumbnail url or path
+        """
+        if key in self._loading:
+            self._loading.discard(key)
+            self.thumbnail_loaded.emit(key)
+
+    def cancel_loading(self, key):
+        """
+        Register that a thumbnail download was cancelled by the request that started it.
+
+        :param key: The thumbnail url or path
+        """
+        if key in self._loading:
+            self._loading.discard(key)
+            self.thumbnail_cancelled.emit(key)
+
+    def add(self, key, path, image=None):
+        """
+        Add a downloaded thumbnail to the cache and notify everything waiting for it.
+
+        :param key:     The thumbnail url or path
+        :param path:    The path on disk the thumbnail was downloaded to
+        :param image:   An optional QImage of the thumbnail that was already loaded
+        :returns:       The QPixmap built for the thumbnail or None if it couldn't be loaded
+        """
+        self._loading.discard(key)
+        thumb = build_thumbnail(image or path) if (image or path) else None
+        if thumb:
+            self._downloaded += 1
+            if path:
+                self._paths[key] = path
+            self._insert(key, thumb)
+        self.thumbnail_loaded.emit(key)
+        return thumb
+
+    def get(self, key):
+        """
+        Get the pixmap for a thumbnail, regenerating it from disk if it was evicted.
+
+        :param key: The thumbnail url or path
+        :returns:   A QPixmap or None if the thumbnail hasn't been loaded
+        """
+        entry = self._pixmaps.get(key)
+        if entry:
+            self._pixmaps.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+        path = self._paths.get(key)
+        if not path:
+            return None
+        thumb = build_thumbnail(path)
+        if not thumb:
+            # the file on disk has gone so forget about it:
+            del self._paths[key]
+            return None
+        self._regenerated += 1
+        self._insert(key, thumb)
+        return thumb
+
+    def clear(self):
+        """
+        Remove all thumbnails from the cache.
+        """
+        self._pixmaps = OrderedDict()
+        self._paths = {}
+        self._memory_used = 0
+
+    def report(self):
+        """
+        :returns:   A string summarizing the state of the cache
+        """
+        return (
+            "Thumbnail cache: %d pixmaps using %0.1fMb of %0.1fMb, %d downloaded, %d requests "
+            "de-duplicated, %d hits, %d evicted, %d regenerated from disk"
+            % (
+                len(self._pixmaps),
+                self._memory_used / (1024.0 * 1024.0),
+                self.memory_budget / (1024.0 * 1024.0),
+                self._downloaded,
+                self._deduplicated,
+                self._hits,
+                self._evicted,
+                self._regenerated,
+            )
+        )
+
+    def _insert(self, key, thumb):
+        """
+        Insert a pixmap as the most recently used one and evict old pixmaps if needed.
+
+        :param key:     The thumbnail url or path
+        :param thumb:   The QPixmap to insert
+        """
+        entry = self._pixmaps.pop(key, None)
+        if entry:
+            self._memory_used -= entry[1]
+        size = thumb.width() * thumb.height() * max(thumb.depth(), 8) // 8
+        self._pixmaps[key] = (thumb, size)
+        self._memory_used += size
+        self._evict()
+
+    def _evict(self):
+        """
+        Evict the least recently used pixmaps until the cache is within its memory budget.  The
+        most recently used pixmap is always kept.
+        """
+        budget = self.memory_budget
+        while self._memory_used > budget and len(self._pixmaps) > 1:
+            _, (_, size) = self._pixmaps.popitem(last=False)
+            self._memory_used -= size
+            self._evicted += 1
+
+
+def build_thumbnail(thumb_path_or_image):
+    """
+    Build a thumbnail from the specified path or QImage with uniform dimensions.
+
+    :param thumb_path_or_image: A string representing the path on disk of the thumbnail to load
+                                or a QImage containing the thumbnail to use.
+    :returns:                   A QPixmap of size 576/374 pixels containing the scaled thumbnail
+    """
+    # load the thumbnail
+    thumb = QtGui.QPixmap(thumb_path_or_image)
+    if not thumb or thumb.isNull():
+        return
+
+    # make sure the thumbnail is a good size with the correct aspect ratio:
+    MAX_WIDTH = 576  # 96
+    MAX_HEIGHT = 374  # 64
+    ASPECT = float(MAX_WIDTH) / MAX_HEIGHT
+
+    thumb_sz = thumb.size()
+    thumb_aspect = float(thumb_sz.width()) / thumb_sz.height()
+    max_thumb_sz = QtCore.QSize(MAX_WIDTH, MAX_HEIGHT)
+    if thumb_aspect >= ASPECT:
+        # scale based on width:
+        if thumb_sz.width() > MAX_WIDTH:
+            thumb_sz *= float(MAX_WIDTH) / thumb_sz.width()
+        else:
+            max_thumb_sz *= float(thumb_sz.width()) / MAX_WIDTH
+    else:
+        # scale based on height:
+        if thumb_sz.height() > MAX_HEIGHT:
+            thumb_sz *= float(MAX_HEIGHT) / thumb_sz.height()
+        else:
+            max_thumb_sz *= float(thumb_sz.height()) / MAX_HEIGHT
+
+    if thumb_sz != thumb.size():
+        thumb = thumb.scaled(
+            thumb_sz.width(),
+            thumb_sz.height(),
+            QtCore.Qt.KeepAspectRatio,
+            QtCore.Qt.SmoothTransformation,
+        )
+
+    # create base pixmap with the correct aspect ratio that the thumbnail will fit in
+    # and fill it with a transparent colour:
+    thumb_base = QtGui.QPixmap(max_thumb_sz)
+    thumb_base.fill(QtGui.QColor(QtCore.Qt.transparent))
+
+    # create a painter to paint into this pixmap:
+    painter = QtGui.QPainter(thumb_base)
+    try:
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+
+        # paint the thumbnail into this base making sure it's centered:
+        diff = max_thumb_sz - thumb.size()
+        offset = diff / 2
+        brush = QtGui.QBrush(thumb)
+        painter.setBrush(brush)
+        painter.translate(offset.width(), offset.height())
+        painter.drawRect(0, 0, thumb.width(), thumb.height())
+    finally:
+        painter.end()
+
+    return thumb_base
+
+
+# single global instance of the thumbnail cache
+g_thumbnail_cache = ThumbnailCache()
@@ -34,6 +34,7 @@ class UserCache(Threaded):
         self._user_details_by_id = {}
 
         self._sg_fields = ["id", "type", "email", "login", "name", "image"]
+        self._user_login_hook = None
 
     @property
     def current_user(self):
@@ -105,31 +106,153 @@ class UserCache(Threaded):
 
         return user_details
 
-    def get_file_last_modified_user(self, path):
+    def get_user_details_for_field_values(self, field_name, values):
+        """
+        Get the user details for all users whose field matches one of the supplied values.  Users
+        that haven't been looked up before are found with a single Shotgun query.
+
+        :param field_name:  The HumanUser field to match the values against, e.g. 'login'
+        :param values:      The field values of the users whose details should be returned.
+                            String values are matched case-insensitively, like Shotgun does.
+        :returns:           A dictionary of value->Shotgun entity dictionary.  Values that don't
+                            match a user are omitted.
+        """
+        values = set(values or [])
+        if not values:
+            # nothing to look for!
+            return {}
+
+        if field_name == "id":
+            users = self.get_user_details_for_ids(values)
+        elif field_name == "login":
+            users = self._get_user_details_for_logins(values)
+        else:
+            # users are only cached by login & id so look them up directly:
+            users = {}
+            query_fields = list(self._sg_fields)
+            if field_name not in query_fields:
+                query_fields.append(field_name)
+            try:
+                sg_users = self._app.shotgun.find(
+                    "HumanUser", [[field_name, "in", list(values)]], query_fields
+                )
+            except Exception as e:
+                # this isn't critical so just log as debug
+                self._app.log_debug(
+                    "Failed to retrieve PTR users for %s values %s: %s"
+                    % (field_name, ", ".join(sorted(str(v) for v in values)), e)
+                )
+                sg_users = []
+            # values_by_key[normalized value] = [requested values]
+            values_by_key = {}
+            for value in values:
+                values_by_key.setdefault(self._get_value_key(value), []).append(value)
+            for sg_user in sg_users:
+                matching_values = values_by_key.get(
+                    self._get_value_key(sg_user.get(field_name))
+                )
+                if field_name not in self._sg_fields:
+                    # only keep the fields users are cached with:
+                    del sg_user[field_name]
+                if matching_values:
+                    self._cache_user(sg_user["login"], sg_user["id"], sg_user)
+                    for value in matching_values:
+                        users[value] = sg_user
+
+        # only return users that actually exist:
+        return dict(
+            (value, user)
+            for value, user in users.items()
+            if user and user.get("id") is not None
+        )
+
+    @staticmethod
+    def _get_value_key(value):
+        """
+        :param value:   A HumanUser field value
+        :returns:       The key used to match the value case-insensitively
+        """
+        return value.lower() if isinstance(value, str) else value
+
+    def get_file_last_modified_user(self, path, uid=None):
         """
         Get the user details of the last person to modify the specified file.
 
         :param path:    The path to find the last modified user for
+        :param uid:     The owner uid of the file if it is already known.  This is passed on to the
+                        hook so that it doesn't need to stat the file again.
         :returns:       A  Shotgun entity dictionary for the HumanUser that last modified the path
         """
+        return self.get_files_last_modified_users([path], {path: uid}).get(path)
 
-        # Execute hook for getting user login.
-        try:
-            login_name = self._app.execute_hook_method(
-                "user_login_hook",
-                "get_login",
-                path=path,
-            )
-        except Exception:
-            self._app.logger.warning(
-                "Exception raised when executing hook for work file at %s" % path,
-                exc_info=True,
+    def get_files_last_modified_users(self, paths, uids=None):
+        """
+        Get the user details of the last person to modify each of the specified files.  The
+        logins for all files are retrieved with a single hook call and all users that haven't
+        been looked up before are then found with a single Shotgun query.
+
+        :param paths:   The list of paths to find the last modified users for
+        :param uids:    An optional dictionary of {path:uid} containing the owner uid of files
+                        that are already known.  These are passed on to the hook so that it
+                        doesn't need to stat the files again.
+        :returns:       A dictionary of {path:user} where user is a Shotgun entity dictionary for
+                        the HumanUser that last modified the path or None if it couldn't be found.
+        """
+        if not paths:
+            return {}
+
+        logins = self._get_logins(paths, uids)
+        users_by_login = self._get_user_details_for_logins(
+            set(login for login in logins.values() if login)
+        )
+        return dict(
+            (path, users_by_login.get(logins.get(path)) if logins.get(path) else None)
+            for path in paths
+        )
+
+    def _get_logins(self, paths, uids=None):
+        """
+        Run the user login hook to get the login of the last person to modify each file.
+
+        :param paths:   The list of paths to get the logins for
+        :param uids:    An optional dictionary of {path:uid} containing known owner uids
+        :returns:       A dictionary of {path:login}
+        """
+        uids = dict((p, u) for p, u in (uids or {}).items() if u is not None)
+        if self._user_login_hook is None:
+            self._user_login_hook = self._app.create_hook_instance(
+                self._app.get_setting("user_login_hook")
             )
-        else:
-            if login_name:
-                return self._get_user_details_for_login(login_name)
 
-        return None
+        # configured hooks may not implement the batch method, in which case the hook is
+        # called for each file instead:
+        if hasattr(self._user_login_hook, "get_logins"):
+            try:
+                logins = self._user_login_hook.get_logins(paths=paths, uids=uids)
+                return logins if isinstance(logins, dict) else {}
+            except Exception:
+                self._app.logger.warning(
+                    "Exception raised when executing hook for %d work files"
+                    % len(paths),
+                    exc_info=True,
+                )
+                return {}
+
+        logins = {}
+        for path in paths:
+            hook_kwargs = {"path": path}
+            if path in uids:
+                hook_kwargs["uid"] = uids[path]
+
+            # Execute hook for getting user login.
+            try:
+                logins[path] = self._user_login_hook.get_login(**hook_kwargs)
+            except Exception:
+                self._app.logger.warning(
+                    "Exception raised when executing hook for work file at %s" % path,
+                    exc_info=True,
+                )
+        return logins
 
     def _get_user_details_for_login(self, login_name):
         """
@@ -138,34 +261,71 @@ class UserCache(Threaded):
         :param login_name:  The login name of the user to find
         :returns:           A Shotgun entity dictionary for the HumanUser entity found
         """
-        # first look to see if we've already found the user:
-        sg_user = self._get_user_for_login(login_name)
-        if not sg_user:
-            # have to do a Shotgun lookup:
-            try:
-                sg_user = self._app.shotgun.find_one(
-                    "HumanUser", [["login", "is", login_name]], self._sg_fields
-                )
-                # handle sg_user being None
-                # create a minimal object with the OS session login.
-                sg_user = sg_user or {
-                    "type": "HumanUser",
-                    "id": None,
-                    "email": None,
-                    "login": login_name,
-                    "name": "%s (System)" % login_name,
-                    "image": None,
-                }
-            except Exception as e:
-                # this isn't critical so just log as debug
-                self._app.log_debug(
-                    "Failed to retrieve PTR user for login '%s': %s" % (login_name, e)
-                )
+        return self._get_user_details_for_logins([login_name]).get(login_name)
+
+    def _get_user_details_for_logins(self, login_names):
+        """
+        Get the shotgun HumanUser entries for the specified login names.  Any users that haven't
+        been looked up before are found with a single Shotgun query.
+
+        :param login_names: The login names of the users to find
+        :returns:           A dictionary of {login:user} where user is a Shotgun entity dictionary
+                            for the HumanUser entity found.  Logins that couldn't be looked up are
+                            omitted.
+        """
+        # first look to see if we've already found the users:
+        users_by_login = {}
+        logins_to_fetch = set()
+        for login_name in login_names:
+            sg_user = self._get_user_for_login(login_name)
+            if sg_user:
+                users_by_login[login_name] = sg_user
+            else:
+                logins_to_fetch.add(login_name)
+
+        if not logins_to_fetch:
+            return users_by_login
+
+        # have to do a Shotgun lookup:
+        try:
+            sg_users = self._app.shotgun.find(
+                "HumanUser",
+                [["login", "in", list(logins_to_fetch)]],
+                self._sg_fields,
+            )
+        except Exception as e:
+            # this isn't critical so just log as debug
+            self._app.log_debug(
+                "Failed to retrieve PTR users for logins %s: %s"
+                % (", ".join(sorted(logins_to_fetch)), e)
+            )
+            return users_by_login
+
+        # logins are matched case-insensitively by Shotgun so the login of a user found can
+        # differ in case from the login it was found for:
+        sg_users_by_login = dict(
+            (sg_user["login"].lower(), sg_user)
+            for sg_user in sg_users
+            if sg_user.get("login")
+        )
+
+        for login_name in logins_to_fetch:
+            # handle users that weren't found by creating a minimal
+            # object with the OS session login.
+            sg_user = sg_users_by_login.get(login_name.lower()) or {
+                "type": "HumanUser",
+                "id": None,
+                "email": None,
+                "login": login_name,
+                "name": "%s (System)" % login_name,
+                "image": None,
+            }
+            users_by_login[login_name] = sg_user
 
             # cache the sg user so we don't have to look for it again
             self._cache_user(login_name, sg_user.get("id"), sg_user)
 
-        return sg_user
+        return users_by_login
 
     @Threaded.exclusive
     def _get_user_for_id(self, user_id):
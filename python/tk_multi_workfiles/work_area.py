@@ -13,11 +13,16 @@ Environment and context abstraction.
 """
 
 import copy
+from collections import OrderedDict
+
 import sgtk
 from sgtk import TankError
 
 from .user_cache import g_user_cache
 from .util import Threaded, get_template_user_keys
+from .template_field_parser import TemplateFieldParser
+from .template_walker import TemplateWalker
+from .work_area_settings_cache import g_work_area_settings_cache
 
 
 class WorkArea(object):
@@ -31,29 +36,56 @@ class WorkArea(object):
 
     class _SettingsCache(Threaded):
         """
-        Cache of settings per context.
+        Bounded cache of settings per context.  Settings are indexed by a signature built from
+        the context's entities and the current engine instance, the least recently used entries
+        are evicted once the cache is full.
         """
 
+        # maximum number of contexts to cache settings for:
+        MAX_SIZE = 256
+
         def __init__(self):
             """
             Constructor.
             """
             Threaded.__init__(self)
-            self._cache = []
+            # self._cache[context signature] = settings
+            self._cache = OrderedDict()
+            self._hits = 0
+            self._misses = 0
+
+        @property
+        def hits(self):
+            """
+            :returns: The number of lookups that found settings in the cache.
+            """
+            return self._hits
+
+        @property
+        def misses(self):
+            """
+            :returns: The number of lookups that didn't find settings in the cache.
+            """
+            return self._misses
 
         @Threaded.exclusive
         def get(self, context):
             """
-            Retrieve the cached settings for a given context.
+            Retrieve the cached settings for a given context.  The settings returned are
+            shared and must not be modified.
 
             :param context: The context for which we desire settings.
 
             :returns: The settings dictionary or None
             """
-            for ctx, settings in self._cache:
-                if ctx == context:
-                    return settings
-            return None
+            key = self._get_signature(context)
+            settings = self._cache.get(key)
+            if settings is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._cache.move_to_end(key)
+            return settings
 
         @Threaded.exclusive
         def add(self, context, settings):
@@ -63,7 +95,44 @@ class WorkArea(object):
             :param context: Context for which these settings need to be cached.
             :param settings: Settings to cache.
             """
-            self._cache.append((context, copy.deepcopy(settings)))
+            key = self._get_signature(context)
+            self._cache[key] = copy.deepcopy(settings)
+            self._cache.move_to_end(key)
+            while len(self._cache) > WorkArea._SettingsCache.MAX_SIZE:
+                self._cache.popitem(last=False)
+
+        @Threaded.exclusive
+        def clear(self):
+            """
+            Clear the cache and reset the hit & miss counters.
+            """
+            self._cache = OrderedDict()
+            self._hits = 0
+            self._misses = 0
+
+        @staticmethod
+        def _get_signature(context):
+            """
+            Build a hashable signature for a context.
+
+            :param context: The context to build the signature for.
+
+            :returns: A tuple uniquely identifying the context in the current engine.
+            """
+
+            def entity_key(entity):
+                return (entity["type"], entity["id"]) if entity else None
+
+            engine = sgtk.platform.current_engine()
+            return (
+                engine.instance_name if engine else None,
+                entity_key(context.project),
+                entity_key(context.entity),
+                entity_key(context.step),
+                entity_key(context.task),
+                entity_key(context.user),
+                tuple(sorted(entity_key(e) for e in context.additional_entities or [])),
+            )
 
     _settings_cache = _SettingsCache()
 
@@ -87,6 +156,10 @@ class WorkArea(object):
         self.publish_area_template = None
         self.publish_template = None
 
+        # compiled field parsers for the work & publish templates, built on demand:
+        self._work_field_parser = None
+        self._publish_field_parser = None
+
         # context-specific settings:
         self.save_as_default_name = ""
         self.save_as_prefer_version_up = False
@@ -121,6 +194,8 @@ class WorkArea(object):
         user_work_area.work_template = self.work_template
         user_work_area.publish_area_template = self.publish_area_template
         user_work_area.publish_template = self.publish_template
+        user_work_area._work_field_parser = self._work_field_parser
+        user_work_area._publish_field_parser = self._publish_field_parser
         user_work_area.save_as_default_name = self.save_as_default_name
         user_work_area.save_as_prefer_version_up = self.save_as_prefer_version_up
         user_work_area.version_compare_ignore_fields = copy.deepcopy(
@@ -136,6 +211,35 @@ class WorkArea(object):
 
         return user_work_area
 
+    @property
+    def work_field_parser(self):
+        """
+        :returns:   A TemplateFieldParser for the work template or None if there is no work template.
+        """
+        if not self.work_template:
+            return None
+        if (
+            not self._work_field_parser
+            or self._work_field_parser.template is not self.work_template
+        ):
+            self._work_field_parser = TemplateFieldParser(self.work_template)
+        return self._work_field_parser
+
+    @property
+    def publish_field_parser(self):
+        """
+        :returns:   A TemplateFieldParser for the publish template or None if there is no publish
+                    template.
+        """
+        if not self.publish_template:
+            return None
+        if (
+            not self._publish_field_parser
+            or self._publish_field_parser.template is not self.publish_template
+        ):
+            self._publish_field_parser = TemplateFieldParser(self.publish_template)
+        return self._publish_field_parser
+
     # @property
     def _get_context(self):
         return self._context
@@ -211,12 +315,15 @@ class WorkArea(object):
                 user_ids.add(user_id)
         return sandbox_users
 
-    def resolve_user_sandboxes(self):
+    def resolve_user_sandboxes(self, cancel_token=None):
         """
         Caches internally the list of user sandboxes.
+
+        :param cancel_token:    Optional CancellationToken used to stop looking for sandboxes
+                                on disk when the search that needs them is stopped.
         """
-        self._resolve_user_sandboxes(self.work_template)
-        self._resolve_user_sandboxes(self.publish_template)
+        self._resolve_user_sandboxes(self.work_template, cancel_token)
+        self._resolve_user_sandboxes(self.publish_template, cancel_token)
 
     # ------------------------------------------------------------------------------------------
     # Protected methods
@@ -385,14 +492,7 @@ class WorkArea(object):
 
         if app_settings is None:
             try:
-                # find settings for all instances of app in the environment picked for the given context:
-                app_settings = sgtk.platform.find_app_settings(
-                    app.engine.name,
-                    app.name,
-                    app.sgtk,
-                    context,
-                    app.engine.instance_name,
-                )
+                app_settings = self._find_app_settings(app, context)
             finally:
                 # Ignore any errors while looking for the settings
                 WorkArea._settings_cache.add(context, app_settings or {})
@@ -424,11 +524,76 @@ class WorkArea(object):
 
         return None
 
-    def _resolve_user_sandboxes(self, template):
+    def _find_app_settings(self, app, context):
+        """
+        Find the settings for all instances of the app in the environment picked for the given
+        context.  If enabled, the settings found for each environment are cached on disk so that
+        the environment doesn't need to be resolved again in later sessions.
+
+        Note that, unlike `sgtk.platform.find_app_settings`, the settings found for an environment
+        are then not validated against each context they are used for.  Configuration problems
+        that validation would report, e.g. missing template keys, only show up when the templates
+        are used.  Disable the cache_work_area_settings setting to validate them for each context.
+
+        :param app: Application instance
+        :param context: Context in which to look for settings.
+
+        :returns: The list of app settings as returned by `sgtk.platform.find_app_settings`.
+        """
+        env_name = None
+        if app.get_setting("cache_work_area_settings", False):
+            env_name = app.sgtk.execute_core_hook("pick_environment", context=context)
+        if not env_name:
+            return sgtk.platform.find_app_settings(
+                app.engine.name,
+                app.name,
+                app.sgtk,
+                context,
+                app.engine.instance_name,
+            )
+
+        app_settings = g_work_area_settings_cache.get(
+            env_name, app.engine.instance_name, app.name
+        )
+        if app_settings is not None:
+            return app_settings
+
+        # the environment has already been picked so read the settings from it directly rather
+        # than having find_app_settings pick it again:
+        env = app.sgtk.pipeline_configuration.get_environment(env_name, context)
+        app_settings = []
+        for engine_instance in env.get_engines():
+            if engine_instance != app.engine.instance_name:
+                continue
+            if (
+                env.get_engine_descriptor(engine_instance).system_name
+                != app.engine.name
+            ):
+                continue
+            for app_instance in env.get_apps(engine_instance):
+                app_descriptor = env.get_app_descriptor(engine_instance, app_instance)
+                if app_descriptor.system_name != app.name:
+                    continue
+                app_settings.append(
+                    {
+                        "env_instance": env,
+                        "engine_instance": engine_instance,
+                        "app_instance": app_instance,
+                        "settings": env.get_app_settings(engine_instance, app_instance),
+                    }
+                )
+
+        g_work_area_settings_cache.add(
+            env_name, app.engine.instance_name, app.name, app_settings
+        )
+        return app_settings
+
+    def _resolve_user_sandboxes(self, template, cancel_token=None):
         """
         Resolves user sandboxes on disk for a given template. Caches the result.
 
         :param template: Template for which to cache the users.
+        :param cancel_token: Optional CancellationToken checked while walking the sandboxes.
 
         :returns: List of users in the given sandbox.
         """
@@ -488,21 +653,57 @@ class WorkArea(object):
                 # this is bad - assume we can't perform a search!
                 return []
 
-        # ok, so lets search for paths that match the template:
-        app = sgtk.platform.current_bundle()
-        paths = app.sgtk.paths_from_template(search_template, ctx_fields, user_keys)
-
-        # split out users from the list of paths:
-        user_ids = set()
+        # ok, so lets search for paths that match the template.  If the search fails, e.g.
+        # because it was cancelled, nothing is cached so the sandboxes are resolved next time:
+        try:
+            paths = TemplateWalker(
+                search_template, cancel_token=cancel_token
+            ).paths_from_template(ctx_fields, user_keys)
+        except Exception:
+            del self._sandbox_users[template.definition]
+            raise
+
+        # split out the user key values from the list of paths, grouped by the user
+        # field they represent so that the users can be looked up in bulk:
+        values_by_field = {}
+        unresolved_paths = []
         for path in paths:
-            # to find the user, we have to construct a context
-            # from the path and then inspect the user from this
-            path_ctx = app.sgtk.context_from_path(path)
-            user = path_ctx.user
-            if user:
-                user_ids.add(user["id"])
+            try:
+                fields = search_template.get_fields(path)
+            except TankError:
+                continue
+            for key_name in user_keys:
+                value = fields.get(key_name)
+                if value is None:
+                    continue
+                field_name = search_template.keys[key_name].shotgun_field_name
+                if field_name:
+                    values_by_field.setdefault(field_name, set()).add(value)
+                else:
+                    unresolved_paths.append(path)
 
         # look these up in the user cache:
-        users = list(g_user_cache.get_user_details_for_ids(user_ids).values())
+        users_by_id = {}
+        for field_name, values in values_by_field.items():
+            users = g_user_cache.get_user_details_for_field_values(field_name, values)
+            for user in users.values():
+                users_by_id[user["id"]] = user
+
+        # the user for keys that don't map to a user field can only be found by
+        # constructing a context from the path and then inspecting the user:
+        if unresolved_paths:
+            app = sgtk.platform.current_bundle()
+            user_ids = set()
+            for path in unresolved_paths:
+                user = app.sgtk.context_from_path(path).user
+                if user and user["id"] not in users_by_id:
+                    user_ids.add(user["id"])
+            for user_id, user in g_user_cache.get_user_details_for_ids(
+                user_ids
+            ).items():
+                if user:
+                    users_by_id[user_id] = user
+
+        users = list(users_by_id.values())
         self._sandbox_users[template.definition] = users
         return users
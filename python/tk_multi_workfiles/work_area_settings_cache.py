@@ -0,0 +1,214 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Persistent cache of the app settings found in each environment of the pipeline configuration.
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+
+import sgtk
+
+from .util import Threaded
+
+
+class WorkAreaSettingsCache(Threaded):
+    """
+    Cache of the app settings found for each environment, stored as a JSON file in the app's
+    cache location so that the environment configuration doesn't need to be resolved again in
+    subsequent sessions.
+
+    The app settings found in an environment only depend on the environment files so the cache
+    is keyed on the environment name returned by the pick_environment core hook.  The whole
+    cache is discarded when the pipeline configuration descriptor, or the modification time of
+    any of its environment files, changes.
+
+    Only the serializable keys of the app settings are stored, the Environment instance returned
+    by `sgtk.platform.find_app_settings` is dropped.
+    """
+
+    # Bump this if the format of the cache changes so that stale caches are discarded.
+    FORMAT_VERSION = 2
+
+    # keys of the app settings that are cached:
+    CACHED_KEYS = ("engine_instance", "app_instance", "settings")
+
+    def __init__(self, cache_path=None):
+        """
+        Construction
+
+        :param cache_path:  Path of the JSON file to use.  If None then the file will be stored
+                            in the current app's cache location.
+        """
+        Threaded.__init__(self)
+        self._cache_path = cache_path
+        self._fingerprint = None
+        self._entries = None
+
+    @Threaded.exclusive
+    def get(self, env_name, engine_instance_name, app_name):
+        """
+        Get the app settings cached for an environment.
+
+        :param env_name:                The name of the environment
+        :param engine_instance_name:    The name of the engine instance the app runs in
+        :param app_name:                The name of the app
+        :returns:                       The list of app settings, as returned by
+                                        `sgtk.platform.find_app_settings`, or None if the
+                                        environment hasn't been cached.
+        """
+        entries = self._load()
+        return entries.get(self._entry_key(env_name, engine_instance_name, app_name))
+
+    @Threaded.exclusive
+    def add(self, env_name, engine_instance_name, app_name, app_settings):
+        """
+        Cache the app settings found for an environment.  Settings that can't be serialized are
+        not cached.
+
+        :param env_name:                The name of the environment
+        :param engine_instance_name:    The name of the engine instance the app runs in
+        :param app_name:                The name of the app
+        :param app_settings:            The list of app settings found for the environment
+        """
+        entries = self._load()
+        app_settings = [
+            dict(
+                (k, settings[k])
+                for k in WorkAreaSettingsCache.CACHED_KEYS
+                if k in settings
+            )
+            for settings in app_settings or []
+        ]
+        try:
+            # make sure the settings round trip so that what's read back is what was found:
+            app_settings = json.loads(json.dumps(app_settings))
+        except (TypeError, ValueError):
+            return
+        entries[self._entry_key(env_name, engine_instance_name, app_name)] = (
+            app_settings
+        )
+        self._save(entries)
+
+    @Threaded.exclusive
+    def clear(self):
+        """
+        Remove everything from the cache.
+        """
+        self._entries = {}
+        self._save(self._entries)
+
+    @staticmethod
+    def _entry_key(env_name, engine_instance_name, app_name):
+        """
+        :returns:   The key of the cache entry for an environment, engine instance and app
+        """
+        return "%s:%s:%s" % (env_name, engine_instance_name, app_name)
+
+    def _get_cache_path(self):
+        """
+        :returns:   The path of the cache file
+        """
+        if not self._cache_path:
+            app = sgtk.platform.current_bundle()
+            self._cache_path = os.path.join(
+                app.cache_location, "work_area_settings.json"
+            )
+        return self._cache_path
+
+    def _get_fingerprint(self):
+        """
+        Compute the fingerprint of the pipeline configuration used to invalidate the cache.  This
+        is only computed once per session.
+
+        :returns:   A string identifying the current state of the pipeline configuration
+        """
+        if self._fingerprint:
+            return self._fingerprint
+
+        app = sgtk.platform.current_bundle()
+        pipeline_config = app.sgtk.pipeline_configuration
+        parts = [WorkAreaSettingsCache.FORMAT_VERSION, pipeline_config.get_path()]
+        descriptor = getattr(app.sgtk, "configuration_descriptor", None)
+        if descriptor:
+            parts.append(descriptor.get_uri())
+
+        env_root = os.path.join(pipeline_config.get_config_location(), "env")
+        env_files = []
+        for dir_path, _, file_names in os.walk(env_root):
+            for file_name in file_names:
+                if not file_name.endswith(".yml"):
+                    continue
+                path = os.path.join(dir_path, file_name)
+                try:
+                    env_files.append((path, os.stat(path).st_mtime))
+                except OSError:
+                    continue
+        parts.append(sorted(env_files))
+
+        self._fingerprint = hashlib.sha1(json.dumps(parts).encode("utf-8")).hexdigest()
+        return self._fingerprint
+
+    def _load(self):
+        """
+        Load the cache entries from disk if they haven't been loaded yet.  Entries cached for a
+        different pipeline configuration fingerprint are discarded.  Must be called with the lock
+        held.
+
+        :returns:   A dictionary of {entry key:app settings}
+        """
+        if self._entries is not None:
+            return self._entries
+
+        self._entries = {}
+        try:
+            with open(self._get_cache_path(), "r") as cache_file:
+                data = json.load(cache_file)
+        except (OSError, ValueError):
+            # no cache or the cache is corrupt, either way it will be re-created:
+            return self._entries
+
+        if (
+            isinstance(data, dict)
+            and data.get("fingerprint") == self._get_fingerprint()
+        ):
+            self._entries = data.get("entries") or {}
+        return self._entries
+
+    def _save(self, entries):
+        """
+        Write the cache entries to disk.  The file is replaced atomically so that other sessions
+        never read a partially written cache.  Must be called with the lock held.
+
+        :param entries: A dictionary of {entry key:app settings}
+        """
+        cache_path = self._get_cache_path()
+        try:
+            cache_dir = os.path.dirname(cache_path)
+            if cache_dir and not os.path.exists(cache_dir):
+                os.makedirs(cache_dir)
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir or None, suffix=".tmp")
+            with os.fdopen(fd, "w") as cache_file:
+                json.dump(
+                    {"fingerprint": self._get_fingerprint(), "entries": entries},
+                    cache_file,
+                )
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            # this isn't critical, settings will just be resolved again next time:
+            app = sgtk.platform.current_bundle()
+            app.log_debug("Failed to write the work area settings cache: %s" % e)
+
+
+# single global instance of the work area settings cache
+g_work_area_settings_cache = WorkAreaSettingsCache()
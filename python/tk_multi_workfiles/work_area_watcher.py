@@ -0,0 +1,371 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Watcher used to detect changes to the directories containing work files.
+"""
+
+import os
+import time
+import threading
+
+import sgtk
+from sgtk.platform.qt import QtCore
+
+
+class WorkAreaWatcher(QtCore.QObject):
+    """
+    Watches the directories containing the work files of a set of groups and emits the
+    work_area_changed signal whenever the contents of one of these directories change.
+
+    On Linux, directories are watched with a QFileSystemWatcher which uses inotify.  As inotify
+    isn't available on all platforms, directories the native watcher doesn't watch are polled
+    for modification time changes from a background thread.  Files modified in place don't
+    change the modification time of their directory, and inotify doesn't report changes made by
+    other hosts on network file systems, so the modification time and size of every file in all
+    watched directories is also compared, on a much longer interval.  Changes are coalesced for
+    a short time before being reported so that a single save only results in a single
+    notification.
+    """
+
+    # interval in seconds between two polls of the modification time of the watched directories:
+    POLL_INTERVAL = 0.5
+
+    # interval in seconds between two scans of the files in the watched directories:
+    FILE_SCAN_INTERVAL = 10.0
+
+    # time in milliseconds changes are coalesced for before being reported:
+    _COALESCE_INTERVAL = 100
+
+    # Signals
+    work_area_changed = QtCore.Signal(
+        object, object, object
+    )  # group key, WorkArea, directory
+    _directories_changed = QtCore.Signal(object)  # list of directories
+
+    def __init__(self, parent=None):
+        """
+        :param parent:  The parent QObject for this instance
+        """
+        QtCore.QObject.__init__(self, parent)
+
+        self._lock = threading.Lock()
+        # self._watched_groups[group_key] = (WorkArea, set(directories))
+        self._watched_groups = {}
+        # self._directory_signatures[directory] = (directory mtime, signature of its files)
+        self._directory_signatures = {}
+        # directories whose signature must be computed again, without reporting a change, by
+        # the poller thread:
+        self._resync_directories = set()
+        # directories watched by the native watcher, which don't need their mtime polled:
+        self._native_directories = set()
+
+        self._pending_directories = set()
+        self._coalesce_timer = QtCore.QTimer(self)
+        self._coalesce_timer.setSingleShot(True)
+        self._coalesce_timer.setInterval(WorkAreaWatcher._COALESCE_INTERVAL)
+        self._coalesce_timer.timeout.connect(self._on_coalesce_timeout)
+
+        # The poller thread emits this signal, it will be queued and delivered in the main thread:
+        self._directories_changed.connect(self._on_directories_changed)
+
+        self._native_watcher = None
+        if sgtk.util.is_linux():
+            self._native_watcher = QtCore.QFileSystemWatcher(self)
+            self._native_watcher.directoryChanged.connect(
+                lambda path: self._on_directories_changed([path])
+            )
+
+        self._stop_polling = threading.Event()
+        self._poll_thread = None
+
+    def watch(self, group_key, work_area, file_items):
+        """
+        Watch the directories for the specified group.  This replaces any directories previously
+        watched for the group.
+
+        :param group_key:   The unique key of the group to watch
+        :param work_area:   The WorkArea the group represents
+        :param file_items:  The list of FileItems currently in the group.  The directories of all
+                            local files will be watched along with the work area directory.
+        """
+        directories = set(
+            os.path.dirname(f.path) for f in file_items if f.is_local and f.path
+        )
+        work_area_dir = self._get_work_area_directory(work_area)
+        if work_area_dir:
+            directories.add(work_area_dir)
+        self._watch_directories(group_key, work_area, directories)
+
+    def watch_files(self, group_key, work_area, file_items):
+        """
+        Also watch the directories of the specified files for a group, keeping the directories
+        already watched for it.  Directories that no longer contain any files are only stopped
+        being watched when the group is watched again with :meth:`watch`, or unwatched.
+
+        :param group_key:   The unique key of the group to watch
+        :param work_area:   The WorkArea the group represents
+        :param file_items:  A list of FileItems added to, or updated in, the group
+        """
+        directories = set(
+            os.path.dirname(f.path) for f in file_items if f.is_local and f.path
+        )
+        with self._lock:
+            watched = self._watched_groups.get(group_key)
+        if not watched:
+            self.watch(group_key, work_area, file_items)
+            return
+
+        watched_work_area, watched_directories = watched
+        if work_area is not watched_work_area:
+            # the work area may have been rebuilt so make sure its directory is watched:
+            work_area_dir = self._get_work_area_directory(work_area)
+            if work_area_dir:
+                directories.add(work_area_dir)
+        elif directories <= watched_directories:
+            # nothing new to watch:
+            return
+        self._watch_directories(group_key, work_area, directories | watched_directories)
+
+    def _watch_directories(self, group_key, work_area, directories):
+        """
+        Watch the specified directories for a group, replacing any directories previously
+        watched for it.
+
+        :param group_key:   The unique key of the group to watch
+        :param work_area:   The WorkArea the group represents
+        :param directories: The set of directories to watch
+        """
+        with self._lock:
+            self._watched_groups[group_key] = (work_area, directories)
+            for directory in directories:
+                if directory not in self._directory_signatures:
+                    # the initial signature is computed by the poller thread:
+                    self._directory_signatures[directory] = None
+                    self._resync_directories.add(directory)
+        self._update_native_paths()
+
+        if directories and not self._poll_thread:
+            self._poll_thread = threading.Thread(
+                target=self._poll, name="WorkAreaWatcher"
+            )
+            self._poll_thread.daemon = True
+            self._poll_thread.start()
+
+    def unwatch(self, group_key):
+        """
+        Stop watching the directories for the specified group.
+
+        :param group_key:   The unique key of the group to stop watching
+        """
+        with self._lock:
+            if group_key not in self._watched_groups:
+                return
+            del self._watched_groups[group_key]
+            self._directory_signatures = dict(
+                (d, m)
+                for d, m in self._directory_signatures.items()
+                if d in self._get_watched_directories()
+            )
+        self._update_native_paths()
+
+    def clear(self):
+        """
+        Stop watching all directories.
+        """
+        with self._lock:
+            self._watched_groups = {}
+            self._directory_signatures = {}
+            self._resync_directories = set()
+        self._pending_directories = set()
+        self._update_native_paths()
+
+    def shut_down(self):
+        """
+        Stop watching all directories and stop the polling thread.
+        """
+        self.clear()
+        self._coalesce_timer.stop()
+        self._stop_polling.set()
+        if self._poll_thread:
+            self._poll_thread.join(WorkAreaWatcher.POLL_INTERVAL * 2)
+            self._poll_thread = None
+
+    def _get_watched_directories(self):
+        """
+        Must be called with the lock held.
+
+        :returns:   The set of all directories being watched
+        """
+        directories = set()
+        for _, group_directories in self._watched_groups.values():
+            directories.update(group_directories)
+        return directories
+
+    def _update_native_paths(self):
+        """
+        Make sure the native watcher watches exactly the directories that should be watched.
+        """
+        if not self._native_watcher:
+            return
+        with self._lock:
+            directories = self._get_watched_directories()
+        current = set(self._native_watcher.directories())
+        to_remove = current - directories
+        to_add = [d for d in directories - current if os.path.isdir(d)]
+        if to_remove:
+            self._native_watcher.removePaths(list(to_remove))
+        if to_add:
+            # directories that can't be watched, e.g. because the inotify watch limit
+            # was reached, will still be polled:
+            self._native_watcher.addPaths(to_add)
+        native_directories = set(self._native_watcher.directories())
+        with self._lock:
+            self._native_directories = native_directories
+
+    def _poll(self):
+        """
+        Poll the watched directories for changes until asked to stop.
+        Runs in a background thread.
+        """
+        last_file_scan = time.time()
+        while not self._stop_polling.wait(WorkAreaWatcher.POLL_INTERVAL):
+            scan_files = (
+                time.time() - last_file_scan >= WorkAreaWatcher.FILE_SCAN_INTERVAL
+            )
+            if scan_files:
+                last_file_scan = time.time()
+            changed_directories = self._poll_once(scan_files)
+            if changed_directories:
+                self._directories_changed.emit(changed_directories)
+
+    def _poll_once(self, scan_files):
+        """
+        Check the watched directories for changes once.  The files of a directory are only
+        scanned if asked to or if the modification time of the directory changed.
+        Runs in a background thread.
+
+        :param scan_files:  True to compare the files of all watched directories, False to only
+                            poll the modification time of the directories not watched natively
+        :returns:           The list of directories that changed
+        """
+        with self._lock:
+            signatures = dict(self._directory_signatures)
+            resync_directories = self._resync_directories
+            self._resync_directories = set()
+            native_directories = self._native_directories
+
+        changed_directories = []
+        new_signatures = {}
+        for directory, previous_signature in signatures.items():
+            if directory in resync_directories:
+                new_signatures[directory] = self._get_signature(directory)
+                continue
+            if not scan_files:
+                if directory in native_directories:
+                    continue
+                mtime = self._get_mtime(directory)
+                previous_mtime = previous_signature[0] if previous_signature else None
+                if mtime == previous_mtime:
+                    continue
+            signature = self._get_signature(directory)
+            if signature != previous_signature:
+                changed_directories.append(directory)
+                new_signatures[directory] = signature
+
+        # only swap the signatures in for directories that are still watched:
+        with self._lock:
+            for directory, signature in new_signatures.items():
+                if directory in self._directory_signatures:
+                    self._directory_signatures[directory] = signature
+        return changed_directories
+
+    def _on_directories_changed(self, directories):
+        """
+        Slot triggered when some watched directories have changed.  The changes are coalesced
+        before being reported.
+
+        :param directories: The list of directories that changed
+        """
+        self._pending_directories.update(directories)
+        if not self._coalesce_timer.isActive():
+            self._coalesce_timer.start()
+
+    def _on_coalesce_timeout(self):
+        """
+        Report all the changes received since the timer was started.
+        """
+        directories = self._pending_directories
+        self._pending_directories = set()
+
+        with self._lock:
+            # the poller thread will pick up the new signatures of these directories so that
+            # the changes being reported aren't reported again:
+            self._resync_directories.update(
+                d for d in directories if d in self._directory_signatures
+            )
+            watched_groups = list(self._watched_groups.items())
+
+        for group_key, (work_area, group_directories) in watched_groups:
+            for directory in sorted(directories & group_directories):
+                self.work_area_changed.emit(group_key, work_area, directory)
+
+    def _get_work_area_directory(self, work_area):
+        """
+        Resolve the work area directory for the specified work area.
+
+        :param work_area:   The WorkArea to resolve the directory for
+        :returns:           The path to the work area directory or None if it can't be resolved
+        """
+        if not work_area or not work_area.context or not work_area.work_area_template:
+            return None
+        try:
+            fields = work_area.context.as_template_fields(
+                work_area.work_area_template, validate=True
+            )
+            return work_area.work_area_template.apply_fields(fields)
+        except sgtk.TankError:
+            return None
+
+    @staticmethod
+    def _get_mtime(path):
+        """
+        :param path:    The directory to get the modification time of
+        :returns:       The modification time of the directory or None if it doesn't exist
+        """
+        try:
+            return os.stat(path).st_mtime
+        except OSError:
+            return None
+
+    @staticmethod
+    def _get_signature(path):
+        """
+        :param path:    The directory to get the signature of
+        :returns:       A tuple containing the modification time of the directory and a value
+                        that changes whenever any of the files it contains are modified, or None
+                        if the directory doesn't exist
+        """
+        try:
+            files = []
+            with os.scandir(path) as it:
+                for entry in it:
+                    if entry.name.startswith("."):
+                        continue
+                    try:
+                        if not entry.is_file():
+                            continue
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    files.append((entry.name, stat.st_mtime, stat.st_size))
+            return (os.stat(path).st_mtime, hash(frozenset(files)))
+        except OSError:
+            return None
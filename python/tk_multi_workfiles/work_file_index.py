@@ -0,0 +1,388 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Persistent on-disk index of the work files found for a work template and set of context fields.
+"""
+
+import os
+import json
+import time
+import sqlite3
+from collections import namedtuple
+
+import sgtk
+
+from .util import Threaded
+from .template_walker import file_stat
+
+# Details about a single work file stored in the index.
+WorkFileRecord = namedtuple(
+    "WorkFileRecord", ["path", "fields", "mtime", "uid", "size"]
+)
+
+
+class WorkFileIndex(Threaded):
+    """
+    SQLite backed index stored in the app's cache location.  The index keeps track of:
+
+    - The listing of every directory visited while searching for work files together with the
+      modification time of the directory when it was listed.  A directory is only re-listed
+      when its modification time changes.
+    - The work files found for a work template and set of context fields, along with the fields
+      parsed from the path, the file modification time and its owner.  Each file is stat'ed on
+      every search, so files modified in place are picked up, but its fields are only parsed
+      from the path again when the file has changed since it was last indexed.
+
+    This means that re-running a search for a work area that has been searched before only
+    costs a stat call per directory and per work file rather than a full directory walk.
+
+    Directory listings are committed to the database in batches, see :meth:`flush`, rather
+    than in a transaction per directory.
+    """
+
+    # Bump this if the schema changes so that stale databases are discarded.
+    SCHEMA_VERSION = 3
+
+    # Directory listings made within this many seconds of the directory's modification
+    # time are not trusted as the file system may not have the resolution to record a
+    # subsequent change.
+    _MTIME_GRANULARITY = 2.0
+
+    # Maximum number of directory listings kept in memory before they are committed.
+    _MAX_PENDING_LISTINGS = 500
+
+    def __init__(self, db_path=None):
+        """
+        Construction
+
+        :param db_path: Path of the SQLite database to use.  If None then the database will be
+                        stored in the current app's cache location.
+        """
+        Threaded.__init__(self)
+        self._db_path = db_path
+        self._connection = None
+        self._disabled = False
+        # self._pending_listings[path] = (path, mtime, listed_at, entries) for the directory
+        # listings that haven't been committed yet
+        self._pending_listings = {}
+
+    @property
+    def is_enabled(self):
+        """
+        :returns:   True if the index can be used, False if it has been disabled because of
+                    an error.
+        """
+        return not self._disabled
+
+    @staticmethod
+    def search_key(template, fields, skip_keys):
+        """
+        Build the key used to store the work files found for a search.
+
+        :param template:    The work template that was searched
+        :param fields:      The fields used for the search
+        :param skip_keys:   The keys that were treated as wildcards in the search
+        :returns:           A string uniquely identifying the search
+        """
+        skip_keys = set(skip_keys or [])
+        key_fields = sorted(
+            (name, str(value))
+            for name, value in fields.items()
+            if name not in skip_keys
+        )
+        return json.dumps([template.definition, key_fields, sorted(skip_keys)])
+
+    def list_dir(self, dir_path):
+        """
+        Return the listing of a directory, only listing it from disk if it changed since it
+        was last listed.  New listings are only committed to the database once :meth:`flush`
+        is called or once too many are pending.  This is thread safe.
+
+        :param dir_path:    The directory to list
+        :returns:           A list of (name, is_dir) tuples for the entries of the directory or None
+                            if the directory couldn't be listed.
+        """
+        try:
+            mtime = os.stat(dir_path).st_mtime
+        except OSError:
+            return None
+
+        row = self._get_pending_listing(dir_path)
+        if not row:
+            rows = self._execute(
+                "SELECT path, mtime, listed_at, entries FROM directories WHERE path = ?",
+                (dir_path,),
+            )
+            row = rows[0] if rows else None
+        if row:
+            _, cached_mtime, listed_at, entries = row
+            if (
+                cached_mtime == mtime
+                and listed_at - mtime > WorkFileIndex._MTIME_GRANULARITY
+            ):
+                return [tuple(entry) for entry in json.loads(entries)]
+
+        listed_at = time.time()
+        entries = []
+        try:
+            with os.scandir(dir_path) as it:
+                for entry in it:
+                    try:
+                        entries.append((entry.name, entry.is_dir()))
+                    except OSError:
+                        continue
+        except OSError:
+            return None
+
+        num_pending = self._add_pending_listing(
+            (dir_path, mtime, listed_at, json.dumps(entries))
+        )
+        if num_pending >= WorkFileIndex._MAX_PENDING_LISTINGS:
+            self.flush()
+        return entries
+
+    def flush(self):
+        """
+        Commit all the pending directory listings to the database in a single transaction.
+        This should be called once a search has finished listing directories.
+        """
+        rows = self._take_pending_listings()
+        if rows:
+            self._executemany(
+                "INSERT OR REPLACE INTO directories (path, mtime, listed_at, entries) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            )
+
+    def update_work_files(self, search_key, template, paths):
+        """
+        Update the work files stored for a search with the paths that were found on disk and
+        return a record for each of them.  Every file is stat'ed but the fields are only parsed
+        from the paths of files that are new or have been modified since they were last indexed.
+
+        :param search_key:  The key for the search, see :meth:`search_key`
+        :param template:    The work template the paths were found for, or a TemplateFieldParser
+                            for it, used to extract the fields from new paths
+        :param paths:       The list of paths found on disk for the search
+        :returns:           A dictionary of {path:WorkFileRecord}
+        """
+        # make sure the directory listings of the search are stored:
+        self.flush()
+
+        rows = self._execute(
+            "SELECT path, fields, mtime, uid, size FROM work_files WHERE search_key = ?",
+            (search_key,),
+        )
+        if rows is None:
+            return {}
+        indexed = dict((row[0], row[1:]) for row in rows)
+
+        records = {}
+        updated_rows = []
+        for path in paths:
+            # files can be modified in place without changing the modification time of their
+            # directory so always check the file itself:
+            mtime = uid = size = None
+            try:
+                mtime, uid, size = file_stat(os.stat(path))
+            except OSError:
+                # ignore OSErrors as it's probably a permissions thing!
+                pass
+
+            indexed_row = indexed.get(path)
+            if (
+                indexed_row
+                and indexed_row[0] is not None
+                and mtime is not None
+                and tuple(indexed_row[1:]) == (mtime, uid, size)
+            ):
+                records[path] = WorkFileRecord(
+                    path, json.loads(indexed_row[0]), mtime, uid, size
+                )
+                continue
+
+            fields = template.get_fields(path)
+            records[path] = WorkFileRecord(path, fields, mtime, uid, size)
+
+            try:
+                fields_str = json.dumps(fields)
+            except (TypeError, ValueError):
+                # only store fields that can be serialized, they will
+                # be read from the path next time:
+                fields_str = None
+            updated_rows.append((search_key, path, fields_str, mtime, uid, size))
+
+        removed_paths = [(search_key, path) for path in set(indexed) - set(paths)]
+        if updated_rows:
+            self._executemany(
+                "INSERT OR REPLACE INTO work_files "
+                "(search_key, path, fields, mtime, uid, size) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                updated_rows,
+            )
+        if removed_paths:
+            self._executemany(
+                "DELETE FROM work_files WHERE search_key = ? AND path = ?",
+                removed_paths,
+            )
+        return records
+
+    @Threaded.exclusive
+    def clear(self):
+        """
+        Remove everything from the index.
+        """
+        self._pending_listings = {}
+        connection = self._get_connection()
+        if not connection:
+            return
+        try:
+            with connection:
+                connection.execute("DELETE FROM directories")
+                connection.execute("DELETE FROM work_files")
+        except sqlite3.Error as e:
+            self._disable(e)
+
+    @Threaded.exclusive
+    def _get_pending_listing(self, dir_path):
+        """
+        :param dir_path:    The directory to get the pending listing for
+        :returns:           The (path, mtime, listed_at, entries) row of the directory listing if
+                            it hasn't been committed yet, otherwise None
+        """
+        return self._pending_listings.get(dir_path)
+
+    @Threaded.exclusive
+    def _add_pending_listing(self, row):
+        """
+        :param row: The (path, mtime, listed_at, entries) row of a new directory listing
+        :returns:   The number of directory listings waiting to be committed
+        """
+        self._pending_listings[row[0]] = row
+        return len(self._pending_listings)
+
+    @Threaded.exclusive
+    def _take_pending_listings(self):
+        """
+        :returns:   The list of rows for all the directory listings waiting to be committed
+        """
+        rows = list(self._pending_listings.values())
+        self._pending_listings = {}
+        return rows
+
+    @Threaded.exclusive
+    def _execute(self, sql, params=(), commit=False):
+        """
+        Thread-safe execution of a single SQL statement.
+
+        :param sql:     The SQL statement to execute
+        :param params:  The parameters for the statement
+        :param commit:  True if the statement modifies the database
+        :returns:       A list of the rows returned by the statement or None if the
+                        index isn't available.
+        """
+        connection = self._get_connection()
+        if not connection:
+            return None
+        try:
+            if commit:
+                with connection:
+                    return connection.execute(sql, params).fetchall()
+            return connection.execute(sql, params).fetchall()
+        except sqlite3.Error as e:
+            self._disable(e)
+            return None
+
+    @Threaded.exclusive
+    def _executemany(self, sql, seq_of_params):
+        """
+        Thread-safe execution of a SQL statement for a sequence of parameters in a single
+        transaction.
+
+        :param sql:             The SQL statement to execute
+        :param seq_of_params:   A list of parameters for the statement
+        """
+        connection = self._get_connection()
+        if not connection:
+            return
+        try:
+            with connection:
+                connection.executemany(sql, seq_of_params)
+        except sqlite3.Error as e:
+            self._disable(e)
+
+    def _get_connection(self):
+        """
+        Return the connection to the database, opening it and creating the schema on first use.
+        Must be called with the lock held.
+
+        :returns:   A sqlite3.Connection or None if the index is disabled.
+        """
+        if self._disabled:
+            return None
+        if self._connection:
+            return self._connection
+
+        try:
+            db_path = self._db_path
+            if not db_path:
+                app = sgtk.platform.current_bundle()
+                db_path = os.path.join(app.cache_location, "work_file_index.db")
+            db_dir = os.path.dirname(db_path)
+            if db_dir and not os.path.exists(db_dir):
+                os.makedirs(db_dir)
+
+            connection = sqlite3.connect(db_path, timeout=5.0, check_same_thread=False)
+            with connection:
+                version = connection.execute("PRAGMA user_version").fetchone()[0]
+                if version != WorkFileIndex.SCHEMA_VERSION:
+                    connection.execute("DROP TABLE IF EXISTS directories")
+                    connection.execute("DROP TABLE IF EXISTS work_files")
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS directories ("
+                    "path TEXT PRIMARY KEY, mtime REAL, listed_at REAL, entries TEXT)"
+                )
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS work_files ("
+                    "search_key TEXT, path TEXT, fields TEXT, "
+                    "mtime REAL, uid INTEGER, size INTEGER, "
+                    "PRIMARY KEY (search_key, path))"
+                )
+                connection.execute(
+                    "PRAGMA user_version = %d" % WorkFileIndex.SCHEMA_VERSION
+                )
+        except (sqlite3.Error, OSError) as e:
+            self._disable(e)
+            return None
+
+        self._connection = connection
+        return connection
+
+    def _disable(self, error):
+        """
+        Disable the index after an error, searches will then fall back to scanning the
+        file system.  Must be called with the lock held.
+
+        :param error:   The error that caused the index to be disabled
+        """
+        self._disabled = True
+        if self._connection:
+            try:
+                self._connection.close()
+            except sqlite3.Error:
+                pass
+            self._connection = None
+        app = sgtk.platform.current_bundle()
+        app.log_debug("Work file index disabled: %s" % error)
+
+
+# single global instance of the work file index
+g_work_file_index = WorkFileIndex()
@@ -0,0 +1,373 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Unit tests for the file finder.
+"""
+
+import os
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from tank_vendor.shotgun_api3 import sg_timezone
+
+from tank_test.tank_test_base import setUpModule  # noqa
+from workfiles2_test_base import Workfiles2TestBase
+from workfiles2_test_base import tearDownModule  # noqa
+
+import sgtk
+
+
+class TestFileFinder(Workfiles2TestBase):
+    """
+    Tests for the FileFinder class.
+    """
+
+    def setUp(self):
+        """
+        Fixtures setup
+        """
+        super().setUp()
+        self.FileFinder = self.tk_multi_workfiles.file_finder.FileFinder
+        self.FileItem = self.tk_multi_workfiles.file_item.FileItem
+
+        bunny = self.mockgun.create(
+            "Asset",
+            {"code": "Bunny", "sg_asset_type": "Character", "project": self.project},
+        )
+        concept = self.mockgun.create(
+            "Step", {"code": "Concept", "short_name": "concept"}
+        )
+        task = self.mockgun.create(
+            "Task",
+            {
+                "content": "Bunny Concept",
+                "project": self.project,
+                "step": concept,
+                "entity": bunny,
+            },
+        )
+        self._ctx = self.create_context(task)
+
+        for version in range(1, 4):
+            self.create_work_file(self._ctx, "scene", version)
+        self.create_work_file(self._ctx, "other", 5)
+
+    def test_find_files_for_file_key(self):
+        """
+        Ensure only the versions of a single file are found when a file key is specified.
+        """
+        fields = self._ctx.as_template_fields(self.work_template)
+        fields["name"] = "scene"
+        file_key = self.FileItem.build_file_key(fields, self.work_template)
+
+        finder = self.FileFinder()
+        files = finder.find_files(
+            self.work_template, self.publish_template, self._ctx, file_key
+        )
+        self.assertEqual(sorted(f.version for f in files), [1, 2, 3])
+        self.assertTrue(all(f.key == file_key for f in files))
+
+        # and all files are found without a key:
+        files = finder.find_files(self.work_template, self.publish_template, self._ctx)
+        self.assertEqual(sorted(f.version for f in files), [1, 2, 3, 5])
+
+    def test_find_files_for_file_key_with_custom_publish_name(self):
+        """
+        Ensure publishes are found for a file key even if their name isn't built from the
+        name field of the file.
+        """
+        path = self._create_template_file(self._ctx, self.publish_template, "scene", 4)
+        sgtk.util.register_publish(self.tk, self._ctx, path, "Hero Layout", 4)
+
+        fields = self._ctx.as_template_fields(self.work_template)
+        fields["name"] = "scene"
+        file_key = self.FileItem.build_file_key(fields, self.work_template)
+
+        files = self.FileFinder().find_files(
+            self.work_template, self.publish_template, self._ctx, file_key
+        )
+        self.assertEqual(sorted(f.version for f in files), [1, 2, 3, 4])
+        self.assertTrue(all(f.key == file_key for f in files))
+
+    def test_cancelled_search_stops(self):
+        """
+        Ensure finding work files stops as soon as the search has been cancelled.
+        """
+        cancel_token = self.tk_multi_workfiles.cancellation_token.CancellationToken()
+        cancel_token.cancel()
+
+        finder = self.FileFinder()
+        with self.assertRaises(self.tk_multi_workfiles.errors.SearchCancelledError):
+            finder._find_work_file_records(
+                self._ctx, self.work_template, [], cancel_token=cancel_token
+            )
+
+    def test_find_changed_publishes(self):
+        """
+        Ensure refreshing cached publishes only finds the publishes that changed.
+        """
+        AsyncFileFinder = self.tk_multi_workfiles.file_finder.AsyncFileFinder
+        finder = AsyncFileFinder(self.bg_task_manager)
+        self.addCleanup(finder.shut_down)
+
+        cached_at = datetime(2026, 1, 1, tzinfo=sg_timezone.utc)
+        publishes = []
+        for version in range(1, 4):
+            self.create_publish_file(self._ctx, "scene", version)
+        publish_filters = [["entity", "is", self._ctx.entity]]
+        for sg_publish in self.mockgun.find("PublishedFile", publish_filters, ["id"]):
+            self.mockgun.update(
+                "PublishedFile", sg_publish["id"], {"updated_at": cached_at}
+            )
+            publishes.append(sg_publish["id"])
+
+        # cache the publishes the way the publish model does:
+        cached_publishes = self.mockgun.find(
+            "PublishedFile", publish_filters, finder._PUBLISH_FIELDS
+        )
+        for sg_publish in cached_publishes:
+            for field, value in sg_publish.items():
+                if isinstance(value, datetime):
+                    sg_publish[field] = value.timestamp()
+
+        # then update, delete and add a publish:
+        self.mockgun.update(
+            "PublishedFile",
+            publishes[0],
+            {"description": "updated", "updated_at": cached_at + timedelta(hours=1)},
+        )
+        self.mockgun.delete("PublishedFile", publishes[1])
+        self.create_publish_file(self._ctx, "scene", 4)
+        new_publish = self.mockgun.find_one(
+            "PublishedFile", publish_filters + [["version_number", "is", 4]]
+        )
+        self.mockgun.update(
+            "PublishedFile",
+            new_publish["id"],
+            {"updated_at": cached_at + timedelta(hours=1)},
+        )
+
+        # and query them together with the publishes of an entity that has nothing cached:
+        rabbit = self.mockgun.create(
+            "Asset",
+            {"code": "Rabbit", "sg_asset_type": "Character", "project": self.project},
+        )
+        rabbit_ctx = self.create_context(
+            self.mockgun.create(
+                "Task",
+                {
+                    "content": "Rabbit Concept",
+                    "project": self.project,
+                    "step": self._ctx.step,
+                    "entity": rabbit,
+                },
+            )
+        )
+        self.create_publish_file(rabbit_ctx, "scene", 1)
+        rabbit_publish = self.mockgun.find_one(
+            "PublishedFile", [["entity", "is", rabbit_ctx.entity]]
+        )
+
+        result = finder._task_find_changed_publishes(
+            [
+                (publish_filters, cached_publishes),
+                ([["entity", "is", rabbit_ctx.entity]], None),
+            ]
+        )
+        bunny_changes, rabbit_changes = result["publish_changes"]
+        self.assertEqual(
+            bunny_changes["changed_ids"], set([publishes[0], new_publish["id"]])
+        )
+        self.assertEqual(bunny_changes["deleted_ids"], set([publishes[1]]))
+        self.assertEqual(
+            sorted(p["id"] for p in bunny_changes["sg_publishes"]),
+            sorted([publishes[0], publishes[2], new_publish["id"]]),
+        )
+        self.assertEqual(rabbit_changes["changed_ids"], set([rabbit_publish["id"]]))
+        self.assertEqual(
+            [p["id"] for p in rabbit_changes["sg_publishes"]], [rabbit_publish["id"]]
+        )
+
+    def test_publish_model_pool(self):
+        """
+        Ensure searches share a bounded pool of pre-warmed publish models.
+        """
+        AsyncFileFinder = self.tk_multi_workfiles.file_finder.AsyncFileFinder
+        finder = AsyncFileFinder(self.bg_task_manager)
+        self.addCleanup(finder.shut_down)
+        finder._publish_model_pool_size = 1
+        searches = [AsyncFileFinder._SearchData(i, None, [], None) for i in range(2)]
+
+        # a model is created up front:
+        self.assertEqual(finder.publish_model_pool_utilization, (0, 1, 1, 0))
+        publish_model = finder._acquire_publish_model(searches[0])
+        self.assertIsNotNone(publish_model)
+
+        # the pool is exhausted until the model is released:
+        self.assertIsNone(finder._acquire_publish_model(searches[1]))
+        finder._release_publish_model(searches[0])
+        self.assertIs(finder._acquire_publish_model(searches[1]), publish_model)
+        self.assertEqual(finder.publish_model_pool_utilization, (1, 1, 1, 0))
+
+    def test_refreshed_publishes_are_cached(self):
+        """
+        Ensure the publishes merged by a refresh are written to the publish list cache so that
+        the next session only finds the publishes that changed since.
+        """
+        AsyncFileFinder = self.tk_multi_workfiles.file_finder.AsyncFileFinder
+        PublishListCache = self.tk_multi_workfiles.publish_list_cache.PublishListCache
+        finder = AsyncFileFinder(self.bg_task_manager)
+        self.addCleanup(finder.shut_down)
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir, True)
+        publish_list_cache = PublishListCache(cache_dir)
+
+        for version in range(1, 3):
+            self.create_publish_file(self._ctx, "scene", version)
+        publish_filters = [["entity", "is", self._ctx.entity]]
+        with patch.object(
+            self.tk_multi_workfiles.file_finder,
+            "g_publish_list_cache",
+            publish_list_cache,
+        ):
+            result = finder._task_find_changed_publishes([(publish_filters, None)])
+        sg_publishes = result["publish_changes"][0]["sg_publishes"]
+        self.assertEqual(len(sg_publishes), 2)
+
+        # the cached publishes are the ones found, ready to find the changes since:
+        cached_publishes = publish_list_cache.get(publish_filters)
+        self.assertEqual(cached_publishes, sg_publishes)
+        self.assertTrue(finder._can_find_changed_publishes(cached_publishes))
+        self.assertIsNone(publish_list_cache.get([["entity", "is", self._ctx.project]]))
+
+    def test_custom_filter_hook_gets_all_publishes(self):
+        """
+        Ensure all publishes are filtered again when cached publishes change and a custom
+        filter_publishes hook is used, while the default hook only filters the changes.
+        """
+        AsyncFileFinder = self.tk_multi_workfiles.file_finder.AsyncFileFinder
+        finder = AsyncFileFinder(self.bg_task_manager)
+        self.addCleanup(finder.shut_down)
+        search = AsyncFileFinder._SearchData(0, None, [None], None)
+        previous_results = AsyncFileFinder._ChunkedResults(None, True)
+        search.latest_results[(None, True)] = previous_results
+        sg_publishes = [{"id": 1}, {"id": 2}, {"id": 3}]
+
+        filtered = []
+
+        def begin_filter_publishes(search, user, sg_publishes):
+            filtered.append([p["id"] for p in sg_publishes])
+            return AsyncFileFinder._ChunkedResults(None, True)
+
+        with patch.object(finder, "_begin_filter_publishes", begin_filter_publishes):
+            with patch.object(
+                finder, "_uses_default_filter_publishes_hook", return_value=True
+            ):
+                finder._begin_search_process_publish_changes(
+                    search, sg_publishes, set([2]), set()
+                )
+            with patch.object(
+                finder, "_uses_default_filter_publishes_hook", return_value=False
+            ):
+                finder._begin_search_process_publish_changes(
+                    search, sg_publishes, set([2]), set()
+                )
+        self.assertEqual(filtered, [[2], [1, 2, 3]])
+
+    def test_versionless_names_match_rebuilt_names(self):
+        """
+        Ensure versionless names derived from the per-template rule are the same as the ones
+        found by rebuilding the path with a dummy version, whatever the case of the static
+        parts of the file name.
+        """
+        FileNameMap = self.FileFinder._FileNameMap
+        keys = {
+            "Shot": sgtk.StringKey("Shot"),
+            "Step": sgtk.StringKey("Step"),
+            "version": sgtk.IntegerKey("version", format_spec="03"),
+        }
+        file_names = {
+            # the definition after the version is static:
+            "{Shot}_{Step}_v{version}.ma": [
+                "sh010_comp_v003.ma",
+                "SH010_comp_V003.ma",
+                "SH010_COMP_V003.MA",
+            ],
+            # the definition before the version is static:
+            "v{version}_{Shot}_{Step}.ma": ["v003_sh010_comp.ma", "V003_SH010_comp.MA"],
+            # neither is, the rule can't be used:
+            "{Shot}_v{version}_{Step}.ma": ["sh010_v003_comp.ma", "SH010_V003_comp.ma"],
+        }
+        for definition, names in file_names.items():
+            template = sgtk.TemplatePath(
+                "shots/{Shot}/" + definition, keys, self.project_root
+            )
+            for name in names:
+                path = os.path.join(self.project_root, "shots", "sh010", name)
+                fields = template.get_fields(path)
+
+                rebuilt_name_map = FileNameMap()
+                rule = rebuilt_name_map._get_name_rule(template)
+                with patch.object(rule, "find_version", return_value=None):
+                    expected = rebuilt_name_map._generate_name(path, template, fields)
+
+                self.assertEqual(
+                    FileNameMap()._generate_name(path, template, fields),
+                    expected,
+                    path,
+                )
+
+    def test_context_resolved_once_per_directory(self):
+        """
+        Ensure the context is only resolved once for all the files in a directory.
+        """
+        context_map = self.FileFinder._ContextMap()
+        paths = [
+            self.create_work_file(self._ctx, "scene", version)
+            for version in range(1, 4)
+        ]
+        self.assertEqual(len(set(os.path.dirname(p) for p in paths)), 1)
+
+        with patch.object(
+            self.tk, "context_from_path", wraps=self.tk.context_from_path
+        ) as context_from_path:
+            contexts = [
+                context_map.get_context(self.tk, path, self._ctx) for path in paths
+            ]
+        self.assertEqual(context_from_path.call_count, 1)
+        self.assertTrue(all(ctx is contexts[0] for ctx in contexts))
+        self.assertEqual(contexts[0].task, self._ctx.task)
+
+    def test_context_not_shared_between_previous_contexts(self):
+        """
+        Ensure files in the same directory don't share a context resolved with a different
+        previous context.
+        """
+        context_map = self.FileFinder._ContextMap()
+        path = self.create_work_file(self._ctx, "scene", 1)
+        project_ctx = self.tk.context_from_entity_dictionary(self.project)
+
+        with patch.object(
+            self.tk, "context_from_path", wraps=self.tk.context_from_path
+        ) as context_from_path:
+            task_ctx = context_map.get_context(self.tk, path, self._ctx)
+            other_ctx = context_map.get_context(self.tk, path, project_ctx)
+            self.assertIs(context_map.get_context(self.tk, path, self._ctx), task_ctx)
+            self.assertIs(
+                context_map.get_context(self.tk, path, project_ctx), other_ctx
+            )
+        self.assertEqual(context_from_path.call_count, 2)
+        self.assertEqual(
+            [c.args[1] for c in context_from_path.call_args_list],
+            [self._ctx, project_ctx],
+        )
@@ -10,6 +10,7 @@
 
 import pprint
 from contextlib import contextmanager
+from unittest.mock import patch
 
 from tank_test.tank_test_base import setUpModule  # noqa
 from workfiles2_test_base import Workfiles2TestBase
@@ -19,6 +20,8 @@ import pytest
 import sgtk
 import sys
 import os
+import time
+import unittest
 
 IS_PUBLISH = "publish"
 IS_WORKFILE = "workfile"
@@ -176,6 +179,25 @@ class TestFileModelBase(Workfiles2TestBase):
         with self.wait_for(search_is_over, on_error_cb):
             yield
 
+    def _refresh_work_area(self, group_item, dir_path):
+        """
+        Notify the model that a work area directory has changed and wait for the work files
+        in it to be found in the background.
+
+        :param group_item:  The group item the directory belongs to
+        :param dir_path:    The directory that changed
+        """
+
+        def on_error_cb():
+            return "Timed out. Model Content:\n" + pprint.pformat(
+                self._get_model_contents()
+            )
+
+        with self.wait_for(lambda: not self._model._directory_requests, on_error_cb):
+            self._model._on_work_area_changed(
+                group_item.key, group_item.work_area, dir_path
+            )
+
 
 class TestFileModelWithSandboxes(TestFileModelBase):
     """
@@ -223,6 +245,359 @@ class TestFileModelWithSandboxes(TestFileModelBase):
             ]
         )
 
+    @pytest.mark.skipif(
+        sgtk.util.is_windows() and "CI" in os.environ,
+        reason="This test is flaky on Windows",
+    )
+    def test_work_area_changes_patch_model(self):
+        """
+        Ensure changes to a watched work area directory update the model without a new search.
+        """
+        path = self.create_work_file(self._concept_ctx_jeff, "scene", 1)
+
+        with self._wait_for_groups(1):
+            self._model.set_entity_searches(
+                [self.FileModel.SearchDetails("Concept files", self._task_concept)]
+            )
+        self._assert_model_contains([(self._concept_ctx_jeff, "scene", 1, IS_WORKFILE)])
+
+        group_item = self._model.item(0)
+
+        # A new file should be added to the model:
+        self.create_work_file(self._concept_ctx_jeff, "scene", 2)
+        self._refresh_work_area(group_item, os.path.dirname(path))
+        self._assert_model_contains(
+            [
+                (self._concept_ctx_jeff, "scene", 1, IS_WORKFILE),
+                (self._concept_ctx_jeff, "scene", 2, IS_WORKFILE),
+            ]
+        )
+
+        # And a deleted file removed from it:
+        os.remove(path)
+        self._refresh_work_area(group_item, os.path.dirname(path))
+        self._assert_model_contains([(self._concept_ctx_jeff, "scene", 2, IS_WORKFILE)])
+
+    @pytest.mark.skipif(
+        sgtk.util.is_windows() and "CI" in os.environ,
+        reason="This test is flaky on Windows",
+    )
+    def test_files_found_in_chunks(self):
+        """
+        Ensure files emitted in chunks are merged into the model and that files removed
+        between two searches are removed once the last chunk has been received.
+        """
+        AsyncFileFinder = self.tk_multi_workfiles.file_finder.AsyncFileFinder
+        with patch.object(AsyncFileFinder, "CHUNK_SIZE", 2):
+            paths = [
+                self.create_work_file(self._concept_ctx_jeff, "scene", version)
+                for version in range(1, 6)
+            ]
+            with self._wait_for_groups(1):
+                self._model.set_entity_searches(
+                    [self.FileModel.SearchDetails("Concept files", self._task_concept)]
+                )
+            self._assert_model_contains(
+                [
+                    (self._concept_ctx_jeff, "scene", version, IS_WORKFILE)
+                    for version in range(1, 6)
+                ]
+            )
+
+            os.remove(paths[0])
+            with self._wait_for_groups(1):
+                self._model.async_refresh()
+            self._assert_model_contains(
+                [
+                    (self._concept_ctx_jeff, "scene", version, IS_WORKFILE)
+                    for version in range(2, 6)
+                ]
+            )
+
+    @pytest.mark.skipif(
+        sgtk.util.is_windows() and "CI" in os.environ,
+        reason="This test is flaky on Windows",
+    )
+    def test_entity_selections_coalesced(self):
+        """
+        Ensure entity searches set in quick succession result in a single search and that the
+        work area built for an entity is re-used when it is selected again.
+        """
+        self.create_work_file(self._concept_ctx_jeff, "scene", 1)
+        concept = self.FileModel.SearchDetails("Concept files", self._task_concept)
+        rig = self.FileModel.SearchDetails("Rig files", self._task_rig)
+
+        finder = self._model._finder
+        with patch.object(
+            finder, "begin_search", wraps=finder.begin_search
+        ) as begin_search, patch.object(
+            finder,
+            "_task_construct_work_area",
+            wraps=finder._task_construct_work_area,
+        ) as construct_work_area:
+            with self._wait_for_groups(1):
+                self._model.set_entity_searches([rig])
+                self._model.set_entity_searches([concept])
+            self.assertEqual(begin_search.call_count, 1)
+            self.assertEqual(
+                begin_search.call_args[0][0]["id"], self._task_concept["id"]
+            )
+            self._assert_model_contains(
+                [(self._concept_ctx_jeff, "scene", 1, IS_WORKFILE)]
+            )
+
+            # apply selections immediately so the rig is searched for before going back:
+            self._model._search_debounce_timer.setInterval(0)
+            with self._wait_for_groups(1):
+                self._model.set_entity_searches([rig])
+            with self._wait_for_groups(1):
+                self._model.set_entity_searches([concept])
+            self.assertEqual(construct_work_area.call_count, 2)
+            self._assert_model_contains(
+                [(self._concept_ctx_jeff, "scene", 1, IS_WORKFILE)]
+            )
+
+    def test_visible_searches_prioritised(self):
+        """
+        Ensure searches for the groups visible in a view are flagged as visible so their
+        tasks run first.
+        """
+        finder = self._model._finder
+        self._model._search_debounce_timer.setInterval(0)
+        concept = self.FileModel.SearchDetails("Concept files", self._task_concept)
+        rig = self.FileModel.SearchDetails("Rig files", self._task_rig)
+
+        # only the concept task group is visible:
+        self._model.set_visible_items(
+            "view", [(("Task", self._task_concept["id"]), (None, None))], []
+        )
+        with patch.object(
+            finder, "begin_search", wraps=finder.begin_search
+        ) as begin_search:
+            with self._wait_for_groups(2):
+                self._model.set_entity_searches([concept, rig])
+
+        is_visible = dict(
+            (call[0][0]["id"], call[1]["is_visible"])
+            for call in begin_search.call_args_list
+        )
+        self.assertEqual(
+            is_visible, {self._task_concept["id"]: True, self._task_rig["id"]: False}
+        )
+
+    def test_incremental_group_update(self):
+        """
+        Ensure processing files only updates the items for the file keys that changed.
+        """
+        for version in range(1, 3):
+            self.create_work_file(self._concept_ctx_jeff, "scene", version)
+        self.create_work_file(self._concept_ctx_jeff, "other", 1)
+        with self._wait_for_groups(1):
+            self._model.set_entity_searches(
+                [self.FileModel.SearchDetails("Concept files", self._task_concept)]
+            )
+
+        group_item = self._model.item(0)
+        scene_items = [
+            group_item.child(row)
+            for row in range(group_item.rowCount())
+            if group_item.child(row).file_item.name == "scene"
+        ]
+        self.assertEqual(len(scene_items), 2)
+
+        changed_rows = set()
+
+        def on_data_changed(top_left, bottom_right, *args):
+            changed_rows.update(range(top_left.row(), bottom_right.row() + 1))
+
+        self._model.dataChanged.connect(on_data_changed)
+        self.addCleanup(self._model.dataChanged.disconnect, on_data_changed)
+
+        FileItem = self.tk_multi_workfiles.file_item.FileItem
+        with patch.object(
+            FileItem, "format_tooltip", autospec=True, return_value=""
+        ) as format_tooltip, patch.object(
+            self._model, "_file_items", wraps=self._model._file_items
+        ) as file_items, patch.object(
+            self._model._search_cache, "add", wraps=self._model._search_cache.add
+        ) as cache_add:
+            self._model._process_files(
+                [scene_items[0].file_item],
+                group_item.work_area,
+                group_item,
+                have_local=True,
+                have_publishes=False,
+                is_partial=True,
+            )
+
+        # all versions of the scene were updated but the other file wasn't, and tooltips are
+        # only built when they're needed:
+        self.assertEqual(format_tooltip.call_count, 0)
+        self.assertEqual(changed_rows, set(item.row() for item in scene_items))
+
+        # neither the group nor the cache were rebuilt:
+        self.assertEqual(file_items.call_count, 0)
+        self.assertEqual(cache_add.call_count, 0)
+        self.assertEqual(
+            len(
+                self._model.get_cached_file_versions(
+                    scene_items[0].file_item.key, group_item.work_area
+                )
+            ),
+            2,
+        )
+
+    def test_display_data_cached(self):
+        """
+        Ensure the display data for a file is built on first request and cached until the file
+        changes.
+        """
+        from sgtk.platform.qt import QtCore
+
+        self.create_work_file(self._concept_ctx_jeff, "scene", 1)
+        with self._wait_for_groups(1):
+            self._model.set_entity_searches(
+                [self.FileModel.SearchDetails("Concept files", self._task_concept)]
+            )
+        model_item = self._model.item(0).child(0)
+        file_item = model_item.file_item
+
+        FileItem = self.tk_multi_workfiles.file_item.FileItem
+        with patch.object(
+            FileItem, "format_tooltip", autospec=True, return_value="tooltip"
+        ) as format_tooltip:
+            for _ in range(3):
+                self.assertEqual(model_item.data(QtCore.Qt.ToolTipRole), "tooltip")
+            self.assertEqual(format_tooltip.call_count, 1)
+
+            # updating the file bumps its revision so the tooltip is built again:
+            revision = file_item.revision
+            file_item.update_from_work_file(file_item)
+            self.assertGreater(file_item.revision, revision)
+            self.assertEqual(model_item.data(QtCore.Qt.ToolTipRole), "tooltip")
+            self.assertEqual(format_tooltip.call_count, 2)
+
+            # as does updating the versions of the file:
+            self._model._update_group_file_items(
+                self._model.item(0), set([file_item.key])
+            )
+            self.assertEqual(model_item.data(QtCore.Qt.ToolTipRole), "tooltip")
+            self.assertEqual(format_tooltip.call_count, 3)
+
+    def test_group_index(self):
+        """
+        Ensure the group index stays consistent with the groups in the model as groups are added
+        and removed.
+        """
+        self._model._search_debounce_timer.setInterval(0)
+        concept = self.FileModel.SearchDetails("Concept files", self._task_concept)
+        rig = self.FileModel.SearchDetails("Rig files", self._task_rig)
+
+        def group_keys():
+            return sorted(item.key for item in self._model._group_items())
+
+        with self._wait_for_groups(2):
+            self._model.set_entity_searches([concept, rig])
+        self.assertEqual(sorted(self._model._group_index), group_keys())
+
+        with self._wait_for_groups(1):
+            self._model.set_entity_searches([rig])
+        self.assertEqual(sorted(self._model._group_index), group_keys())
+        self.assertEqual(len(self._model._group_index), 1)
+
+        self._model.clear()
+        self.assertEqual(self._model._group_index, {})
+
+    def test_compact_file_model(self):
+        """
+        Ensure the compact model presents the same groups, files and roles as the standard model.
+        """
+        CompactFileModel = self.tk_multi_workfiles.compact_file_model.CompactFileModel
+        self._model = CompactFileModel(self.bg_task_manager, None)
+        self.addCleanup(self._model.destroy)
+
+        path = self.create_work_file(self._concept_ctx_jeff, "scene", 1)
+        self.create_work_file(self._concept_ctx_jeff, "scene", 2)
+        with self._wait_for_groups(1):
+            self._model.set_entity_searches(
+                [self.FileModel.SearchDetails("Concept files", self._task_concept)]
+            )
+        self._assert_model_contains(
+            [
+                (self._concept_ctx_jeff, "scene", 1, IS_WORKFILE),
+                (self._concept_ctx_jeff, "scene", 2, IS_WORKFILE),
+            ]
+        )
+
+        # indexes map back to the rows and expose the same roles as the standard items:
+        group_idx = self._model.index(0, 0)
+        self.assertEqual(
+            group_idx.data(self.FileModel.NODE_TYPE_ROLE),
+            self.FileModel.GROUP_NODE_TYPE,
+        )
+        self.assertIs(self._model.itemFromIndex(group_idx), self._model.item(0))
+        self.assertEqual(self._model.rowCount(group_idx), 2)
+        file_indexes = [self._model.index(row, 0, group_idx) for row in range(2)]
+        self.assertEqual(
+            sorted(idx.data() for idx in file_indexes), ["scene, v1", "scene, v2"]
+        )
+        for row, file_idx in enumerate(file_indexes):
+            self.assertEqual(file_idx.parent(), group_idx)
+            self.assertIs(
+                file_idx.data(self.FileModel.FILE_ITEM_ROLE),
+                self._model.item(0).child(row).file_item,
+            )
+
+        # and rows are removed when the files are:
+        os.remove(path)
+        self._refresh_work_area(self._model.item(0), os.path.dirname(path))
+        self._assert_model_contains([(self._concept_ctx_jeff, "scene", 2, IS_WORKFILE)])
+        self.assertEqual(self._model.item(0).child(0).row(), 0)
+
+    @unittest.skipUnless(
+        os.environ.get("WORKFILES2_BENCHMARK"), "Set WORKFILES2_BENCHMARK to run"
+    )
+    def test_benchmark_group_lookups(self):
+        """
+        Compare the per-event cost of finding a group with the group index and by iterating over
+        all groups as the number of groups grows.
+        """
+        num_events = 200
+        user_key = ("HumanUser", self.francis["id"])
+        for num_groups in (100, 1000, 5000):
+            self._model.clear()
+            for ri in range(num_groups):
+                self._model._insert_group_item(
+                    self.FileModel._GroupModelItem(
+                        "Group %d" % ri, (("Task", ri), user_key)
+                    )
+                )
+            group_keys = [
+                (("Task", (ri * 7919) % num_groups), user_key)
+                for ri in range(num_events)
+            ]
+
+            start = time.time()
+            indexed = [self._model._get_group_item(key) for key in group_keys]
+            index_time = time.time() - start
+
+            start = time.time()
+            scanned = [
+                next(item for item in self._model._group_items() if item.key == key)
+                for key in group_keys
+            ]
+            scan_time = time.time() - start
+
+            self.assertEqual(indexed, scanned)
+            print(
+                "\n%d groups: %0.1fus per event with the index, %0.1fus by iterating"
+                % (
+                    num_groups,
+                    index_time * 1e6 / num_events,
+                    scan_time * 1e6 / num_events,
+                )
+            )
+
     @pytest.mark.skipif(
         sgtk.util.is_windows() and "CI" in os.environ,
         reason="This test is flaky on Windows",
@@ -0,0 +1,75 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Unit tests for the shared publish records.
+"""
+
+import copy
+from datetime import datetime
+
+from tank_vendor.shotgun_api3 import sg_timezone
+
+from tank_test.tank_test_base import setUpModule  # noqa
+from workfiles2_test_base import Workfiles2TestBase
+from workfiles2_test_base import tearDownModule  # noqa
+
+
+class TestPublishRecord(Workfiles2TestBase):
+    """
+    Tests for the PublishRecord class.
+    """
+
+    def test_records_are_normalized_and_shared(self):
+        """
+        Ensure publishes are normalized once into read-only records that are never copied.
+        """
+        publish_record = self.tk_multi_workfiles.publish_record
+        created_at = datetime(2026, 1, 1, tzinfo=sg_timezone.utc)
+        sg_publish = {
+            "id": 1,
+            "created_at": created_at.timestamp(),
+            "updated_at": created_at,
+            "path": {"local_path": "/tmp/scene.v001.ma"},
+        }
+
+        (record,) = publish_record.build_publish_records([sg_publish])
+        self.assertEqual(record["created_at"], created_at)
+        self.assertEqual(record["updated_at"], created_at.timestamp())
+        self.assertEqual(record["path"], sg_publish["path"])
+
+        # records, including the dictionaries they contain, can't be modified:
+        with self.assertRaises(TypeError):
+            record["name"] = "scene"
+        with self.assertRaises(TypeError):
+            record["path"]["local_path"] = None
+
+        # so they are shared rather than copied:
+        self.assertIs(copy.deepcopy(record), record)
+        self.assertIs(publish_record.build_publish_records([record])[0], record)
+        editable = record.copy()
+        editable["name"] = "scene"
+        self.assertNotIn("name", record)
+
+    def test_records_convert_to_mutable_dicts(self):
+        """
+        Ensure records, and the records they contain, can be converted to mutable dictionaries
+        for hooks that modify the publishes in place.
+        """
+        publish_record = self.tk_multi_workfiles.publish_record
+        (record,) = publish_record.build_publish_records(
+            [{"id": 1, "path": {"local_path": "/tmp/scene.v001.ma"}}]
+        )
+
+        editable = record.to_dict()
+        editable["path"]["local_path"] = "/tmp/scene.v002.ma"
+        editable["name"] = "scene"
+        self.assertEqual(record["path"]["local_path"], "/tmp/scene.v001.ma")
+        self.assertNotIn("name", record)
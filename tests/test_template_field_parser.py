@@ -0,0 +1,161 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Unit tests for the compiled template field parser.
+"""
+
+import os
+import time
+import unittest
+
+import sgtk
+
+from tank_test.tank_test_base import setUpModule  # noqa
+from workfiles2_test_base import Workfiles2TestBase
+from workfiles2_test_base import tearDownModule  # noqa
+
+
+class TestTemplateFieldParser(Workfiles2TestBase):
+    """
+    Ensure the TemplateFieldParser extracts exactly the same fields as tk-core.
+    """
+
+    def setUp(self):
+        """
+        Fixtures setup
+        """
+        super().setUp()
+        self.TemplateFieldParser = (
+            self.tk_multi_workfiles.template_field_parser.TemplateFieldParser
+        )
+
+        # a template with a single way of splitting any path:
+        keys = {
+            "Shot": sgtk.StringKey("Shot"),
+            "name": sgtk.StringKey("name", filter_by="alphanumeric"),
+            "version": sgtk.IntegerKey("version", format_spec="03"),
+        }
+        self._shot_template = sgtk.TemplatePath(
+            "shots/{Shot}/work/{name}[_v{version}].ma", keys, self.project_root
+        )
+
+    def _assert_same_fields(self, template, paths):
+        """
+        Compare the fields extracted by the parser with the ones extracted by tk-core.
+        """
+        parser = self.TemplateFieldParser(template)
+        for path in paths:
+            try:
+                expected = template.get_fields(path)
+            except sgtk.TankError:
+                self.assertFalse(parser.validate(path), path)
+                with self.assertRaises(sgtk.TankError):
+                    parser.get_fields(path)
+                continue
+            self.assertTrue(parser.validate(path), path)
+            self.assertEqual(parser.get_fields(path), expected, path)
+        return parser
+
+    def test_compiled_template(self):
+        """
+        Ensure paths are parsed correctly by a template that can be compiled.
+        """
+        root = os.path.join(self.project_root, "shots")
+        paths = [
+            os.path.join(root, "sh010", "work", "scene_v003.ma"),
+            os.path.join(root, "sh010", "work", "scene.ma"),
+            os.path.join(root, "sh.010", "work", "Scene2_v120.MA"),
+            os.path.join(root, "sh010", "work", "scene_vabc.ma"),
+            os.path.join(root, "sh010", "work", "my-scene_v003.ma"),
+            os.path.join(root, "sh010", "work", "scene_v003.mb"),
+            os.path.join(root, "sh010", "other", "scene_v003.ma"),
+            os.path.join(self.project_root, "scene_v003.ma"),
+        ]
+        parser = self._assert_same_fields(self._shot_template, paths)
+        self.assertTrue(parser.is_compiled)
+
+    def test_template_with_ambiguous_key(self):
+        """
+        Ensure templates with a key whose values can contain the token following it are
+        compiled and parse paths correctly.
+        """
+        parser = self.TemplateFieldParser(self.work_template)
+        self.assertTrue(parser.is_compiled)
+
+        path = self.work_template.apply_fields(
+            {
+                "sg_asset_type": "Character",
+                "Asset": "Bunny",
+                "Step": "concept",
+                "user": "jeff",
+                "name": "scene",
+                "version": 2,
+            }
+        )
+        paths = [
+            path,
+            path.replace(".v002.", ".vabc."),
+            path.replace("scene.", "my.v1.scene."),
+            path.replace("scene.", "my.V1.ma."),
+            path.replace("scene.", "scene.v.."),
+        ]
+        self._assert_same_fields(self.work_template, paths)
+
+    def test_ambiguous_template(self):
+        """
+        Ensure templates that can't be compiled fall back to tk-core.
+        """
+        keys = {
+            "name": sgtk.StringKey("name"),
+            "variant": sgtk.StringKey("variant"),
+            "version": sgtk.IntegerKey("version", format_spec="03"),
+        }
+        template = sgtk.TemplatePath(
+            "work/{name}.{variant}.v{version}.ma", keys, self.project_root
+        )
+        parser = self.TemplateFieldParser(template)
+        self.assertFalse(parser.is_compiled)
+
+        root = os.path.join(self.project_root, "work")
+        paths = [
+            os.path.join(root, "scene.main.v002.ma"),
+            os.path.join(root, "scene.main.vabc.ma"),
+        ]
+        self._assert_same_fields(template, paths)
+
+    @unittest.skipUnless(
+        os.environ.get("WORKFILES2_BENCHMARK"), "Set WORKFILES2_BENCHMARK to run"
+    )
+    def test_benchmark(self):
+        """
+        Compare the time taken to parse 50k paths with tk-core and the parser.
+        """
+        paths = [
+            self._shot_template.apply_fields(
+                {"Shot": "sh%03d" % (ri % 100), "name": "scene%d" % ri, "version": ri}
+            )
+            for ri in range(50000)
+        ]
+
+        start = time.time()
+        expected = dict((p, self._shot_template.get_fields(p)) for p in paths)
+        core_time = time.time() - start
+
+        start = time.time()
+        parser = self.TemplateFieldParser(self._shot_template)
+        fields = parser.get_fields_for_paths(paths)
+        parser_time = time.time() - start
+
+        self.assertEqual(fields, expected)
+        print(
+            "\nParsed %d paths: tk-core %.2fs, compiled parser %.2fs"
+            % (len(paths), core_time, parser_time)
+        )
@@ -0,0 +1,128 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Unit tests for the template aware directory walker.
+"""
+
+import os
+
+from tank_test.tank_test_base import setUpModule  # noqa
+from workfiles2_test_base import Workfiles2TestBase
+from workfiles2_test_base import tearDownModule  # noqa
+
+
+class TestTemplateWalker(Workfiles2TestBase):
+    """
+    Ensure the TemplateWalker finds exactly the same paths as tk-core.
+    """
+
+    def setUp(self):
+        """
+        Fixtures setup
+        """
+        super().setUp()
+        self.TemplateWalker = self.tk_multi_workfiles.template_walker.TemplateWalker
+
+        self._bunny = self.mockgun.create(
+            "Asset",
+            {"code": "Bunny", "sg_asset_type": "Character", "project": self.project},
+        )
+        self._fox = self.mockgun.create(
+            "Asset",
+            {"code": "Fox", "sg_asset_type": "Character", "project": self.project},
+        )
+        concept = self.mockgun.create(
+            "Step", {"code": "Concept", "short_name": "concept"}
+        )
+        self._bunny_task = self.mockgun.create(
+            "Task",
+            {
+                "content": "Bunny Concept",
+                "project": self.project,
+                "step": concept,
+                "entity": self._bunny,
+            },
+        )
+        self._fox_task = self.mockgun.create(
+            "Task",
+            {
+                "content": "Fox Concept",
+                "project": self.project,
+                "step": concept,
+                "entity": self._fox,
+            },
+        )
+
+        self._bunny_jeff = self.create_context(self._bunny_task)
+        self._bunny_francis = self.create_context(self._bunny_task, self.francis)
+        self._fox_jeff = self.create_context(self._fox_task)
+
+        for ctx in (self._bunny_jeff, self._bunny_francis, self._fox_jeff):
+            for version in range(1, 4):
+                self.create_work_file(ctx, "scene", version)
+            self.create_work_file(ctx, "other", 1)
+
+    def _assert_same_paths(self, fields, skip_keys):
+        """
+        Compare the paths found by the walker with the ones found by tk-core.
+        """
+        expected = self.tk.paths_from_template(
+            self.work_template,
+            fields,
+            list(skip_keys),
+            skip_missing_optional_keys=True,
+        )
+        found = self.TemplateWalker(self.work_template).paths_from_template(
+            fields, list(skip_keys), skip_missing_optional_keys=True
+        )
+        self.assertEqual(sorted(found), sorted(expected))
+        return found
+
+    def test_matches_paths_from_template(self):
+        """
+        Ensure all versions in a single sandbox are found.
+        """
+        fields = self._bunny_jeff.as_template_fields(self.work_template)
+        found = self._assert_same_paths(fields, ["version"])
+        self.assertEqual(len(found), 4)
+
+    def test_wildcard_keys(self):
+        """
+        Ensure wildcards in intermediate directories are walked.
+        """
+        fields = self._bunny_jeff.as_template_fields(self.work_template)
+        found = self._assert_same_paths(fields, ["version", "user"])
+        self.assertEqual(len(found), 8)
+
+        found = self._assert_same_paths(fields, ["version", "user", "Asset"])
+        self.assertEqual(len(found), 12)
+
+    def test_missing_directories(self):
+        """
+        Ensure branches that don't exist on disk are pruned.
+        """
+        fields = self._bunny_jeff.as_template_fields(self.work_template)
+        fields["Asset"] = "Missing"
+        found = self._assert_same_paths(fields, ["version"])
+        self.assertEqual(found, [])
+
+    def test_file_details_collected(self):
+        """
+        Ensure the details of the files found are collected while walking.
+        """
+        fields = self._bunny_jeff.as_template_fields(self.work_template)
+        found = self.TemplateWalker(self.work_template).find_files(
+            fields, ["version"], skip_missing_optional_keys=True
+        )
+        self.assertEqual(len(found), 4)
+        for path, file_stat in found.items():
+            self.assertEqual(file_stat.mtime, os.path.getmtime(path))
+            self.assertEqual(file_stat.size, os.path.getsize(path))
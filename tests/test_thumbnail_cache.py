@@ -0,0 +1,112 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Unit tests for the thumbnail cache.
+"""
+
+import os
+import shutil
+import tempfile
+
+from tank_test.tank_test_base import setUpModule  # noqa
+from workfiles2_test_base import Workfiles2TestBase
+from workfiles2_test_base import tearDownModule  # noqa
+
+
+class TestThumbnailCache(Workfiles2TestBase):
+    """
+    Tests for the ThumbnailCache class.
+    """
+
+    def setUp(self):
+        """
+        Fixtures setup
+        """
+        super().setUp()
+        self.ThumbnailCache = self.tk_multi_workfiles.thumbnail_cache.ThumbnailCache
+        self._thumb_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self._thumb_dir, True)
+
+    def _create_thumbnail(self, name):
+        """
+        Write a thumbnail image to disk.
+
+        :param name:    The name of the thumbnail
+        :returns:       The path of the thumbnail on disk
+        """
+        from sgtk.platform.qt import QtGui
+
+        image = QtGui.QImage(64, 48, QtGui.QImage.Format_ARGB32)
+        image.fill(0xFF336699)
+        path = os.path.join(self._thumb_dir, "%s.png" % name)
+        image.save(path)
+        return path
+
+    def test_downloads_are_deduplicated(self):
+        """
+        Ensure a thumbnail is only downloaded once however many files request it.
+        """
+        cache = self.ThumbnailCache(memory_budget=1024 * 1024)
+        loaded = []
+        cache.thumbnail_loaded.connect(loaded.append)
+
+        self.assertTrue(cache.begin_loading("thumb"))
+        self.assertFalse(cache.begin_loading("thumb"))
+        self.assertTrue(cache.is_loading("thumb"))
+
+        self.assertIsNotNone(cache.add("thumb", self._create_thumbnail("thumb")))
+        self.assertEqual(loaded, ["thumb"])
+        self.assertTrue(cache.contains("thumb"))
+        self.assertFalse(cache.begin_loading("thumb"))
+
+    def test_memory_is_bounded(self):
+        """
+        Ensure the memory used by pixmaps stays within the budget while browsing many shots and
+        that evicted pixmaps are regenerated from disk.
+        """
+        cache = self.ThumbnailCache(memory_budget=1024 * 1024)
+        cache.add("shot_0", self._create_thumbnail("shot_0"))
+        cache.memory_budget = cache.memory_used * 3
+
+        for shot in range(1, 200):
+            key = "shot_%d" % shot
+            cache.begin_loading(key)
+            cache.add(key, self._create_thumbnail(key))
+            self.assertLessEqual(cache.memory_used, cache.memory_budget)
+        self.assertEqual(cache.num_pixmaps, 3)
+
+        # the first thumbnail was evicted but is reloaded from disk:
+        self.assertIsNotNone(cache.get("shot_0"))
+        self.assertLessEqual(cache.memory_used, cache.memory_budget)
+        self.assertIn("1 regenerated from disk", cache.report())
+
+    def test_cancelled_downloads_can_be_restarted(self):
+        """
+        Ensure requests waiting for a thumbnail are told when its download is cancelled, rather
+        than it being reported as loaded, and that a new download can then be started.
+        """
+        cache = self.ThumbnailCache(memory_budget=1024 * 1024)
+        loaded = []
+        cancelled = []
+        cache.thumbnail_loaded.connect(loaded.append)
+        cache.thumbnail_cancelled.connect(cancelled.append)
+
+        self.assertTrue(cache.begin_loading("thumb"))
+        self.assertFalse(cache.begin_loading("thumb"))
+        cache.cancel_loading("thumb")
+        self.assertEqual(loaded, [])
+        self.assertEqual(cancelled, ["thumb"])
+        self.assertFalse(cache.is_loading("thumb"))
+
+        self.assertTrue(cache.begin_loading("thumb"))
+        cache.stop_loading("thumb")
+        self.assertEqual(loaded, ["thumb"])
+        self.assertEqual(cancelled, ["thumb"])
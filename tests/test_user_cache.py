@@ -0,0 +1,130 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Unit tests for the user cache.
+"""
+
+from unittest.mock import Mock, patch
+
+from tank_test.tank_test_base import setUpModule  # noqa
+from workfiles2_test_base import Workfiles2TestBase
+from workfiles2_test_base import tearDownModule  # noqa
+
+
+class TestUserCache(Workfiles2TestBase):
+    """
+    Tests for the UserCache class.
+    """
+
+    def setUp(self):
+        """
+        Fixtures setup
+        """
+        super().setUp()
+        self._user_cache = self.tk_multi_workfiles.user_cache.UserCache()
+
+        # files owned by jeff, francis and an account without a PTR user:
+        self._logins = {}
+        for ri in range(30):
+            login = ("jeff", "francis", "render")[ri % 3]
+            self._logins["/work/scene.v%03d.ma" % ri] = login
+
+    def test_batched_user_lookup(self):
+        """
+        Ensure the users for many files are found with a single hook call and query.
+        """
+        hook = Mock(spec=["get_logins", "get_login"])
+        hook.get_logins.return_value = self._logins
+        with patch.object(
+            self.app, "create_hook_instance", return_value=hook
+        ), patch.object(
+            self.app.shotgun, "find", wraps=self.app.shotgun.find
+        ) as find_mock:
+            users = self._user_cache.get_files_last_modified_users(list(self._logins))
+            self.assertEqual(hook.get_logins.call_count, 1)
+            self.assertEqual(hook.get_login.call_count, 0)
+            self.assertEqual(find_mock.call_count, 1)
+
+            # users are cached, looking them up again shouldn't query PTR:
+            self._user_cache.get_files_last_modified_users(list(self._logins))
+            self.assertEqual(find_mock.call_count, 1)
+
+        self.assertEqual(len(users), 30)
+        self.assertEqual(users["/work/scene.v000.ma"]["id"], self.jeff["id"])
+        self.assertEqual(users["/work/scene.v001.ma"]["id"], self.francis["id"])
+        self.assertEqual(users["/work/scene.v002.ma"]["name"], "render (System)")
+
+    def test_user_lookup_by_field_values(self):
+        """
+        Ensure users are found in bulk from field values and unknown values are omitted.
+        """
+        with patch.object(
+            self.app.shotgun, "find", wraps=self.app.shotgun.find
+        ) as find_mock:
+            users = self._user_cache.get_user_details_for_field_values(
+                "login", ["jeff", "francis", "render"]
+            )
+            self.assertEqual(find_mock.call_count, 1)
+
+        self.assertEqual(sorted(users), ["francis", "jeff"])
+        self.assertEqual(users["jeff"]["id"], self.jeff["id"])
+        self.assertEqual(users["francis"]["id"], self.francis["id"])
+
+    def test_hook_without_batch_method(self):
+        """
+        Ensure hooks that don't implement the batch method are called for each file and that
+        logins are matched to users regardless of their case.
+        """
+        hook = Mock(spec=["get_login"])
+        hook.get_login.side_effect = lambda path, **kwargs: self._logins[path].upper()
+        jeff = {
+            "type": "HumanUser",
+            "id": self.jeff["id"],
+            "email": None,
+            "login": "jeff",
+            "name": "Jeff",
+            "image": None,
+        }
+        with patch.object(
+            self.app, "create_hook_instance", return_value=hook
+        ), patch.object(self.app.shotgun, "find", return_value=[jeff]):
+            users = self._user_cache.get_files_last_modified_users(list(self._logins))
+
+        self.assertEqual(hook.get_login.call_count, 30)
+        self.assertEqual(users["/work/scene.v000.ma"]["id"], self.jeff["id"])
+        self.assertEqual(users["/work/scene.v001.ma"]["name"], "FRANCIS (System)")
+
+    def test_user_lookup_by_other_field_values(self):
+        """
+        Ensure users found from the values of other fields are matched case-insensitively and
+        cached with all their fields.
+        """
+        jeff = {
+            "type": "HumanUser",
+            "id": self.jeff["id"],
+            "email": "jeff@example.com",
+            "login": "jeff",
+            "name": "Jeff",
+            "image": None,
+        }
+        with patch.object(self.app.shotgun, "find", return_value=[jeff]):
+            users = self._user_cache.get_user_details_for_field_values(
+                "email", ["Jeff@Example.com"]
+            )
+
+        self.assertEqual(list(users), ["Jeff@Example.com"])
+        self.assertEqual(users["Jeff@Example.com"]["email"], "jeff@example.com")
+        self.assertEqual(
+            self._user_cache.get_user_details_for_ids([self.jeff["id"]])[
+                self.jeff["id"]
+            ]["email"],
+            "jeff@example.com",
+        )
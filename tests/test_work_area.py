@@ -0,0 +1,108 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Unit tests for the work area.
+"""
+
+import os
+from unittest.mock import patch
+
+from tank_test.tank_test_base import setUpModule  # noqa
+from workfiles2_test_base import Workfiles2TestBase
+from workfiles2_test_base import tearDownModule  # noqa
+
+
+class TestWorkArea(Workfiles2TestBase):
+    """
+    Tests for the WorkArea class.
+    """
+
+    def setUp(self):
+        """
+        Fixtures setup
+        """
+        super().setUp()
+        self.WorkArea = self.tk_multi_workfiles.work_area.WorkArea
+
+        self._contexts = []
+        for ri in range(3):
+            asset = self.mockgun.create(
+                "Asset",
+                {
+                    "code": "Asset%d" % ri,
+                    "sg_asset_type": "Character",
+                    "project": self.project,
+                },
+            )
+            self._contexts.append(self.tk.context_from_entity("Asset", asset["id"]))
+
+    def test_settings_cache_eviction(self):
+        """
+        Ensure the settings cache evicts the least recently used contexts.
+        """
+        cache = self.WorkArea._SettingsCache()
+        with patch.object(self.WorkArea._SettingsCache, "MAX_SIZE", 2):
+            cache.add(self._contexts[0], [{"settings": 0}])
+            cache.add(self._contexts[1], [{"settings": 1}])
+
+            # use the first context so that the second one is evicted next:
+            self.assertEqual(cache.get(self._contexts[0]), [{"settings": 0}])
+            cache.add(self._contexts[2], [{"settings": 2}])
+
+            self.assertIsNone(cache.get(self._contexts[1]))
+            self.assertEqual(cache.get(self._contexts[0]), [{"settings": 0}])
+            self.assertEqual(cache.get(self._contexts[2]), [{"settings": 2}])
+
+        # an equal context built separately shares the same entry:
+        context = self.tk.context_from_entity("Asset", self._contexts[2].entity["id"])
+        self.assertEqual(cache.get(context), [{"settings": 2}])
+        self.assertEqual((cache.hits, cache.misses), (4, 1))
+
+    def test_app_settings_cache_hit(self):
+        """
+        Ensure the app settings found in an environment are read back from the cache, in a later
+        session, without resolving the environment again.
+        """
+        work_area = self.tk_multi_workfiles.work_area
+        WorkAreaSettingsCache = (
+            self.tk_multi_workfiles.work_area_settings_cache.WorkAreaSettingsCache
+        )
+        cache_path = os.path.join(
+            self.tank_temp, self.short_test_name, "work_area_settings.json"
+        )
+        context = self._contexts[0]
+        env_name = self.app.sgtk.execute_core_hook("pick_environment", context=context)
+        settings = {
+            "engine_instance": self.app.engine.instance_name,
+            "app_instance": self.app.instance_name,
+            "settings": {"template_work": "maya_asset_work"},
+        }
+
+        # the environment instance can't be serialized so it isn't cached:
+        WorkAreaSettingsCache(cache_path).add(
+            env_name,
+            self.app.engine.instance_name,
+            self.app.name,
+            [dict(settings, env_instance=object())],
+        )
+
+        with patch.object(
+            work_area, "g_work_area_settings_cache", WorkAreaSettingsCache(cache_path)
+        ), patch("sgtk.platform.find_app_settings") as find_app_settings, patch.object(
+            self.app.sgtk.pipeline_configuration, "get_environment"
+        ) as get_environment, patch.object(
+            self.app, "get_setting", return_value=True
+        ):
+            app_settings = self.WorkArea._find_app_settings(None, self.app, context)
+
+        self.assertEqual(app_settings, [settings])
+        self.assertEqual(find_app_settings.call_count, 0)
+        self.assertEqual(get_environment.call_count, 0)
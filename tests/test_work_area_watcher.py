@@ -0,0 +1,112 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Unit tests for the work area watcher.
+"""
+
+import os
+import shutil
+import tempfile
+from unittest.mock import patch
+
+from tank_test.tank_test_base import setUpModule  # noqa
+from workfiles2_test_base import Workfiles2TestBase
+from workfiles2_test_base import tearDownModule  # noqa
+
+
+class TestWorkAreaWatcher(Workfiles2TestBase):
+    """
+    Tests for the WorkAreaWatcher class.
+    """
+
+    def setUp(self):
+        """
+        Fixtures setup
+        """
+        super().setUp()
+        WorkAreaWatcher = self.tk_multi_workfiles.work_area_watcher.WorkAreaWatcher
+        self._dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self._dir, True)
+        self._path = os.path.join(self._dir, "scene.v001.ma")
+        with open(self._path, "w") as fh:
+            fh.write("v1")
+
+        self._watcher = WorkAreaWatcher()
+        self.addCleanup(self._watcher.shut_down)
+        # the directories are polled explicitly by the tests rather than by the poller thread:
+        with patch.object(WorkAreaWatcher, "_poll"):
+            self._watcher._watch_directories("group", None, set([self._dir]))
+        # the initial signature is computed by the poller:
+        self.assertEqual(self._watcher._poll_once(False), [])
+        self.assertIsNotNone(self._watcher._directory_signatures[self._dir])
+
+    def _touch(self, path, offset):
+        """
+        Move the modification time of a path forward.
+
+        :param path:    The path to modify
+        :param offset:  The number of seconds to move the modification time by
+        """
+        mtime = os.stat(path).st_mtime + offset
+        os.utime(path, (mtime, mtime))
+
+    def test_in_place_edits_found_by_file_scan(self):
+        """
+        Ensure files modified in place, which doesn't change the modification time of their
+        directory, are only found when the files are scanned.
+        """
+        dir_mtime = os.stat(self._dir).st_mtime
+        with open(self._path, "w") as fh:
+            fh.write("v2")
+        self._touch(self._path, 10)
+        os.utime(self._dir, (dir_mtime, dir_mtime))
+
+        self._watcher._native_directories = set()
+        self.assertEqual(self._watcher._poll_once(False), [])
+        self.assertEqual(self._watcher._poll_once(True), [self._dir])
+        self.assertEqual(self._watcher._poll_once(True), [])
+
+    def test_native_directories_not_polled(self):
+        """
+        Ensure only the directories the native watcher doesn't watch have their modification
+        time polled.
+        """
+        with open(os.path.join(self._dir, "scene.v002.ma"), "w") as fh:
+            fh.write("v2")
+        self._touch(self._dir, 10)
+
+        self._watcher._native_directories = set([self._dir])
+        self.assertEqual(self._watcher._poll_once(False), [])
+        self._watcher._native_directories = set()
+        self.assertEqual(self._watcher._poll_once(False), [self._dir])
+
+    def test_reported_changes_resynced_by_poller(self):
+        """
+        Ensure the signatures of the directories reported as changed are computed again by the
+        poller rather than when the changes are reported.
+        """
+        signature = self._watcher._directory_signatures[self._dir]
+        with open(os.path.join(self._dir, "scene.v002.ma"), "w") as fh:
+            fh.write("v2")
+        self._touch(self._dir, 10)
+
+        changes = []
+        self._watcher.work_area_changed.connect(
+            lambda group_key, work_area, directory: changes.append(directory)
+        )
+        self._watcher._on_directories_changed([self._dir])
+        self._watcher._on_coalesce_timeout()
+        self.assertEqual(changes, [self._dir])
+        self.assertEqual(self._watcher._directory_signatures[self._dir], signature)
+
+        # the change isn't reported again:
+        self.assertEqual(self._watcher._poll_once(True), [])
+        self.assertNotEqual(self._watcher._directory_signatures[self._dir], signature)
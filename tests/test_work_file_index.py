@@ -0,0 +1,144 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Unit tests for the persistent work file index.
+"""
+
+import os
+
+from tank_test.tank_test_base import setUpModule  # noqa
+from workfiles2_test_base import Workfiles2TestBase
+from workfiles2_test_base import tearDownModule  # noqa
+
+
+class _VersionTemplate(object):
+    """
+    Minimal template extracting the version from a path.
+    """
+
+    definition = "{name}.v{version}.ma"
+
+    def get_fields(self, path):
+        name, version = os.path.basename(path).split(".")[:2]
+        return {"name": name, "version": int(version[1:])}
+
+
+class TestWorkFileIndex(Workfiles2TestBase):
+    """
+    Tests for the WorkFileIndex class.
+    """
+
+    def setUp(self):
+        """
+        Fixtures setup
+        """
+        super().setUp()
+        WorkFileIndex = self.tk_multi_workfiles.work_file_index.WorkFileIndex
+        self._index = WorkFileIndex(
+            os.path.join(self.tank_temp, self.short_test_name, "index.db")
+        )
+
+        self._work_dir = os.path.join(self.tank_temp, self.short_test_name, "work")
+        os.makedirs(self._work_dir)
+        self._create_file("scene.v001.ma")
+        self._create_file("scene.v002.ma")
+        self._set_dir_mtime(1000)
+
+    def _create_file(self, name):
+        """
+        Create an empty file in the work directory.
+        """
+        path = os.path.join(self._work_dir, name)
+        with open(path, "w"):
+            pass
+        return path
+
+    def _set_dir_mtime(self, mtime):
+        """
+        Set the modification time of the work directory.
+        """
+        os.utime(self._work_dir, (mtime, mtime))
+
+    def test_unchanged_directory_listing_is_reused(self):
+        """
+        Ensure directories are only listed from disk when they have changed.
+        """
+        entries = self._index.list_dir(self._work_dir)
+        self.assertEqual(
+            sorted(entries), [("scene.v001.ma", False), ("scene.v002.ma", False)]
+        )
+
+        # create a file without changing the directory mtime, the cached
+        # listing should be returned:
+        self._create_file("scene.v003.ma")
+        self._set_dir_mtime(1000)
+        self.assertEqual(len(self._index.list_dir(self._work_dir)), 2)
+
+        # and once the directory mtime changes, it should be listed again:
+        self._set_dir_mtime(2000)
+        self.assertEqual(len(self._index.list_dir(self._work_dir)), 3)
+
+    def test_work_file_records(self):
+        """
+        Ensure work file records are stored and removed as files come and go.
+        """
+        paths = [
+            os.path.join(self._work_dir, name)
+            for name, _ in self._index.list_dir(self._work_dir)
+        ]
+        records = self._index.update_work_files("key", _VersionTemplate(), paths)
+        self.assertEqual(sorted(records), sorted(paths))
+        for record in records.values():
+            self.assertEqual(os.path.getmtime(record.path), record.mtime)
+            self.assertEqual(record.fields["name"], "scene")
+
+        # remove a file, its record should be dropped:
+        os.remove(paths[0])
+        self._set_dir_mtime(2000)
+        self._index.list_dir(self._work_dir)
+        records = self._index.update_work_files("key", _VersionTemplate(), paths[1:])
+        self.assertEqual(list(records), paths[1:])
+
+    def test_files_modified_in_place(self):
+        """
+        Ensure files modified in place are picked up even though the modification time of their
+        directory doesn't change.
+        """
+        paths = [
+            os.path.join(self._work_dir, name)
+            for name, _ in self._index.list_dir(self._work_dir)
+        ]
+        self._index.update_work_files("key", _VersionTemplate(), paths)
+
+        with open(paths[0], "w") as f:
+            f.write("modified")
+        os.utime(paths[0], (3000, 3000))
+        self._set_dir_mtime(1000)
+
+        records = self._index.update_work_files("key", _VersionTemplate(), paths)
+        self.assertEqual(records[paths[0]].mtime, 3000)
+        self.assertEqual(records[paths[0]].size, len("modified"))
+        self.assertEqual(records[paths[1]].mtime, os.path.getmtime(paths[1]))
+
+    def test_directory_listings_are_batched(self):
+        """
+        Ensure directory listings are only committed once the index is flushed.
+        """
+        self._index.list_dir(self._work_dir)
+        self.assertEqual(self._index._execute("SELECT path FROM directories"), [])
+
+        # the pending listing is still used:
+        self.assertEqual(len(self._index.list_dir(self._work_dir)), 2)
+
+        self._index.flush()
+        self.assertEqual(
+            self._index._execute("SELECT path FROM directories"), [(self._work_dir,)]
+        )